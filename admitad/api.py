@@ -1,16 +1,20 @@
-from admitad import client, transport
+import asyncio
+
+from admitad import async_transport, client, tokens, transport
 
 
 def get_oauth_client_token(
     access_token: str,
     user_agent: str | None = None,
     debug: bool = False,
+    pool: transport.ConnectionPool | None = None,
 ) -> client.Client:
     """Creates a client using an access token."""
     http_transport = transport.HttpTransport(
         access_token,
         user_agent=user_agent,
         debug=debug,
+        pool=pool,
     )
     return client.Client(http_transport)
 
@@ -21,16 +25,74 @@ def get_oauth_client_client(
     scopes: str,
     user_agent: str | None = None,
     debug: bool = False,
+    pool: transport.ConnectionPool | None = None,
+    token_cache: tokens.FileTokenCache | None = None,
 ) -> client.Client:
-    """Creates a client using a client_id and client_secret."""
-    auth = transport.oauth_client_authorization({
-        'client_id': client_id,
-        'client_secret': client_secret,
-        'scopes': scopes
-    })
-
-    return get_oauth_client_token(
-        auth['access_token'],
+    """
+    Creates a client using a client_id and client_secret.
+    The access token is refreshed automatically before it expires.
+    With a token_cache a valid token stored by another process is reused.
+    """
+    if pool is None:
+        pool = transport.ConnectionPool()
+
+    token_manager = tokens.TokenManager(client_id, client_secret, scopes, pool=pool, cache=token_cache)
+    token_manager.get_access_token()
+
+    http_transport = transport.HttpTransport(
+        user_agent=user_agent,
+        debug=debug,
+        pool=pool,
+        token_manager=token_manager,
+    )
+    return client.Client(http_transport)
+
+
+def get_async_oauth_client_token(
+    access_token: str,
+    user_agent: str | None = None,
+    debug: bool = False,
+    pool: async_transport.AsyncConnectionPool | None = None,
+) -> client.AsyncClient:
+    """Creates an async client using an access token."""
+    http_transport = async_transport.AsyncHttpTransport(
+        access_token,
         user_agent=user_agent,
         debug=debug,
+        pool=pool,
     )
+    return client.AsyncClient(http_transport)
+
+
+async def get_async_oauth_client_client(
+    client_id: str,
+    client_secret: str,
+    scopes: str,
+    user_agent: str | None = None,
+    debug: bool = False,
+    pool: async_transport.AsyncConnectionPool | None = None,
+    token_cache: tokens.FileTokenCache | None = None,
+) -> client.AsyncClient:
+    """
+    Creates an async client using a client_id and client_secret.
+    The access token is refreshed automatically before it expires.
+    With a token_cache a valid token stored by another process is reused.
+    """
+    token_manager = tokens.TokenManager(client_id, client_secret, scopes, cache=token_cache)
+    http_transport = async_transport.AsyncHttpTransport(
+        user_agent=user_agent,
+        debug=debug,
+        pool=pool,
+        token_manager=token_manager,
+    )
+
+    if token_cache is not None:
+        await asyncio.get_running_loop().run_in_executor(None, token_manager.get_access_token)
+    else:
+        token_manager.set_token(await async_transport.async_oauth_client_authorization({
+            'client_id': client_id,
+            'client_secret': client_secret,
+            'scopes': scopes
+        }, session=http_transport.pool.session))
+
+    return client.AsyncClient(http_transport)
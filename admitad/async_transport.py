@@ -0,0 +1,433 @@
+import asyncio
+import os
+import weakref
+from copy import deepcopy
+from dataclasses import replace
+from typing import TYPE_CHECKING, Any, AsyncIterable, AsyncIterator, Awaitable, Callable, ClassVar, Iterable, Literal, Mapping
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+from admitad.bulk import BulkResult, BulkSummary, acollect, arun_bulk, arun_each, asummarize
+from admitad.columnar import Table
+from admitad.constants import DEFAULT_ASYNC_POOL_LIMIT, DEFAULT_KEEP_ALIVE_TIMEOUT, DEFAULT_REQUEST_TIMEOUT, TOKEN_URL
+from admitad.decoders import DEFAULT_DECODER, Decoder
+from admitad.exceptions import ConnectionException, HttpException, JsonException
+from admitad.pagination import aiterate_pages, aiterate_results
+from admitad.retry import RetryPolicy
+from admitad.sharding import aiterate_shards
+from admitad.transport import HttpTransport, Request, Response, debug_log, get_credentials, prepare_data, to_json
+
+if TYPE_CHECKING:
+    from admitad.cache import ResponseCache
+    from admitad.deeplink_cache import DeeplinkCache
+    from admitad.models import Model
+    from admitad.ratelimit import TokenBucket
+    from admitad.singleflight import AsyncSingleFlight
+    from admitad.tokens import TokenManager
+
+
+def require_aiohttp() -> None:
+    if aiohttp is None:
+        raise ImportError('aiohttp is required for the async client: pip install admitad[async]')
+
+
+def prepare_pairs(data: dict | None) -> list[tuple[str, str]]:
+    """Flattens prepared request data into (key, value) pairs, repeating keys for lists."""
+    pairs = []
+    for key, value in (prepare_data(data) or {}).items():
+        values = value if isinstance(value, list) else [value]
+        pairs.extend((key, str(item)) for item in values if item is not None)
+    return pairs
+
+
+def prepare_form(data: dict | None, files: list | None) -> 'aiohttp.FormData':
+    form = aiohttp.FormData(prepare_pairs(data))
+    for name, file in files:
+        form.add_field(name, file, filename=os.path.basename(getattr(file, 'name', name)))
+    return form
+
+
+def build_session(
+    limit: int = DEFAULT_ASYNC_POOL_LIMIT,
+    limit_per_host: int = 0,
+    keep_alive_timeout: float | None = DEFAULT_KEEP_ALIVE_TIMEOUT,
+) -> 'aiohttp.ClientSession':
+    require_aiohttp()
+    connector = aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        keepalive_timeout=keep_alive_timeout,
+    )
+    return aiohttp.ClientSession(connector=connector)
+
+
+class AsyncConnectionPool:
+    """
+    The aiohttp session shared by every request of an async transport.
+
+    limit caps the total number of connections, limit_per_host the number
+    of connections per host (0 means no per-host limit). The session is
+    created on first use inside the running loop.
+    """
+
+    def __init__(
+        self,
+        limit: int = DEFAULT_ASYNC_POOL_LIMIT,
+        limit_per_host: int = 0,
+        keep_alive_timeout: float | None = DEFAULT_KEEP_ALIVE_TIMEOUT,
+        session: 'aiohttp.ClientSession | None' = None,
+    ):
+        require_aiohttp()
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keep_alive_timeout = keep_alive_timeout
+        self._session = session
+
+    @property
+    def session(self) -> 'aiohttp.ClientSession':
+        if self._session is None or self._session.closed:
+            self._session = build_session(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keep_alive_timeout=self.keep_alive_timeout,
+            )
+        return self._session
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+async def async_api_response(
+    url: str,
+    data: dict | None = None,
+    headers: dict | None = None,
+    method: Literal['GET', 'POST', 'DELETE', 'PUT'] = 'GET',
+    files: list | None = None,
+    timeout: int | None = None,
+    ssl_verify: bool = True,
+    debug: bool = False,
+    session: 'aiohttp.ClientSession | None' = None,
+    decoder: Decoder = DEFAULT_DECODER,
+) -> Response:
+    require_aiohttp()
+    kwargs = {
+        'headers': headers if headers is not None else {},
+        'timeout': aiohttp.ClientTimeout(total=timeout if timeout is not None else DEFAULT_REQUEST_TIMEOUT),
+        'ssl': ssl_verify,
+        'allow_redirects': True,
+    }
+
+    if method in ['POST', 'PUT']:
+        kwargs['data'] = prepare_form(data, files) if files else prepare_pairs(data)
+    if method in ['GET', 'DELETE']:
+        kwargs['params'] = prepare_pairs(data)
+
+    own_session = session is None
+    if own_session:
+        session = aiohttp.ClientSession()
+    try:
+        async with session.request(method, url, **kwargs) as response:
+            debug_log('Request url: %s' % response.url, debug)
+            content = await response.read()
+            if response.status >= 400:
+                raise HttpException(response.status, to_json(content, decoder), response.reason, dict(response.headers))
+            if response.status == 304:
+                return Response(response.status, response.headers)
+            try:
+                return Response(response.status, response.headers, decoder(content))
+            except (ValueError, TypeError) as err:
+                raise JsonException(err)
+    except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+        raise ConnectionException(err)
+    finally:
+        if own_session:
+            await session.close()
+
+
+async def async_api_request(
+    url: str,
+    data: dict | None = None,
+    headers: dict | None = None,
+    method: Literal['GET', 'POST', 'DELETE', 'PUT'] = 'GET',
+    files: list | None = None,
+    timeout: int | None = None,
+    ssl_verify: bool = True,
+    debug: bool = False,
+    session: 'aiohttp.ClientSession | None' = None,
+    decoder: Decoder = DEFAULT_DECODER,
+) -> dict:
+    response = await async_api_response(
+        url,
+        data=data,
+        headers=headers,
+        method=method,
+        files=files,
+        timeout=timeout,
+        ssl_verify=ssl_verify,
+        debug=debug,
+        session=session,
+        decoder=decoder,
+    )
+    return response.data
+
+
+async def async_oauth_refresh_access_token(
+    data: dict,
+    session: 'aiohttp.ClientSession | None' = None,
+) -> dict:
+    """Async version of oauth_refresh_access_token."""
+    params = {
+        'grant_type': 'refresh_token',
+        'client_id': data['client_id'],
+        'client_secret': data['client_secret'],
+        'refresh_token': data['refresh_token'],
+    }
+    headers = {'Content-Type': 'application/x-www-form-urlencoded'}
+    return await async_api_request(
+        url=TOKEN_URL,
+        method='POST',
+        data=params,
+        headers=headers,
+        session=session,
+    )
+
+
+async def async_oauth_client_authorization(
+    data: dict,
+    session: 'aiohttp.ClientSession | None' = None,
+) -> dict:
+    """Async version of oauth_client_authorization."""
+    params = {
+        'grant_type': 'client_credentials',
+        'client_id': data['client_id'],
+        'scope': data['scopes'],
+    }
+    headers = {
+        'Content-Type': 'application/x-www-form-urlencoded',
+        'Authorization': 'Basic %s' % get_credentials(data['client_id'], data['client_secret']),
+    }
+    return await async_api_request(
+        url=TOKEN_URL,
+        method='POST',
+        data=params,
+        headers=headers,
+        session=session,
+    )
+
+
+class AsyncKeyLocks:
+    """Per-key asyncio locks, dropped once nobody holds a reference to them."""
+
+    def __init__(self):
+        self._locks = weakref.WeakValueDictionary()
+
+    def get(self, key: str) -> asyncio.Lock:
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        return lock
+
+
+async def acquire_lock(lock: Any) -> None:
+    """Waits for a blocking lock (e.g. a cache lock) in a thread instead of the event loop."""
+    acquire = asyncio.get_running_loop().run_in_executor(None, lock.acquire)
+    try:
+        await asyncio.shield(acquire)
+    except asyncio.CancelledError:
+        # the lock is still acquired by the thread, release it once it is
+        acquire.add_done_callback(lambda future: future.exception() is None and lock.release())
+        raise
+
+
+class AsyncHttpTransport(HttpTransport):
+    """
+    HttpTransport running requests on an aiohttp session.
+
+    Request building stays synchronous, so every item works unchanged:
+    request() sends the immutable Request and returns an awaitable.
+    Streaming responses are not supported.
+    """
+
+    OPTIONS: ClassVar[tuple[str, ...]] = tuple(name for name in HttpTransport.OPTIONS if name != 'stream')
+
+    def __init__(
+        self,
+        access_token: str | None = None,
+        user_agent: str | None = None,
+        debug: bool = False,
+        pool: AsyncConnectionPool | None = None,
+        token_manager: 'TokenManager | None' = None,
+        retry: RetryPolicy | None = None,
+        rate_limiter: 'TokenBucket | None' = None,
+        cache: 'ResponseCache | None' = None,
+        single_flight: 'AsyncSingleFlight | None' = None,
+        decoder: Decoder | None = None,
+        model: 'type[Model] | None' = None,
+        deeplink_cache: 'DeeplinkCache | None' = None,
+    ):
+        super().__init__(
+            access_token,
+            user_agent=user_agent,
+            debug=debug,
+            pool=pool if pool is not None else AsyncConnectionPool(),
+            token_manager=token_manager,
+            retry=retry,
+            rate_limiter=rate_limiter,
+            cache=cache,
+            single_flight=single_flight,
+            decoder=decoder,
+            model=model,
+            deeplink_cache=deeplink_cache,
+        )
+        self._cache_locks = AsyncKeyLocks()
+
+    async def close(self) -> None:
+        await self.pool.close()
+
+    def send(self, request: Request, handler: Callable[[dict], Any]) -> Awaitable[Any]:
+        return self._send_async(request, handler)
+
+    async def _send_async(self, request: Request, handler: Callable[[dict], Any]) -> Any:
+        handler = self.get_handler(handler)
+        if self.cache is None or not self.cache.is_cacheable(request.method, request.url):
+            return handler((await self._send_coalesced_async(request)).data)
+
+        scope = self.get_cache_scope()
+        response = await self._run_cache(self.cache.get, request.method, request.url, request.data, scope)
+        if response is None:
+            response = await self._send_locked_async(request, scope)
+        return handler(response)
+
+    async def _run_cache(self, call: Callable[..., Any], *args: Any) -> Any:
+        """Runs a cache call in a thread when its backend does network I/O (e.g. RedisCache)."""
+        if not self.cache.backend.blocking:
+            return call(*args)
+        return await asyncio.get_running_loop().run_in_executor(None, call, *args)
+
+    async def _send_locked_async(self, request: Request, scope: str) -> Any:
+        """
+        Concurrent misses of one key queue on an asyncio lock, so only one
+        of them at a time waits for the cache lock (which other threads or
+        nodes may hold) in a thread and the others never take up the
+        executor, which token refreshes also run on.
+        """
+        async with self._cache_locks.get(self.cache.get_key(request.method, request.url, request.data, scope)):
+            response = await self._run_cache(self.cache.get, request.method, request.url, request.data, scope)
+            if response is not None:
+                return response
+            lock = self.cache.lock(request.method, request.url, request.data, scope)
+            await acquire_lock(lock)
+            try:
+                return await self._send_cached_async(request, scope)
+            finally:
+                await self._run_cache(lock.release)
+
+    async def _send_cached_async(self, request: Request, scope: str) -> Any:
+        entry = await self._run_cache(self.cache.get_entry, request.method, request.url, request.data, scope)
+        if entry is not None and entry.is_fresh():
+            return entry.get_response()
+        if entry is not None:
+            request = request.update_headers(entry.get_conditional_headers())
+
+        response = await self._send_coalesced_async(request)
+        return await self._run_cache(
+            self.cache.store, request.method, request.url, request.data, response, entry, scope,
+        )
+
+    async def _send_coalesced_async(self, request: Request) -> Response:
+        if self.single_flight is None or request.method != 'GET':
+            return await self._send_with_retry_async(request)
+
+        access_token = await self.get_access_token_async()
+        key = self.single_flight.get_key(request.method, request.url, request.data, access_token)
+        response, shared = await self.single_flight.do(key, lambda: self._send_with_retry_async(request))
+        return replace(response, data=deepcopy(response.data)) if shared else response
+
+    async def _send_with_retry_async(self, request: Request) -> Response:
+        retry = request.retry or self.retry
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = await self._send_authorized_async(request)
+                break
+            except (HttpException, ConnectionException) as err:
+                self.handle_retry_after(err)
+                if not retry.should_retry(request.method, err, attempt):
+                    raise
+                await asyncio.sleep(retry.get_delay(attempt, err))
+
+        return response
+
+    async def _send_authorized_async(self, request: Request) -> Response:
+        access_token = await self.get_access_token_async()
+        try:
+            return await self._send_request(request, access_token)
+        except HttpException as err:
+            if not self.should_refresh_token(err):
+                raise
+            access_token = await asyncio.get_running_loop().run_in_executor(
+                None, lambda: self.token_manager.refresh(stale_token=access_token),
+            )
+            return await self._send_request(request, access_token)
+
+    async def get_access_token_async(self) -> str | None:
+        # token refreshes are rare, run them in a thread instead of blocking the loop
+        if self.token_manager is not None and self.token_manager.needs_refresh():
+            return await asyncio.get_running_loop().run_in_executor(None, self.token_manager.refresh)
+        return self.get_access_token()
+
+    async def _send_request(self, request: Request, access_token: str | None) -> Response:
+        if self.rate_limiter is not None:
+            await asyncio.sleep(self.rate_limiter.reserve())
+        return await async_api_response(
+            url=request.url,
+            method=request.method,
+            headers=self.get_request_headers(request, access_token),
+            data=request.data,
+            debug=self._debug if request.debug is None else request.debug,
+            files=request.files,
+            session=self.pool.session,
+            decoder=self.decoder,
+        )
+
+    @staticmethod
+    def iterate_results(fetch_page: Callable[[int, int], Awaitable[dict]], **kwargs: Any) -> AsyncIterator:
+        return aiterate_results(fetch_page, **kwargs)
+
+    @staticmethod
+    def iterate_pages(fetch_page: Callable[[int, int], Awaitable[dict]], **kwargs: Any) -> AsyncIterator:
+        return aiterate_pages(fetch_page, **kwargs)
+
+    @staticmethod
+    async def resolve(value: Any) -> Any:
+        return value
+
+    @staticmethod
+    def run_bulk(call: Callable[[Any, list], Awaitable[list]], items: Iterable, **kwargs: Any) -> AsyncIterator:
+        return arun_bulk(call, items, **kwargs)
+
+    @staticmethod
+    async def collect(results: AsyncIterable, items: Iterable) -> dict[Any, BulkResult]:
+        return await acollect(results, items)
+
+    @staticmethod
+    async def summarize(results: AsyncIterable) -> BulkSummary:
+        return await asummarize(results)
+
+    @staticmethod
+    def run_each(call: Callable[[Any], Awaitable[Any]], items: Iterable, **kwargs: Any) -> AsyncIterator:
+        return arun_each(call, items, **kwargs)
+
+    @staticmethod
+    async def to_table(rows: AsyncIterable, schema: Mapping[str, str] | None = None) -> Table:
+        return await Table.afrom_rows(rows, schema=schema)
+
+    @staticmethod
+    def iterate_shards(fetch_shard: Callable[[tuple], AsyncIterable], shards: list, **kwargs: Any) -> AsyncIterator:
+        return aiterate_shards(fetch_shard, shards, **kwargs)
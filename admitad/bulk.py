@@ -0,0 +1,307 @@
+import asyncio
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Hashable, Iterable, Iterator
+
+from admitad.exceptions import HttpException
+
+Batch = tuple[Hashable, list[int], list[Any]]
+CallBatch = Callable[[Hashable, list[Any]], list[Any]]
+AsyncCallBatch = Callable[[Hashable, list[Any]], Awaitable[list[Any]]]
+Call = Callable[[Hashable], Any]
+AsyncCall = Callable[[Hashable], Awaitable[Any]]
+
+SPLITTABLE_STATUSES: frozenset[int] = frozenset((400, 422))
+
+
+@dataclass(frozen=True)
+class BulkResult:
+    """The outcome of one input of a bulk job: its value or the error it failed with."""
+
+    item: Any
+    value: Any = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class BulkSummary:
+    """Counts the succeeded and failed inputs of a bulk job, keeping the errors by input."""
+
+    succeeded: int = 0
+    failed: int = 0
+    errors: dict = field(default_factory=dict)
+
+    @property
+    def total(self) -> int:
+        return self.succeeded + self.failed
+
+    def add(self, result: BulkResult) -> None:
+        if result.ok:
+            self.succeeded += 1
+        else:
+            self.failed += 1
+            self.errors[result.item] = result.error
+
+
+def summarize(results: Iterable[BulkResult]) -> BulkSummary:
+    summary = BulkSummary()
+    for result in results:
+        summary.add(result)
+    return summary
+
+
+async def asummarize(results: AsyncIterable[BulkResult]) -> BulkSummary:
+    summary = BulkSummary()
+    async for result in results:
+        summary.add(result)
+    return summary
+
+
+def collect(results: Iterable[BulkResult], items: Iterable[Hashable]) -> dict[Hashable, BulkResult]:
+    """Maps every distinct input to its result, in input order."""
+    found = {result.item: result for result in results}
+    return {item: found[item] for item in unique(items)}
+
+
+async def acollect(results: AsyncIterable[BulkResult], items: Iterable[Hashable]) -> dict[Hashable, BulkResult]:
+    found = {result.item: result async for result in results}
+    return {item: found[item] for item in unique(items)}
+
+
+def chunked(items: Iterable[Any], size: int | None) -> Iterator[list[Any]]:
+    """Splits items into lists of size items, all of them in one list without a size."""
+    items = iter(items)
+    while True:
+        chunk = list(islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+async def achunked(items: Iterable[Any] | AsyncIterable[Any], size: int | None) -> AsyncIterator[list[Any]]:
+    """Async counterpart of chunked, reading an iterable or an async iterable."""
+    if not hasattr(items, '__aiter__'):
+        for chunk in chunked(items, size):
+            yield chunk
+        return
+    chunk = []
+    async for item in items:
+        chunk.append(item)
+        if size is not None and len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def pack_batches(chunk: list[Any], group: Callable[[Any], tuple[Hashable, Any]], batch_size: int) -> list[Batch]:
+    """
+    Groups the inputs of a chunk by the key returned by group(item) and
+    packs the values of every group into batches of up to batch_size.
+    A batch holds the key, the positions of its inputs and their values.
+    """
+    groups = {}
+    for index, item in enumerate(chunk):
+        key, value = group(item)
+        positions, values = groups.setdefault(key, ([], []))
+        positions.append(index)
+        values.append(value)
+
+    return [
+        (key, positions[start:start + batch_size], values[start:start + batch_size])
+        for key, (positions, values) in groups.items()
+        for start in range(0, len(values), batch_size)
+    ]
+
+
+def is_splittable(error: Exception, values: list[Any]) -> bool:
+    """
+    Whether a failed batch may succeed in parts: it was rejected as invalid
+    and the error names some of its values. Other errors (throttling,
+    authorization, an error about the whole group) fail the batch as is.
+    """
+    if not isinstance(error, HttpException) or error.status not in SPLITTABLE_STATUSES:
+        return False
+    content = str(error.content)
+    return any(str(value) in content for value in values)
+
+
+def check_values(values: Any, size: int) -> list[Any]:
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError('Expected %s results, got: %s' % (size, values))
+    return values
+
+
+def call_batch(call: CallBatch, key: Hashable, values: list[Any]) -> list[tuple[Any, Exception | None]]:
+    """
+    Sends a batch and returns a (value, error) pair per input. A batch
+    rejected for some of its values is split in halves until the inputs
+    failing on their own are found.
+    """
+    try:
+        results = check_values(call(key, values), len(values))
+    except Exception as error:
+        if len(values) > 1 and is_splittable(error, values):
+            middle = len(values) // 2
+            return call_batch(call, key, values[:middle]) + call_batch(call, key, values[middle:])
+        return [(None, error)] * len(values)
+    return [(value, None) for value in results]
+
+
+async def acall_batch(call: AsyncCallBatch, key: Hashable, values: list[Any]) -> list[tuple[Any, Exception | None]]:
+    """Async counterpart of call_batch."""
+    try:
+        results = check_values(await call(key, values), len(values))
+    except Exception as error:
+        if len(values) > 1 and is_splittable(error, values):
+            middle = len(values) // 2
+            return await acall_batch(call, key, values[:middle]) + await acall_batch(call, key, values[middle:])
+        return [(None, error)] * len(values)
+    return [(value, None) for value in results]
+
+
+def run_bulk(
+    call: CallBatch,
+    items: Iterable[Any],
+    group: Callable[[Any], tuple[Hashable, Any]],
+    batch_size: int,
+    buffer_size: int | None,
+    workers: int = 1,
+) -> Iterator[BulkResult]:
+    """
+    Yields a BulkResult for every input in input order.
+
+    Inputs are read `buffer_size` at a time (all of them first without
+    a buffer_size), grouped by group(item) into
+    (key, value) and packed into batches of up to batch_size values, sent
+    as call(key, values) by a pool of `workers` threads. call returns one
+    result per value; failures are reported per input instead of stopping
+    the job.
+    """
+    executor = ThreadPoolExecutor(max_workers=max(1, workers))
+    try:
+        for chunk in chunked(items, buffer_size):
+            results = [None] * len(chunk)
+            batches = pack_batches(chunk, group, batch_size)
+            futures = deque((positions, executor.submit(call_batch, call, key, values))
+                            for key, positions, values in batches)
+            while futures:
+                positions, future = futures.popleft()
+                for position, (value, error) in zip(positions, future.result()):
+                    results[position] = BulkResult(chunk[position], value, error)
+            yield from results
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+async def _acall_bounded(
+    call: AsyncCallBatch,
+    key: Hashable,
+    values: list[Any],
+    semaphore: asyncio.Semaphore,
+) -> list[tuple[Any, Exception | None]]:
+    async with semaphore:
+        return await acall_batch(call, key, values)
+
+
+async def arun_bulk(
+    call: AsyncCallBatch,
+    items: Iterable[Any] | AsyncIterable[Any],
+    group: Callable[[Any], tuple[Hashable, Any]],
+    batch_size: int,
+    buffer_size: int | None,
+    workers: int = 1,
+) -> AsyncIterator[BulkResult]:
+    """
+    Async counterpart of run_bulk, sending up to `workers` batches by
+    concurrent tasks. Inputs may also come from an async iterable.
+    """
+    semaphore = asyncio.Semaphore(max(1, workers))
+    pending = deque()
+    try:
+        async for chunk in achunked(items, buffer_size):
+            results = [None] * len(chunk)
+            batches = pack_batches(chunk, group, batch_size)
+            pending.extend((positions, asyncio.ensure_future(_acall_bounded(call, key, values, semaphore)))
+                           for key, positions, values in batches)
+            while pending:
+                positions, task = pending.popleft()
+                for position, (value, error) in zip(positions, await task):
+                    results[position] = BulkResult(chunk[position], value, error)
+            for result in results:
+                yield result
+    finally:
+        for _, task in pending:
+            task.cancel()
+
+
+def unique(items: Iterable[Hashable]) -> Iterator[Hashable]:
+    seen = set()
+    for item in items:
+        if item not in seen:
+            seen.add(item)
+            yield item
+
+
+def call_one(call: Call, item: Hashable) -> BulkResult:
+    try:
+        return BulkResult(item, call(item))
+    except Exception as error:
+        return BulkResult(item, error=error)
+
+
+def run_each(call: Call, items: Iterable[Hashable], workers: int = 1) -> Iterator[BulkResult]:
+    """
+    Yields a BulkResult of call(item) for every distinct input as soon as
+    it completes. Inputs are read lazily, at most `workers` calls run at
+    a time on a pool of threads.
+    """
+    workers = max(1, workers)
+    executor = ThreadPoolExecutor(max_workers=workers)
+    pending = set()
+    try:
+        for item in unique(items):
+            pending.add(executor.submit(call_one, call, item))
+            if len(pending) >= workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+async def acall_one(call: AsyncCall, item: Hashable) -> BulkResult:
+    try:
+        return BulkResult(item, await call(item))
+    except Exception as error:
+        return BulkResult(item, error=error)
+
+
+async def arun_each(call: AsyncCall, items: Iterable[Hashable], workers: int = 1) -> AsyncIterator[BulkResult]:
+    """Async counterpart of run_each, running up to `workers` calls by concurrent tasks."""
+    workers = max(1, workers)
+    pending = set()
+    try:
+        for item in unique(items):
+            pending.add(asyncio.ensure_future(acall_one(call, item)))
+            if len(pending) >= workers:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,412 @@
+import hashlib
+import json
+import threading
+import time
+import uuid
+import weakref
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from copy import deepcopy
+from dataclasses import asdict, dataclass, replace
+from typing import Any, ClassVar, Mapping
+
+from admitad.constants import (
+    DEFAULT_CACHE_LOCK_POLL_INTERVAL,
+    DEFAULT_CACHE_LOCK_TIMEOUT,
+    DEFAULT_CACHE_MAXSIZE,
+    DEFAULT_CACHE_MAX_STALE,
+    DEFAULT_REFERENCE_CACHE_TTL,
+)
+from admitad.transport import Response, prepare_data
+
+
+def get_cache_key(method: str, url: str, data: Mapping | None = None, scope: str | None = None) -> str:
+    """
+    Builds a cache key from the method, url and the normalized request
+    params, prefixed with the scope (whose response it is) when given.
+    """
+    params = prepare_data(data) or {}
+    params = {key: value for key, value in params.items() if value is not None}
+    key = '%s %s %s' % (method, url, json.dumps(params, sort_keys=True, default=str))
+    return '%s %s' % (scope, key) if scope is not None else key
+
+
+def reference_data_policies(
+    ttl: float = DEFAULT_REFERENCE_CACHE_TTL,
+    revalidate: bool = False,
+) -> dict[str, 'CachePolicy']:
+    """
+    Cache policies for the rarely changing reference data endpoints,
+    which answer the same to every client.
+    """
+    from admitad import items
+
+    return {item.URL: CachePolicy(ttl=ttl, revalidate=revalidate, shared=True) for item in (
+        items.WebsiteTypes,
+        items.WebsiteRegions,
+        items.SystemLanguages,
+        items.SystemCurrencies,
+        items.AdvertiserServices,
+        items.CampaignCategories,
+        items.CouponsCategories,
+    )}
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """
+    How responses of a url prefix are cached: for ttl seconds, and with
+    revalidate kept after that when they carry validators, to be asked
+    for again with If-None-Match/If-Modified-Since, for max_stale more
+    seconds at most, so the backend drops entries nobody asks for.
+
+    Responses are cached per client unless shared, which only suits
+    endpoints answering the same to everyone (reference data).
+    """
+
+    ttl: float = 0
+    revalidate: bool = False
+    shared: bool = False
+    max_stale: float = DEFAULT_CACHE_MAX_STALE
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    """A cached response body with its expiry time and validators."""
+
+    response: Any
+    expires_at: float
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def is_fresh(self) -> bool:
+        return self.expires_at > time.time()
+
+    def has_validators(self) -> bool:
+        return self.etag is not None or self.last_modified is not None
+
+    def get_response(self) -> Any:
+        return deepcopy(self.response)
+
+    def get_conditional_headers(self) -> dict[str, str]:
+        headers = {}
+        if self.etag is not None:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified is not None:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class CacheBackend(ABC):
+    """
+    The storage of a ResponseCache.
+
+    lock(key) returns a lock shared by every user of the backend, held
+    while a missing entry is fetched, so concurrent misses of one key
+    send a single request and the others read its result.
+
+    Backends that block on I/O are run in a thread by AsyncHttpTransport,
+    in-memory ones set blocking to False to be called on the event loop.
+    """
+
+    blocking: ClassVar[bool] = True
+
+    @abstractmethod
+    def get(self, key: str) -> Any | None:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        pass
+
+    @abstractmethod
+    def lock(self, key: str) -> Any:
+        pass
+
+
+class KeyLocks:
+    """Per-key threading locks, dropped once nobody holds a reference to them."""
+
+    def __init__(self):
+        self._locks = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> threading.Lock:
+        with self._lock:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+
+class LRUCache(CacheBackend):
+    """
+    A thread-safe in-memory cache holding at most maxsize entries,
+    each with its own TTL. The least recently used entry is evicted first.
+    """
+
+    blocking: ClassVar[bool] = False
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_MAXSIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks = KeyLocks()
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def lock(self, key: str) -> threading.Lock:
+        return self._key_locks.get(key)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisLock:
+    """
+    A lock held across nodes with SET NX. It expires after timeout seconds
+    in case its holder dies; waiters of one process queue on a local lock
+    first, so only one of them polls the store.
+    """
+
+    def __init__(self, client: Any, key: str, local: threading.Lock, timeout: float, poll_interval: float):
+        self.client = client
+        self.key = key
+        self.local = local
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._token = None
+
+    def acquire(self) -> None:
+        self.local.acquire()
+        token = uuid.uuid4().hex
+        try:
+            while not self.client.set(self.key, token, ex=max(1, int(self.timeout)), nx=True):
+                time.sleep(self.poll_interval)
+        except BaseException:
+            self.local.release()
+            raise
+        self._token = token
+
+    def release(self) -> None:
+        token, self._token = self._token, None
+        try:
+            value = self.client.get(self.key)
+            if isinstance(value, bytes):
+                value = value.decode('utf-8')
+            if value == token:
+                self.client.delete(self.key)
+        finally:
+            self.local.release()
+
+    def __enter__(self) -> 'RedisLock':
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+
+class RedisCache(CacheBackend):
+    """
+    Keeps cache entries in a store shared by many nodes. client is a
+    redis.Redis compatible client, only get, set (with ex and nx) and
+    delete are used. Entries are stored as JSON.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        prefix: str = 'admitad:',
+        lock_timeout: float = DEFAULT_CACHE_LOCK_TIMEOUT,
+        poll_interval: float = DEFAULT_CACHE_LOCK_POLL_INTERVAL,
+    ):
+        self.client = client
+        self.prefix = prefix
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+        self._key_locks = KeyLocks()
+
+    def get_key(self, key: str) -> str:
+        return '%s%s' % (self.prefix, hashlib.sha256(key.encode('utf-8')).hexdigest())
+
+    def get(self, key: str) -> CacheEntry | None:
+        value = self.client.get(self.get_key(key))
+        if value is None:
+            return None
+        try:
+            return CacheEntry(**json.loads(value))
+        except (TypeError, ValueError):
+            return None
+
+    def set(self, key: str, value: CacheEntry, ttl: float | None = None) -> None:
+        ex = max(1, int(ttl + 0.5)) if ttl is not None else None
+        self.client.set(self.get_key(key), json.dumps(asdict(value)), ex=ex)
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.get_key(key))
+
+    def lock(self, key: str) -> RedisLock:
+        return RedisLock(
+            self.client,
+            '%s:lock' % self.get_key(key),
+            self._key_locks.get(key),
+            timeout=self.lock_timeout,
+            poll_interval=self.poll_interval,
+        )
+
+
+class ResponseCache:
+    """
+    Caches responses of GET requests in a backend (LRUCache by default,
+    RedisCache to share it between nodes).
+
+    policies maps url prefixes to a TTL in seconds or a CachePolicy, the
+    longest matching prefix wins; urls matching no policy use the default
+    ttl. A TTL of 0 disables caching, so by default only urls with a policy
+    are cached.
+
+    With a policy that revalidates, GET responses carrying an ETag or
+    Last-Modified header are kept up to max_stale seconds after their TTL
+    runs out and the next request for them is sent with
+    If-None-Match/If-Modified-Since. A 304 Not Modified answer is served
+    from the cache.
+
+    Every method takes the scope of the caller (see
+    HttpTransport.get_cache_scope), keeping the responses of different
+    clients apart in a shared backend, except for shared policies.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend | None = None,
+        policies: Mapping[str, float | CachePolicy] | None = None,
+        ttl: float = 0,
+    ):
+        self.backend = backend if backend is not None else LRUCache()
+        self.policies = {
+            prefix: policy if isinstance(policy, CachePolicy) else CachePolicy(ttl=policy)
+            for prefix, policy in (policies or {}).items()
+        }
+        self.ttl = ttl
+
+    def get_policy(self, url: str) -> CachePolicy:
+        prefixes = [prefix for prefix in self.policies if url.startswith(prefix)]
+        if not prefixes:
+            return CachePolicy(ttl=self.ttl)
+        return self.policies[max(prefixes, key=len)]
+
+    def get_ttl(self, url: str) -> float:
+        return self.get_policy(url).ttl
+
+    def is_cacheable(self, method: str, url: str) -> bool:
+        policy = self.get_policy(url)
+        return method == 'GET' and (policy.revalidate or policy.ttl > 0)
+
+    def get_key(self, method: str, url: str, data: Mapping | None = None, scope: str | None = None) -> str:
+        return get_cache_key(method, url, data, None if self.get_policy(url).shared else scope)
+
+    def lock(self, method: str, url: str, data: Mapping | None = None, scope: str | None = None) -> Any:
+        return self.backend.lock(self.get_key(method, url, data, scope))
+
+    def get_entry(
+        self,
+        method: str,
+        url: str,
+        data: Mapping | None = None,
+        scope: str | None = None,
+    ) -> CacheEntry | None:
+        if not self.is_cacheable(method, url):
+            return None
+        return self.backend.get(self.get_key(method, url, data, scope))
+
+    def set_entry(
+        self,
+        method: str,
+        url: str,
+        data: Mapping | None,
+        entry: CacheEntry,
+        scope: str | None = None,
+    ) -> None:
+        policy = self.get_policy(url)
+        if policy.revalidate and entry.has_validators():
+            self.backend.set(self.get_key(method, url, data, scope), entry, policy.ttl + policy.max_stale)
+        elif policy.ttl > 0:
+            self.backend.set(self.get_key(method, url, data, scope), entry, policy.ttl)
+
+    def get(self, method: str, url: str, data: Mapping | None = None, scope: str | None = None) -> Any | None:
+        entry = self.get_entry(method, url, data, scope)
+        if entry is None or not entry.is_fresh():
+            return None
+        return entry.get_response()
+
+    def set(
+        self,
+        method: str,
+        url: str,
+        data: Mapping | None,
+        response: Any,
+        headers: Mapping[str, str] | None = None,
+        scope: str | None = None,
+    ) -> None:
+        if not self.is_cacheable(method, url):
+            return
+        headers = headers if headers is not None else {}
+        policy = self.get_policy(url)
+        entry = CacheEntry(
+            response=deepcopy(response),
+            expires_at=time.time() + policy.ttl,
+            etag=headers.get('ETag') if policy.revalidate else None,
+            last_modified=headers.get('Last-Modified') if policy.revalidate else None,
+        )
+        self.set_entry(method, url, data, entry, scope)
+
+    def store(
+        self,
+        method: str,
+        url: str,
+        data: Mapping | None,
+        response: Response,
+        entry: CacheEntry | None = None,
+        scope: str | None = None,
+    ) -> Any:
+        """
+        Stores the response of a request sent because the cached entry
+        was missing or stale and returns the body to hand out: the cached
+        one when the server answered 304 Not Modified.
+        """
+        if response.not_modified and entry is not None:
+            self.set_entry(method, url, data, replace(entry, expires_at=time.time() + self.get_ttl(url)), scope)
+            return entry.get_response()
+        self.set(method, url, data, response.data, response.headers, scope)
+        return response.data
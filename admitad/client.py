@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 
-from admitad import items, transport
+from admitad import async_transport, items, transport
 
 
 @dataclass
@@ -9,3 +9,19 @@ class Client:
 
     def __getattr__(self, name: str) -> type[items.Item]:
         return getattr(items, name)(self._transport)
+
+
+@dataclass
+class AsyncClient(Client):
+    """Client whose item methods return awaitables and iterate() async iterators."""
+
+    _transport: async_transport.AsyncHttpTransport
+
+    async def close(self) -> None:
+        await self._transport.close()
+
+    async def __aenter__(self) -> 'AsyncClient':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
@@ -0,0 +1,208 @@
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterable, Iterable, Mapping
+
+from admitad.models import Model, parse_datetime
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+try:
+    import pandas
+except ImportError:  # pragma: no cover
+    pandas = None
+
+INT, FLOAT, DATETIME, OBJECT = 'int', 'float', 'datetime', 'object'
+
+# the datetime64 NaT, so missing dates stay missing in numpy and pandas
+MISSING_DATETIME = -2 ** 63
+EPOCH = datetime(1970, 1, 1)
+
+DATETIME_COLUMNS = frozenset((
+    'date', 'datetime', 'action_date', 'click_date', 'closing_date', 'status_updated',
+))
+FLOAT_COLUMNS = frozenset(('payment', 'cart', 'ctr', 'cr', 'ecpc', 'ecpm'))
+
+
+def get_kind(name: str, value: Any) -> str:
+    """The kind of a column from its name, or from its first value."""
+    if name in DATETIME_COLUMNS:
+        return DATETIME
+    if name in FLOAT_COLUMNS or name.startswith('payment_sum'):
+        return FLOAT
+    if isinstance(value, int) and not isinstance(value, bool):
+        return INT
+    if isinstance(value, float):
+        return FLOAT
+    return OBJECT
+
+
+def require_numpy() -> None:
+    if numpy is None:
+        raise ImportError('numpy is required: pip install numpy')
+
+
+class Column:
+    """
+    A typed column buffer: int64 and float64 values in array.array,
+    datetimes as int64 seconds since the epoch, anything else in a list.
+
+    A missing int turns the column into floats (NaN), a value that does
+    not fit its kind turns it into objects.
+    """
+
+    __slots__ = ('name', 'kind', 'values', '_dates')
+
+    def __init__(self, name: str, kind: str, size: int = 0):
+        self.name = name
+        self.kind = kind
+        self._dates = {}
+        if kind == INT:
+            self.values = array('q', [0]) * size
+        elif kind == FLOAT:
+            self.values = array('d', [float('nan')]) * size
+        elif kind == DATETIME:
+            self.values = array('q', [MISSING_DATETIME]) * size
+        else:
+            self.values = [None] * size
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def append(self, value: Any) -> None:
+        if self.kind == INT:
+            if value is None:
+                self._convert(FLOAT)
+            elif isinstance(value, int) and not isinstance(value, bool):
+                self.values.append(value)
+                return
+            elif isinstance(value, float):
+                self._convert(FLOAT)
+            else:
+                self._convert(OBJECT)
+            self.append(value)
+        elif self.kind == FLOAT:
+            try:
+                self.values.append(float(value) if value is not None else float('nan'))
+            except (TypeError, ValueError):
+                self._convert(OBJECT)
+                self.append(value)
+        elif self.kind == DATETIME:
+            seconds = self._parse_datetime(value)
+            if seconds is None:
+                self._convert(OBJECT)
+                self.append(value)
+            else:
+                self.values.append(seconds)
+        else:
+            self.values.append(value)
+
+    def _parse_datetime(self, value: Any) -> int | None:
+        if value is None or value == '':
+            return MISSING_DATETIME
+        # statistics repeat the same dates, every distinct one is parsed once
+        seconds = self._dates.get(value)
+        if seconds is None:
+            parsed = parse_datetime(value)
+            if not isinstance(parsed, datetime):
+                return None
+            if parsed.tzinfo is not None:
+                # stored as naive UTC, so equal instants get equal values
+                parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+            seconds = self._dates[value] = int((parsed - EPOCH).total_seconds())
+        return seconds
+
+    def _convert(self, kind: str) -> None:
+        values = self.to_list()
+        self.kind = kind
+        if kind == FLOAT:
+            self.values = array('d', values)
+        else:
+            self.values = values
+
+    def to_list(self) -> list:
+        if self.kind == DATETIME:
+            return [
+                EPOCH + timedelta(seconds=value) if value != MISSING_DATETIME else None
+                for value in self.values
+            ]
+        return list(self.values)
+
+    def to_numpy(self) -> 'numpy.ndarray':
+        require_numpy()
+        if self.kind == INT:
+            return numpy.frombuffer(self.values, dtype=numpy.int64)
+        if self.kind == FLOAT:
+            return numpy.frombuffer(self.values, dtype=numpy.float64)
+        if self.kind == DATETIME:
+            return numpy.frombuffer(self.values, dtype=numpy.int64).view('datetime64[s]')
+        return numpy.array(self.values, dtype=object)
+
+
+class Table:
+    """
+    Rows accumulated into typed column buffers instead of dicts.
+
+    Column kinds come from schema (name -> 'int', 'float', 'datetime' or
+    'object'), from the column name for dates and amounts, or from the
+    first value. Keys missing from a row are stored as missing values.
+    Model rows are stored by their raw values.
+    """
+
+    def __init__(self, schema: Mapping[str, str] | None = None):
+        self.schema = dict(schema or {})
+        self.columns = {}
+        self.num_rows = 0
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Mapping], schema: Mapping[str, str] | None = None) -> 'Table':
+        table = cls(schema)
+        table.extend(rows)
+        return table
+
+    @classmethod
+    async def afrom_rows(cls, rows: AsyncIterable[Mapping], schema: Mapping[str, str] | None = None) -> 'Table':
+        table = cls(schema)
+        async for row in rows:
+            table.append(row)
+        return table
+
+    def __len__(self) -> int:
+        return self.num_rows
+
+    def append(self, row: Mapping | Model) -> None:
+        if isinstance(row, Model):
+            row = row.to_dict()
+        for name, value in row.items():
+            column = self.columns.get(name)
+            if column is None:
+                kind = self.schema.get(name) or get_kind(name, value)
+                column = self.columns[name] = Column(name, kind)
+                for _ in range(self.num_rows):
+                    column.append(None)
+            column.append(value)
+        self.num_rows += 1
+        for column in self.columns.values():
+            if len(column) < self.num_rows:
+                column.append(None)
+
+    def extend(self, rows: Iterable[Mapping]) -> None:
+        for row in rows:
+            self.append(row)
+
+    def column(self, name: str) -> array | list:
+        return self.columns[name].values
+
+    def to_dict(self) -> dict[str, list]:
+        return {name: column.to_list() for name, column in self.columns.items()}
+
+    def to_numpy(self) -> dict[str, 'numpy.ndarray']:
+        """Numpy arrays sharing the int, float and datetime buffers."""
+        return {name: column.to_numpy() for name, column in self.columns.items()}
+
+    def to_pandas(self) -> 'pandas.DataFrame':
+        if pandas is None:
+            raise ImportError('pandas is required: pip install pandas')
+        return pandas.DataFrame(self.to_numpy())
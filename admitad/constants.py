@@ -6,12 +6,29 @@ LONG_DATE_FORMAT: str = '%d.%m.%Y %H:%M:%S'
 SUPPORTED_LANGUAGES: tuple[str, ...] = ('ru', 'en', 'de', 'pl', 'es', 'tr')
 
 DEFAULT_REQUEST_TIMEOUT: int = 60
+DEFAULT_POOL_CONNECTIONS: int = 10
+DEFAULT_POOL_MAXSIZE: int = 10
+DEFAULT_KEEP_ALIVE_TIMEOUT: float = 60.0
+DEFAULT_ASYNC_POOL_LIMIT: int = 100
+DEFAULT_STREAM_CHUNK_SIZE: int = 64 * 1024
+DEFAULT_EXPORT_BATCH_SIZE: int = 10000
+DEFAULT_BULK_BUFFER_SIZE: int = 10000
+DEFAULT_BULK_WORKERS: int = 4
+DEFAULT_SHARD_BUFFER_SIZE: int = 500
+DEFAULT_CACHE_MAXSIZE: int = 1024
+DEFAULT_CACHE_LOCK_TIMEOUT: float = 30.0
+DEFAULT_CACHE_LOCK_POLL_INTERVAL: float = 0.05
+DEFAULT_CACHE_MAX_STALE: float = 86400.0
+DEFAULT_REFERENCE_CACHE_TTL: float = 3600.0
+DEFAULT_TOKEN_REFRESH_MARGIN: float = 300.0
 DEFAULT_LANGUAGE: str = 'ru'
 DEFAULT_PAGINATION_LIMIT: int = 20
 DEFAULT_PAGINATION_OFFSET: int = 0
 
 MAX_PAGINATION_LIMIT: int = 500
 MAX_SUB_ID_LENGTH: int = 250
+MAX_DEEPLINK_ULP_COUNT: int = 200
+MAX_RESOLVE_LINK_COUNT: int = 100
 
 DEFAULT_PROD_URL: str = 'https://api.admitad.com/'
 CUSTOM_BASE_URL: str = os.getenv('ADMITAD_API_LIB_BASE_URL')
@@ -0,0 +1,42 @@
+import json
+from typing import Any, Callable
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover
+    ujson = None
+
+Decoder = Callable[[bytes], Any]
+
+
+def stdlib_decoder(content: bytes) -> Any:
+    # json.loads detects the utf-8/16/32 encoding of bytes itself
+    return json.loads(content)
+
+
+def get_decoder(name: str | None = None) -> Decoder:
+    """
+    Returns the loads function of the named JSON library, or of the
+    fastest one installed (orjson, ujson, json) when name is None.
+    All of them parse the raw response bytes.
+    """
+    decoders = {
+        'orjson': orjson.loads if orjson is not None else None,
+        'ujson': ujson.loads if ujson is not None else None,
+        'json': stdlib_decoder,
+    }
+    if name is not None:
+        if name not in decoders:
+            raise ValueError('Unknown JSON decoder "%s"' % name)
+        if decoders[name] is None:
+            raise ImportError('%s is not installed: pip install %s' % (name, name))
+        return decoders[name]
+    return next(decoder for decoder in decoders.values() if decoder is not None)
+
+
+DEFAULT_DECODER: Decoder = get_decoder()
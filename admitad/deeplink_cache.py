@@ -0,0 +1,101 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Iterable
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS deeplinks (
+    website_id INTEGER NOT NULL,
+    campaign_id INTEGER NOT NULL,
+    subid TEXT NOT NULL,
+    ulp TEXT NOT NULL,
+    deeplink TEXT NOT NULL,
+    expires_at REAL,
+    PRIMARY KEY (website_id, campaign_id, subid, ulp)
+)
+"""
+
+
+class DeeplinkCache:
+    """
+    Keeps generated deeplinks in an SQLite file, keyed by website,
+    campaign, ulp and subid, so the same url is generated once.
+
+    Entries expire after ttl seconds (never by default). The deeplinks of
+    a campaign are dropped when it is disconnected from the website with
+    CampaignsManage.disconnect. The file may be shared by processes.
+    """
+
+    def __init__(self, path: str, ttl: float | None = None):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute(SCHEMA)
+
+    @staticmethod
+    def get_subid(subid: str | None) -> str:
+        return subid if subid is not None else ''
+
+    def get_many(
+        self,
+        website_id: int,
+        campaign_id: int,
+        ulp: Iterable[str],
+        subid: str | None = None,
+    ) -> dict[str, Any]:
+        """Returns the fresh cached deeplinks of the urls found, by url."""
+        ulp = list(dict.fromkeys(ulp))
+        found = {}
+        with self._lock:
+            for start in range(0, len(ulp), 500):
+                batch = ulp[start:start + 500]
+                rows = self._connection.execute(
+                    'SELECT ulp, deeplink FROM deeplinks WHERE website_id = ? AND campaign_id = ? AND subid = ?'
+                    ' AND ulp IN (%s) AND (expires_at IS NULL OR expires_at > ?)' % ', '.join('?' * len(batch)),
+                    (int(website_id), int(campaign_id), self.get_subid(subid), *batch, time.time()),
+                )
+                found.update((url, json.loads(deeplink)) for url, deeplink in rows)
+        return found
+
+    def set_many(
+        self,
+        website_id: int,
+        campaign_id: int,
+        deeplinks: dict[str, Any],
+        subid: str | None = None,
+    ) -> None:
+        expires_at = time.time() + self.ttl if self.ttl is not None else None
+        rows = [
+            (int(website_id), int(campaign_id), self.get_subid(subid), url, json.dumps(deeplink), expires_at)
+            for url, deeplink in deeplinks.items()
+        ]
+        with self._lock:
+            self._connection.executemany('INSERT OR REPLACE INTO deeplinks VALUES (?, ?, ?, ?, ?, ?)', rows)
+
+    def invalidate(self, website_id: int, campaign_id: int) -> None:
+        """Drops the deeplinks of a campaign for a website."""
+        with self._lock:
+            self._connection.execute(
+                'DELETE FROM deeplinks WHERE website_id = ? AND campaign_id = ?',
+                (int(website_id), int(campaign_id)),
+            )
+
+    def purge(self) -> None:
+        """Drops the expired deeplinks."""
+        with self._lock:
+            self._connection.execute('DELETE FROM deeplinks WHERE expires_at <= ?', (time.time(),))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection.execute('DELETE FROM deeplinks')
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute('SELECT COUNT(*) FROM deeplinks').fetchone()[0]
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
 @dataclass
@@ -6,6 +6,7 @@ class HttpException(Exception):
     status: int
     message: str
     content: str
+    headers: dict = field(default_factory=dict, repr=False)
 
     def __str__(self) -> str:
         return f"HttpException({self.status}): {self.message}\n{self.content}"
@@ -0,0 +1,356 @@
+import csv
+import gzip
+import io
+import json
+import os
+from typing import Any, AsyncIterator, Iterable, Iterator, TextIO
+
+from admitad.constants import DEFAULT_EXPORT_BATCH_SIZE
+from admitad.models import Model
+from admitad.pagination import Checkpoint, CheckpointFile, get_results
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover
+    pyarrow = None
+
+FORMATS: tuple[str, ...] = ('csv', 'jsonl', 'parquet')
+
+
+def get_format(path: str) -> str:
+    """Guesses the export format from the file extension, e.g. actions.csv.gz."""
+    name = path[:-3] if path.endswith('.gz') else path
+    extension = os.path.splitext(name)[1].lstrip('.').lower()
+    if extension == 'json':
+        return 'jsonl'
+    if extension not in FORMATS:
+        raise ValueError('Unknown export format of "%s", pass format=%s' % (path, '|'.join(FORMATS)))
+    return extension
+
+
+def to_row(row: Any) -> dict:
+    return row.to_dict() if isinstance(row, Model) else row
+
+
+class JsonLinesWriter:
+    """Writes one JSON object per line."""
+
+    def __init__(self, fieldnames: list[str] | None = None, header: bool = True):
+        self.fieldnames = fieldnames
+        self.header = False
+
+    def write_rows(self, fp: TextIO, rows: Iterable[Any]) -> int:
+        count = 0
+        for row in rows:
+            fp.write(json.dumps(to_row(row), ensure_ascii=False, default=str))
+            fp.write('\n')
+            count += 1
+        return count
+
+
+class CsvWriter:
+    """
+    Writes rows as CSV with a header. The columns are fieldnames, the keys
+    of the first row by default; a row with a key missing from them is an
+    error rather than silently dropped. Nested values are written as JSON.
+    The header is written before the first row unless header is False
+    (when appending to a file).
+    """
+
+    def __init__(self, fieldnames: list[str] | None = None, header: bool = True):
+        self.fieldnames = fieldnames
+        self.header = header
+
+    @staticmethod
+    def prepare(row: dict) -> dict:
+        return {
+            key: json.dumps(value, ensure_ascii=False) if isinstance(value, (dict, list)) else value
+            for key, value in row.items()
+        }
+
+    def write_rows(self, fp: TextIO, rows: Iterable[Any]) -> int:
+        writer = None
+        count = 0
+        for row in rows:
+            row = to_row(row)
+            if writer is None:
+                if self.fieldnames is None:
+                    self.fieldnames = list(row)
+                if self.header:
+                    csv.writer(fp).writerow(self.fieldnames)
+                    self.header = False
+                writer = csv.DictWriter(fp, self.fieldnames)
+            unknown = [key for key in row if key not in writer.fieldnames]
+            if unknown:
+                raise ValueError('Row keys %s are not among the CSV columns, pass fieldnames to export them' % unknown)
+            writer.writerow(self.prepare(row))
+            count += 1
+        return count
+
+
+WRITERS = {
+    'csv': CsvWriter,
+    'jsonl': JsonLinesWriter,
+}
+
+
+def write_page(raw: io.BufferedIOBase, writer: Any, rows: Iterable[Any], compress: bool) -> int:
+    """
+    Writes the rows of one page. Compressed pages are separate gzip members,
+    so the file is valid gzip after every page.
+    """
+    fp = gzip.GzipFile(fileobj=raw, mode='wb') if compress else raw
+    text = io.TextIOWrapper(fp, encoding='utf-8', newline='')
+    try:
+        return writer.write_rows(text, rows)
+    finally:
+        text.flush()
+        text.detach()
+        if compress:
+            fp.close()
+        raw.flush()
+
+
+def open_export(path: str, checkpoint: Checkpoint) -> io.BufferedIOBase:
+    raw = open(path, 'r+b' if checkpoint.position else 'wb')
+    raw.seek(checkpoint.position)
+    raw.truncate()
+    return raw
+
+
+def get_writer(format: str, checkpoint: Checkpoint, fieldnames: list[str] | None) -> Any:
+    """A writer for the format, going on with the columns and header of a resumed job."""
+    state = checkpoint.state
+    if state.get('fieldnames') is not None:
+        fieldnames = state['fieldnames']
+    # checkpoints without the header flag wrote it along with the fieldnames
+    header = state.get('header', state.get('fieldnames') is None)
+    return WRITERS[format](fieldnames=fieldnames, header=header)
+
+
+def export_page(raw: io.BufferedIOBase, writer: Any, page: Any, checkpoint: Checkpoint, compress: bool) -> int:
+    """
+    Writes a page and records the position, CSV columns and whether the
+    header is still to be written in the checkpoint, before the pagination
+    engine saves it.
+    """
+    rows = write_page(raw, writer, get_results(page), compress)
+    checkpoint.position = raw.tell()
+    checkpoint.state['fieldnames'] = writer.fieldnames
+    checkpoint.state['header'] = writer.header
+    return rows
+
+
+def export_pages(
+    pages: Iterator[Any],
+    path: str,
+    format: str,
+    checkpoint: Checkpoint,
+    compress: bool = False,
+    fieldnames: list[str] | None = None,
+) -> int:
+    """
+    Writes pages to path, starting at the position of the checkpoint when
+    it resumes a job.
+    """
+    writer = get_writer(format, checkpoint, fieldnames)
+    rows = checkpoint.rows
+    with open_export(path, checkpoint) as raw:
+        for page in pages:
+            rows += export_page(raw, writer, page, checkpoint, compress)
+    return rows
+
+
+async def aexport_pages(
+    pages: AsyncIterator[Any],
+    path: str,
+    format: str,
+    checkpoint: Checkpoint,
+    compress: bool = False,
+    fieldnames: list[str] | None = None,
+) -> int:
+    """Async counterpart of export_pages."""
+    writer = get_writer(format, checkpoint, fieldnames)
+    rows = checkpoint.rows
+    with open_export(path, checkpoint) as raw:
+        async for page in pages:
+            rows += export_page(raw, writer, page, checkpoint, compress)
+    return rows
+
+
+class ParquetExport:
+    """Writes rows in row groups of batch_size, the schema is taken from the first group."""
+
+    def __init__(self, path: str, compress: bool = False, batch_size: int = DEFAULT_EXPORT_BATCH_SIZE):
+        if pyarrow is None:
+            raise ImportError('pyarrow is required for parquet exports: pip install admitad[parquet]')
+        self.path = path
+        self.compress = compress
+        self.batch_size = batch_size
+        self.rows = 0
+        self._writer = None
+        self._batch = []
+
+    def add_page(self, page: Any) -> None:
+        for row in get_results(page):
+            self._batch.append(to_row(row))
+            self.rows += 1
+            if len(self._batch) >= self.batch_size:
+                self.flush()
+
+    def flush(self) -> None:
+        schema = self._writer.schema if self._writer is not None else None
+        table = pyarrow.Table.from_pylist(self._batch, schema=schema)
+        if self._writer is None:
+            compression = 'gzip' if self.compress else 'snappy'
+            self._writer = pyarrow.parquet.ParquetWriter(self.path, table.schema, compression=compression)
+        self._writer.write_table(table)
+        self._batch.clear()
+
+    def finish(self) -> int:
+        if self._batch or self._writer is None:
+            self.flush()
+        return self.rows
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+def export_parquet(pages: Iterator[Any], path: str, compress: bool = False, batch_size: int = DEFAULT_EXPORT_BATCH_SIZE) -> int:
+    parquet = ParquetExport(path, compress, batch_size)
+    try:
+        for page in pages:
+            parquet.add_page(page)
+        return parquet.finish()
+    finally:
+        parquet.close()
+
+
+async def aexport_parquet(
+    pages: AsyncIterator[Any],
+    path: str,
+    compress: bool = False,
+    batch_size: int = DEFAULT_EXPORT_BATCH_SIZE,
+) -> int:
+    parquet = ParquetExport(path, compress, batch_size)
+    try:
+        async for page in pages:
+            parquet.add_page(page)
+        return parquet.finish()
+    finally:
+        parquet.close()
+
+
+def get_export_pages(
+    item: Any,
+    args: tuple,
+    kwargs: dict,
+    format: str,
+    compress: bool,
+    checkpoint: str | None,
+    workers: int,
+    stream: bool,
+    fieldnames: list[str] | None,
+) -> tuple[Any, Checkpoint | None, CheckpointFile | None]:
+    """Returns the pages to export, the job checkpoint and its file."""
+    if format == 'parquet':
+        if checkpoint is not None:
+            raise ValueError('Parquet exports cannot be resumed')
+        return item.iterate_pages(*args, workers=workers, stream=stream, **kwargs), None, None
+    if format not in WRITERS:
+        raise ValueError('Unknown export format "%s"' % format)
+
+    checkpoint_file = CheckpointFile(checkpoint) if checkpoint is not None else None
+    if checkpoint_file is not None:
+        # other columns make another job, its file could not be appended to
+        extra = {'fieldnames': fieldnames} if fieldnames is not None else {}
+        job = item.load_checkpoint(checkpoint_file, *args, format=format, compress=compress, **extra, **kwargs)
+    else:
+        job = Checkpoint(item.__class__.__name__, {}, offset=kwargs.get('offset', 0))
+
+    pages = item.iterate_pages(
+        *args,
+        workers=workers,
+        stream=stream,
+        checkpoint=job,
+        on_checkpoint=checkpoint_file.save if checkpoint_file is not None else None,
+        **kwargs,
+    )
+    return pages, job, checkpoint_file
+
+
+def export(
+    item: Any,
+    path: str,
+    *args: Any,
+    format: str | None = None,
+    compress: bool | None = None,
+    checkpoint: str | None = None,
+    workers: int = 1,
+    stream: bool = False,
+    batch_size: int = DEFAULT_EXPORT_BATCH_SIZE,
+    fieldnames: list[str] | None = None,
+    **kwargs: Any,
+) -> int:
+    """
+    Exports every row of a paginated item, e.g. export(client.StatisticActions,
+    'actions.csv.gz', date_start='01.01.2020'), and returns the number of rows.
+
+    Pages are written as they arrive, so memory is bounded by a page (a row
+    with stream). format and compress default to the file extension.
+    fieldnames are the CSV columns, the keys of the first row by default.
+
+    With a checkpoint path (csv and jsonl only) the progress is saved after
+    every page and a failed export called again with the same arguments
+    resumes after the last page written. The checkpoint is removed once
+    the export is complete. Items of an AsyncClient are exported by aexport.
+    """
+    format = format or get_format(path)
+    compress = path.endswith('.gz') if compress is None else compress
+    pages, job, checkpoint_file = get_export_pages(
+        item, args, kwargs, format, compress, checkpoint, workers, stream, fieldnames,
+    )
+    if hasattr(pages, '__aiter__'):
+        raise TypeError('%s belongs to an async client, export it with aexport' % item.__class__.__name__)
+
+    if job is None:
+        return export_parquet(pages, path, compress=compress, batch_size=batch_size)
+    rows = export_pages(pages, path, format, job, compress, fieldnames)
+    if checkpoint_file is not None:
+        checkpoint_file.delete()
+    return rows
+
+
+async def aexport(
+    item: Any,
+    path: str,
+    *args: Any,
+    format: str | None = None,
+    compress: bool | None = None,
+    checkpoint: str | None = None,
+    workers: int = 1,
+    stream: bool = False,
+    batch_size: int = DEFAULT_EXPORT_BATCH_SIZE,
+    fieldnames: list[str] | None = None,
+    **kwargs: Any,
+) -> int:
+    """
+    Async counterpart of export for the items of an AsyncClient. Pages are
+    fetched by concurrent tasks and written from the event loop.
+    """
+    format = format or get_format(path)
+    compress = path.endswith('.gz') if compress is None else compress
+    pages, job, checkpoint_file = get_export_pages(
+        item, args, kwargs, format, compress, checkpoint, workers, stream, fieldnames,
+    )
+    if not hasattr(pages, '__aiter__'):
+        raise TypeError('%s belongs to a sync client, export it with export' % item.__class__.__name__)
+
+    if job is None:
+        return await aexport_parquet(pages, path, compress=compress, batch_size=batch_size)
+    rows = await aexport_pages(pages, path, format, job, compress, fieldnames)
+    if checkpoint_file is not None:
+        checkpoint_file.delete()
+    return rows
@@ -1,15 +1,119 @@
 from datetime import datetime, date
 from urllib.parse import urljoin
 
-from admitad.constants import BASE_URL, DATE_FORMAT, LONG_DATE_FORMAT
+from admitad.constants import BASE_URL, DATE_FORMAT, DEFAULT_BULK_WORKERS, LONG_DATE_FORMAT
 from admitad.transport import HttpTransport
 
 
 class Item:
 
+    MODEL = None
+
     def __init__(self, transport: HttpTransport):
         self.transport = transport
-        self.transport.clean_data()
+
+    def with_options(self, **options):
+        """
+        Returns the same item on a copy of the transport with some options
+        replaced, e.g. client.StatisticActions.with_options(retry=policy).get()
+
+        model=True selects the MODEL of the item, returning result rows as
+        typed models instead of dicts.
+
+        """
+        if options.get('model') is True:
+            if self.MODEL is None:
+                raise AttributeError('%s has no result model' % self.__class__.__name__)
+            options['model'] = self.MODEL
+        return self.__class__(self.transport.with_options(**options))
+
+    def iterate(self, *args, workers=1, window=None, stream=False, checkpoint=None, on_checkpoint=None, **kwargs):
+        """
+        Lazily yields every result row of a paginated get() across all pages.
+        Takes the same arguments as get(), pages are always requested with
+        the maximum limit.
+
+        With workers > 1 pages after the first one are prefetched by a pool
+        of threads sharing this item, keeping at most `window` pages in flight.
+
+        With stream the rows of every page are decoded one at a time while
+        it is downloaded instead of holding the whole page in memory.
+
+        With a checkpoint (see load_checkpoint) iteration starts at its
+        offset and on_checkpoint is called with it after every page read.
+
+        With an async transport this returns an async iterator instead and
+        pages are prefetched by concurrent tasks.
+
+        """
+        fetch_page, offset = self._get_fetch_page(args, kwargs, stream)
+        return self.transport.iterate_results(
+            fetch_page,
+            offset=offset,
+            workers=workers,
+            window=window,
+            checkpoint=checkpoint,
+            on_checkpoint=on_checkpoint,
+        )
+
+    def iterate_pages(self, *args, workers=1, window=None, stream=False, checkpoint=None, on_checkpoint=None,
+                      **kwargs):
+        """
+        Lazily yields every page of a paginated get(), see iterate().
+
+        """
+        fetch_page, offset = self._get_fetch_page(args, kwargs, stream)
+        return self.transport.iterate_pages(
+            fetch_page,
+            offset=offset,
+            workers=workers,
+            window=window,
+            checkpoint=checkpoint,
+            on_checkpoint=on_checkpoint,
+        )
+
+    def load_checkpoint(self, checkpoint_file, *args, **kwargs):
+        """
+        Returns the checkpoint saved in a CheckpointFile by iterating this
+        item with the same arguments, or a new one to start with.
+
+        """
+        filters = {key: value for key, value in kwargs.items() if key not in ('limit', 'offset')}
+        if args:
+            filters['args'] = list(args)
+        return checkpoint_file.load(self.__class__.__name__, filters, offset=kwargs.get('offset', 0))
+
+    def getMany(self, ids, workers=DEFAULT_BULK_WORKERS, **kwargs):
+        """
+        Fetches many objects with getOne(), each distinct id once, by
+        `workers` threads sharing the connection pool (concurrent tasks
+        with an async transport). A tuple id is passed to getOne() as its
+        arguments, e.g. (coupon_id, website_id); kwargs are passed on.
+
+        Returns a mapping of every id to a BulkResult holding the object
+        or the error fetching it failed with.
+
+        """
+        if getattr(self, 'SINGLE_URL', None) is None or not hasattr(self, 'getOne'):
+            raise AttributeError('%s has no single object endpoint' % self.__class__.__name__)
+        ids = list(ids)
+
+        def call(_id):
+            if isinstance(_id, tuple):
+                return self.getOne(*_id, **kwargs)
+            return self.getOne(_id, **kwargs)
+
+        return self.transport.collect(self.transport.run_each(call, ids, workers=workers), ids)
+
+    def _get_fetch_page(self, args, kwargs, stream):
+        kwargs.pop('limit', None)
+        offset = kwargs.pop('offset', 0)
+        item = self.with_options(stream=True) if stream else self
+
+        def fetch_page(limit, offset):
+            return item.get(*args, limit=limit, offset=offset, **kwargs)
+
+        return fetch_page, offset
 
     @staticmethod
     def sanitize_fields(fields, **kwargs):
@@ -1,3 +1,4 @@
+from admitad.constants import DEFAULT_BULK_WORKERS, MAX_RESOLVE_LINK_COUNT
 from admitad.items.base import Item
 
 
@@ -64,14 +65,9 @@ class ManageBrokenLinks(Item):
 
     RESOLVE_URL = Item.prepare_url('broken_links/resolve')
 
-    def resolve(self, broken_link_ids):
-        """
-        Args:
-            broken_links_ids (list of int)
-
-        """
-
-        filtering = {
+    @staticmethod
+    def get_resolve_filtering(broken_link_ids):
+        return {
             'filter_by': {
                 'link_id': broken_link_ids
             },
@@ -80,6 +76,58 @@ class ManageBrokenLinks(Item):
             }
         }
 
+    def resolve(self, broken_link_ids):
+        """
+        Args:
+            broken_links_ids (list of int)
+
+        """
+
         return self.transport.post() \
-                   .set_filtering(filtering) \
+                   .set_filtering(self.get_resolve_filtering(broken_link_ids)) \
                    .request(url=self.RESOLVE_URL)
+
+    def resolve_all(self, workers=DEFAULT_BULK_WORKERS, chunk_size=MAX_RESOLVE_LINK_COUNT, **kwargs):
+        """
+        Resolves every broken link matching the filters of BrokenLinks.get.
+
+        The ids of all matching links are read page by page first, so
+        resolving does not shift the pages still to read, then posted in
+        chunks of chunk_size by `workers` threads (concurrent tasks with
+        an async transport). A chunk rejected as invalid for some of its
+        ids is split until they are found; other errors, e.g. a missing
+        scope or throttling, fail the chunk after a single request.
+
+        Returns a BulkSummary of the resolved and failed ids.
+
+        Args:
+            workers (int)
+            chunk_size (int)
+            website (list of int)
+            campaign (list of int)
+            search (str)
+            reason (int)
+            date_start (date)
+            date_end (date)
+
+        """
+        rows = BrokenLinks(self.transport).iterate(**kwargs)
+        if hasattr(rows, '__aiter__'):
+            ids = (row['id'] async for row in rows)
+        else:
+            ids = (row['id'] for row in rows)
+
+        def call(key, broken_link_ids):
+            return self.transport.post() \
+                       .set_filtering(self.get_resolve_filtering(broken_link_ids)) \
+                       .request(url=self.RESOLVE_URL, handler=lambda response: [response] * len(broken_link_ids))
+
+        results = self.transport.run_bulk(
+            call,
+            ids,
+            group=lambda broken_link_id: (None, broken_link_id),
+            batch_size=chunk_size,
+            buffer_size=None,
+            workers=workers,
+        )
+        return self.transport.summarize(results)
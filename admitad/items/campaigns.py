@@ -1,4 +1,5 @@
 from admitad.items.base import Item
+from admitad.models import Campaign
 
 
 __all__ = [
@@ -15,6 +16,7 @@ class Campaigns(Item):
     """
 
     SCOPE = 'advcampaigns'
+    MODEL = Campaign
 
     URL = Item.prepare_url('advcampaigns')
     SINGLE_URL = Item.prepare_url('advcampaigns/%(campaign_id)s')
@@ -70,6 +72,7 @@ class CampaignsForWebsite(Item):
     """
 
     SCOPE = 'advcampaigns_for_website'
+    MODEL = Campaign
 
     URL = Item.prepare_url('advcampaigns/website/%(website_id)s')
     SINGLE_URL = Item.prepare_url('advcampaigns/%(campaign_id)s/website/%(website_id)s')
@@ -147,6 +150,9 @@ class CampaignsManage(Item):
             c_id (int)
             w_id (int)
 
+        The cached deeplinks of the campaign for the website, if any,
+        are dropped once it is disconnected.
+
         """
         request_data = {
             'url': self.DISCONNECT_URL,
@@ -154,4 +160,12 @@ class CampaignsManage(Item):
             'website_id': Item.sanitize_id(w_id)
         }
 
-        return self.transport.post().request(**request_data)
+        cache = self.transport.deeplink_cache
+        if cache is None:
+            return self.transport.post().request(**request_data)
+
+        def handler(response):
+            cache.invalidate(w_id, c_id)
+            return response
+
+        return self.transport.post().request(handler=handler, **request_data)
@@ -1,4 +1,5 @@
 from admitad.items.base import Item
+from admitad.models import Coupon
 
 
 __all__ = [
@@ -26,6 +27,7 @@ class Coupons(CouponsBase):
     """
 
     SCOPE = 'coupons'
+    MODEL = Coupon
 
     URL = Item.prepare_url('coupons')
     SINGLE_URL = Item.prepare_url('coupons/%(coupon_id)s')
@@ -79,6 +81,7 @@ class CouponsForWebsite(CouponsBase):
     """
 
     SCOPE = 'coupons_for_website'
+    MODEL = Coupon
 
     URL = Item.prepare_url('coupons/website/%(website_id)s')
     SINGLE_URL = Item.prepare_url('coupons/%(campaign_id)s/website/%(website_id)s')
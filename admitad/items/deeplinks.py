@@ -1,3 +1,4 @@
+from admitad.constants import DEFAULT_BULK_BUFFER_SIZE, DEFAULT_BULK_WORKERS, MAX_DEEPLINK_ULP_COUNT
 from admitad.items.base import Item
 
 
@@ -14,7 +15,7 @@ class DeeplinksManage(Item):
 
     CREATE_FIELDS = {
         'ulp': lambda x: Item.sanitize_string_array(x, 'ulp'),
-        'subid': lambda x: Item.sanitize_string_value(x, 'subid', max_length=30),
+        'subid': lambda x: Item.sanitize_string_value(x, 'subid', max_length=30, blank=True),
         # todo: subid[1-4]
     }
 
@@ -26,6 +27,9 @@ class DeeplinksManage(Item):
             ulp (list of str)
             subid (str)
 
+        With a deeplink_cache on the transport only urls without a cached
+        deeplink are sent and a list of deeplinks in ulp order is returned.
+
         """
         data = Item.sanitize_fields(self.CREATE_FIELDS, **kwargs)
 
@@ -35,4 +39,57 @@ class DeeplinksManage(Item):
             'campaign_id': Item.sanitize_id(campaign_id),
         }
 
-        return self.transport.get().set_data(data).request(**request_data)
+        cache = self.transport.deeplink_cache
+        if cache is None:
+            return self.transport.get().set_data(data).request(**request_data)
+
+        ulp = data['ulp'] if isinstance(data['ulp'], list) else [data['ulp']]
+        cached = cache.get_many(website_id, campaign_id, ulp, subid=data['subid'])
+        missing = [url for url in dict.fromkeys(ulp) if url not in cached]
+        if not missing:
+            return self.transport.resolve([cached[url] for url in ulp])
+
+        def handler(response):
+            if not isinstance(response, list) or len(response) != len(missing):
+                return response
+            cache.set_many(website_id, campaign_id, dict(zip(missing, response)), subid=data['subid'])
+            deeplinks = dict(cached, **dict(zip(missing, response)))
+            return [deeplinks[url] for url in ulp]
+
+        return self.transport.get().set_data(dict(data, ulp=missing)).request(handler=handler, **request_data)
+
+    def create_many(self, links, subid=None, workers=DEFAULT_BULK_WORKERS, batch_size=MAX_DEEPLINK_ULP_COUNT,
+                    buffer_size=DEFAULT_BULK_BUFFER_SIZE):
+        """
+        Generates deeplinks for many urls of many campaigns.
+
+        links is an iterable of (website_id, campaign_id, ulp) tuples. They
+        are read buffer_size at a time, grouped by website and campaign and
+        sent with up to batch_size ulp per request by `workers` threads
+        (concurrent tasks with an async transport), paced by the rate
+        limiter of the transport.
+
+        Yields a BulkResult per link in input order, with the deeplink as
+        value or the error it failed with. A request rejected as invalid
+        for some of its urls is split until they are found, the others
+        still succeed; other errors fail every url of the request.
+
+        Args:
+            links (iterable of (int, int, str))
+            subid (str)
+            workers (int)
+            batch_size (int)
+            buffer_size (int)
+
+        """
+        def call(key, ulp):
+            return self.create(*key, ulp=ulp, subid=subid)
+
+        return self.transport.run_bulk(
+            call,
+            links,
+            group=lambda link: ((link[0], link[1]), link[2]),
+            batch_size=batch_size,
+            buffer_size=buffer_size,
+            workers=workers,
+        )
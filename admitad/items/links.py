@@ -1,3 +1,4 @@
+from admitad.constants import DEFAULT_BULK_WORKERS
 from admitad.items.base import Item
 
 
@@ -20,3 +21,20 @@ class LinksValidator(Item):
         data = Item.sanitize_fields(self.GET_FIELDS, link=link)
 
         return self.transport.get().set_data(data).request(url=self.URL)
+
+    def validate_many(self, links, workers=DEFAULT_BULK_WORKERS):
+        """
+        Validates many links by `workers` threads (concurrent tasks with an
+        async transport). Duplicate links are validated once.
+
+        Yields a BulkResult per distinct link as soon as it is validated,
+        with the verdict as value or the error the request failed with.
+        Verdicts are cached by the response cache of the transport, for
+        as long as its policy for LinksValidator.URL says.
+
+        Args:
+            links (iterable of str)
+            workers (int)
+
+        """
+        return self.transport.run_each(self.get, links, workers=workers)
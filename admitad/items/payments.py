@@ -1,4 +1,5 @@
 from admitad.items.base import Item
+from admitad.models import Payment
 
 
 __all__ = [
@@ -15,6 +16,7 @@ class Payments(Item):
     """
 
     SCOPE = 'payments'
+    MODEL = Payment
 
     URL = Item.prepare_url('payments')
     SINGLE_URL = Item.prepare_url('payments/%(payment_id)s')
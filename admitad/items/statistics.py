@@ -1,7 +1,9 @@
 from copy import copy
 
-from admitad.constants import MAX_SUB_ID_LENGTH
+from admitad.constants import DEFAULT_SHARD_BUFFER_SIZE, MAX_SUB_ID_LENGTH
 from admitad.items.base import Item
+from admitad.models import Action
+from admitad.sharding import get_sort_key, split_date_range
 
 
 __all__ = [
@@ -84,6 +86,15 @@ class StatisticBase(Item):
                    .set_filtering(filtering) \
                    .request(**kwargs)
 
+    def table(self, *args, schema=None, **kwargs):
+        """
+        Fetches every row like iterate(), taking the same arguments,
+        into a columnar Table convertible to numpy arrays or pandas.
+        With an async transport it returns an awaitable.
+
+        """
+        return self.transport.to_table(self.iterate(*args, **kwargs), schema=schema)
+
 
 class StatisticWebsites(StatisticBase):
     """
@@ -200,6 +211,7 @@ class StatisticActions(StatisticBase):
     """
 
     SCOPE = 'statistics'
+    MODEL = Action
 
     ORDERING = (
         'action',
@@ -220,6 +232,13 @@ class StatisticActions(StatisticBase):
         'website'
     )
 
+    ORDERING_FIELDS = {
+        'campaign': 'advcampaign_id',
+        'conv_time': 'conversion_time',
+        'datetime': 'action_date',
+        'website': 'website_id',
+    }
+
     FILTERING = {
         'date_start': lambda x: Item.sanitize_date(x, 'date_start', blank=True),
         'date_end': lambda x: Item.sanitize_date(x, 'date_end', blank=True),
@@ -273,6 +292,50 @@ class StatisticActions(StatisticBase):
         """
         return super(StatisticActions, self).get(self.URL, **kwargs)
 
+    def iterate_sharded(self, date_start, date_end=None, period='day', workers=4, window=None, sort=False,
+                        buffer_size=DEFAULT_SHARD_BUFFER_SIZE, **kwargs):
+        """
+        Yields every action of date_start..date_end (today by default) like
+        iterate(), taking the same filters, but splits the range into windows
+        of a day, a week or `period` days, each paged from offset 0 by one of
+        `workers` threads (concurrent tasks with an async transport).
+
+        Rows are yielded window after window, up to `window` read windows
+        being held in memory. With sort the windows, each ordered by
+        order_by, are merged lazily into one stream sorted by it, read
+        buffer_size rows at a time.
+
+        """
+        shards = split_date_range(date_start, date_end, period)
+
+        def fetch_shard(shard):
+            return self.iterate(date_start=shard[0], date_end=shard[1], **kwargs)
+
+        key, reverse = None, False
+        if sort:
+            order_by = kwargs.get('order_by') or []
+            if not isinstance(order_by, (list, tuple)):
+                order_by = [order_by]
+            if not order_by:
+                raise ValueError('Sorting sharded statistics needs order_by')
+            key, reverse = get_sort_key([self.get_sort_field(field) for field in order_by])
+
+        return self.transport.iterate_shards(
+            fetch_shard,
+            shards,
+            workers=workers,
+            window=window,
+            key=key,
+            reverse=reverse,
+            buffer_size=buffer_size,
+        )
+
+    @classmethod
+    def get_sort_field(cls, field):
+        descending = field.startswith('-')
+        name = cls.ORDERING_FIELDS.get(field.lstrip('-'), field.lstrip('-'))
+        return '-' + name if descending else name
+
 
 class StatisticSubIds(StatisticBase):
     """
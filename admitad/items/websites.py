@@ -4,6 +4,7 @@ from __future__ import unicode_literals
 from urllib.parse import quote
 
 from admitad.items.base import Item
+from admitad.models import Website
 
 
 __all__ = (
@@ -20,6 +21,7 @@ class Websites(Item):
     """
 
     SCOPE = 'websites'
+    MODEL = Website
 
     URL = Item.prepare_url('websites')
     SINGLE_URL = Item.prepare_url('websites/%(website_id)s')
@@ -211,6 +213,7 @@ class WebsitesManageV2(Item):
     """
 
     SCOPE = 'manage_websites'
+    MODEL = Website
     CREATE_URL = Item.prepare_url('websites/v2/create')
     UPDATE_URL = Item.prepare_url('websites/v2/update/%(website_id)s')
     VERIFY_URL = Item.prepare_url('websites/v2/verify/%(website_id)s')
@@ -318,8 +321,8 @@ class WebsitesManageV2(Item):
             'website_id': website_id
         }
 
-        transport = self.transport.get()
+        request = self.transport.get()
         if search_by == 'name':
-            transport.update_data({'search_by': 'name'})
+            request = request.update_data({'search_by': 'name'})
 
-        return transport.request(**requests_data)
+        return request.request(**requests_data)
@@ -0,0 +1,266 @@
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any, Callable
+
+from admitad.constants import DATE_FORMAT, LONG_DATE_FORMAT
+from admitad.streaming import ResultsStream
+
+
+def parse_datetime(value: Any) -> datetime | Any:
+    """Parses the ISO and dd.mm.yyyy dates of the API, other values are returned as they are."""
+    if not isinstance(value, str):
+        return value
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        pass
+    for date_format in (LONG_DATE_FORMAT, DATE_FORMAT):
+        try:
+            return datetime.strptime(value, date_format)
+        except ValueError:
+            pass
+    return value
+
+
+def parse_date(value: Any) -> date | Any:
+    value = parse_datetime(value)
+    return value.date() if isinstance(value, datetime) else value
+
+
+def parse_decimal(value: Any) -> Decimal | Any:
+    if isinstance(value, (str, int, float)) and not isinstance(value, bool):
+        try:
+            return Decimal(str(value))
+        except InvalidOperation:
+            pass
+    return value
+
+
+class Field:
+    """
+    A model field. The raw value is kept in the slot `_<name>` and decoded
+    on every access, a missing value reads as None.
+    """
+
+    __slots__ = ('decode', 'name', 'slot')
+
+    def __init__(self, decode: Callable[[Any], Any] | None = None):
+        self.decode = decode
+        self.name = None
+        self.slot = None
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance: 'Model | None', owner: type | None = None) -> Any:
+        if instance is None:
+            return self
+        try:
+            value = self.slot.__get__(instance, owner)
+        except AttributeError:
+            return None
+        if value is None or self.decode is None:
+            return value
+        return self.decode(value)
+
+    def __set__(self, instance: 'Model', value: Any) -> None:
+        self.slot.__set__(instance, value)
+
+
+class ModelMeta(type):
+    """Gives every Field of a model a slot, so instances carry no __dict__."""
+
+    def __new__(mcs, name: str, bases: tuple, namespace: dict) -> type:
+        fields = [key for key, value in namespace.items() if isinstance(value, Field)]
+        namespace['__slots__'] = tuple(namespace.get('__slots__', ())) + tuple('_%s' % key for key in fields)
+        cls = super().__new__(mcs, name, bases, namespace)
+        for key in fields:
+            namespace[key].slot = cls.__dict__['_%s' % key]
+        cls.FIELDS = {
+            key: value
+            for klass in reversed(cls.__mro__)
+            for key, value in vars(klass).items()
+            if isinstance(value, Field)
+        }
+        return cls
+
+
+class Model(metaclass=ModelMeta):
+    """
+    A typed result row with attribute access. Keys the model has no field
+    for are kept in `extra` and are readable as attributes too.
+    """
+
+    __slots__ = ('extra',)
+
+    FIELDS: dict[str, Field] = {}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Model':
+        instance = cls.__new__(cls)
+        extra = None
+        for key, value in data.items():
+            field = cls.FIELDS.get(key)
+            if field is not None:
+                field.slot.__set__(instance, value)
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        instance.extra = extra
+        return instance
+
+    def to_dict(self) -> dict:
+        """The raw values of the row, as returned by the API."""
+        data = {}
+        for key, field in self.FIELDS.items():
+            try:
+                data[key] = field.slot.__get__(self)
+            except AttributeError:
+                pass
+        data.update(self.extra or {})
+        return data
+
+    def __getattr__(self, name: str) -> Any:
+        if name != 'extra' and self.extra and name in self.extra:
+            return self.extra[name]
+        raise AttributeError('%s has no field "%s"' % (self.__class__.__name__, name))
+
+    def __eq__(self, other: Any) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return '%s(%s)' % (
+            self.__class__.__name__,
+            ', '.join('%s=%r' % (key, value) for key, value in self.to_dict().items()),
+        )
+
+
+def load_models(model: type[Model], response: Any) -> Any:
+    """
+    Converts the rows of a response to model instances: the `results` of
+    a page (a copy of the page is returned), the rows of a ResultsStream
+    or a single object.
+    """
+    if isinstance(response, ResultsStream):
+        response.factory = model.from_dict
+        return response
+    if isinstance(response, list):
+        return [model.from_dict(row) for row in response]
+    if not isinstance(response, dict):
+        return response
+    if isinstance(response.get('results'), list):
+        return {**response, 'results': [model.from_dict(row) for row in response['results']]}
+    return model.from_dict(response)
+
+
+class Action(Model):
+    action_id = Field()
+    action = Field()
+    action_type = Field()
+    status = Field()
+    processed = Field()
+    action_date = Field(parse_datetime)
+    click_date = Field(parse_datetime)
+    closing_date = Field(parse_date)
+    status_updated = Field(parse_datetime)
+    conversion_time = Field()
+    advcampaign_id = Field()
+    advcampaign_name = Field()
+    website_id = Field()
+    website_name = Field()
+    order_id = Field()
+    payment = Field(parse_decimal)
+    cart = Field(parse_decimal)
+    currency = Field()
+    subid = Field()
+    subid1 = Field()
+    subid2 = Field()
+    subid3 = Field()
+    subid4 = Field()
+    keyword = Field()
+    promocode = Field()
+    tariff_id = Field()
+    comment = Field()
+    positions = Field()
+
+
+class Campaign(Model):
+    id = Field()
+    name = Field()
+    name_aliases = Field()
+    status = Field()
+    connection_status = Field()
+    connected = Field()
+    site_url = Field()
+    gotolink = Field()
+    description = Field()
+    raw_description = Field()
+    image = Field()
+    currency = Field()
+    rating = Field(parse_decimal)
+    ecpc = Field(parse_decimal)
+    epc = Field(parse_decimal)
+    cr = Field(parse_decimal)
+    activation_date = Field(parse_datetime)
+    modified_date = Field(parse_datetime)
+    regions = Field()
+    categories = Field()
+    actions = Field()
+    traffics = Field()
+
+
+class Coupon(Model):
+    id = Field()
+    name = Field()
+    short_name = Field()
+    description = Field()
+    campaign = Field()
+    status = Field()
+    promocode = Field()
+    promolink = Field()
+    goto_link = Field()
+    discount = Field()
+    date_start = Field(parse_datetime)
+    date_end = Field(parse_datetime)
+    exclusive = Field()
+    rating = Field(parse_decimal)
+    image = Field()
+    language = Field()
+    species = Field()
+    types = Field()
+    categories = Field()
+    regions = Field()
+
+
+class Payment(Model):
+    id = Field()
+    status = Field()
+    currency = Field()
+    payment_sum = Field(parse_decimal)
+    withdrawal_type = Field()
+    datetime = Field(parse_datetime)
+    comment = Field()
+
+
+class Website(Model):
+    id = Field()
+    name = Field()
+    status = Field()
+    kind = Field()
+    site_url = Field()
+    description = Field()
+    verification_code = Field()
+    creation_date = Field(parse_datetime)
+    is_old = Field()
+    mailing_targeting = Field()
+    validation_passed = Field()
+    atnd_hits = Field()
+    atnd_visits = Field()
+    db_size = Field()
+    language = Field()
+    adservice = Field()
+    categories = Field()
+    regions = Field()
@@ -0,0 +1,328 @@
+import asyncio
+import json
+import os
+import tempfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Iterator
+
+from admitad.constants import DEFAULT_PAGINATION_OFFSET, MAX_PAGINATION_LIMIT
+from admitad.streaming import ResultsStream
+
+FetchPage = Callable[[int, int], dict]
+AsyncFetchPage = Callable[[int, int], Awaitable[dict]]
+
+
+@dataclass
+class Checkpoint:
+    """
+    The progress of a paginated job: the endpoint and filters it pages
+    through, the offset of the next page, `_meta.count` and the rows read.
+    Consumers keep their own progress in position (e.g. the size of an
+    output file) and state before asking for the next page.
+    """
+
+    endpoint: str
+    filters: dict
+    offset: int = DEFAULT_PAGINATION_OFFSET
+    count: int | None = None
+    rows: int = 0
+    position: int = 0
+    state: dict = field(default_factory=dict)
+
+    def advance(self, page: Any, limit: int) -> None:
+        self.offset += limit
+        self.rows += get_size(page)
+        count = get_count(page)
+        if count is not None:
+            self.count = count
+
+
+class CheckpointFile:
+    """
+    Keeps a Checkpoint on disk, replacing the file atomically on save.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    @staticmethod
+    def normalize(filters: dict) -> dict:
+        return json.loads(json.dumps(filters, sort_keys=True, default=str))
+
+    def load(self, endpoint: str, filters: dict, offset: int = DEFAULT_PAGINATION_OFFSET) -> Checkpoint:
+        """
+        Returns the saved checkpoint of the job, or a new one starting at
+        offset when there is none. A checkpoint of another endpoint or
+        filters is an error.
+        """
+        filters = self.normalize(filters)
+        try:
+            with open(self.path) as fp:
+                checkpoint = Checkpoint(**json.load(fp))
+        except FileNotFoundError:
+            return Checkpoint(endpoint, filters, offset=offset)
+        if checkpoint.endpoint != endpoint or checkpoint.filters != filters:
+            raise ValueError('Checkpoint %s belongs to another job: %s %s' % (
+                self.path, checkpoint.endpoint, checkpoint.filters,
+            ))
+        return checkpoint
+
+    def save(self, checkpoint: Checkpoint) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)))
+        try:
+            with os.fdopen(fd, 'w') as fp:
+                json.dump(asdict(checkpoint), fp)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def delete(self) -> None:
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def get_count(page: dict | ResultsStream) -> int | None:
+    meta = page.get('_meta') or {}
+    count = meta.get('count')
+    return int(count) if count is not None else None
+
+
+def get_results(page: dict | ResultsStream) -> Iterable[Any]:
+    if isinstance(page, ResultsStream):
+        return page
+    return page.get('results') or []
+
+
+def get_size(page: dict | ResultsStream) -> int:
+    """The number of rows of a page, for a stream the number read so far."""
+    if isinstance(page, ResultsStream):
+        return page.size
+    return len(page.get('results') or [])
+
+
+def _iterate_serial(fetch_page: FetchPage, limit: int, offset: int) -> Iterator[dict]:
+    while True:
+        page = fetch_page(limit, offset)
+        yield page
+
+        count = get_count(page)
+        size = get_size(page)
+        offset += limit
+
+        if count is not None and offset >= count:
+            return
+        if count is None and size < limit:
+            return
+
+
+def _iterate_parallel(
+    fetch_page: FetchPage,
+    limit: int,
+    offset: int,
+    workers: int,
+    window: int,
+) -> Iterator[dict]:
+    page = fetch_page(limit, offset)
+    yield page
+
+    count = get_count(page)
+    if count is None:
+        if get_size(page) == limit:
+            yield from _iterate_serial(fetch_page, limit, offset + limit)
+        return
+
+    executor = ThreadPoolExecutor(max_workers=workers)
+    pending = deque()
+    try:
+        for next_offset in range(offset + limit, count, limit):
+            pending.append(executor.submit(fetch_page, limit, next_offset))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _checkpointed(
+    pages: Iterator[dict],
+    limit: int,
+    checkpoint: Checkpoint,
+    on_checkpoint: Callable[[Checkpoint], None] | None,
+) -> Iterator[dict]:
+    for page in pages:
+        yield page
+        checkpoint.advance(page, limit)
+        if on_checkpoint is not None:
+            on_checkpoint(checkpoint)
+
+
+def iterate_pages(
+    fetch_page: FetchPage,
+    limit: int = MAX_PAGINATION_LIMIT,
+    offset: int = DEFAULT_PAGINATION_OFFSET,
+    workers: int = 1,
+    window: int | None = None,
+    checkpoint: Checkpoint | None = None,
+    on_checkpoint: Callable[[Checkpoint], None] | None = None,
+) -> Iterator[dict]:
+    """
+    Lazily yields pages returned by fetch_page(limit, offset).
+
+    Stops once the offset reaches `_meta.count`, or on a short page when
+    the response carries no count.
+
+    With workers > 1 the remaining offsets are fetched concurrently once
+    the first page reports `_meta.count`. Pages are still yielded in
+    order and at most `window` pages (2 * workers by default) are
+    in flight or buffered at any time. fetch_page must be thread-safe.
+
+    Pages may be ResultsStreams, which have to be read to the end before
+    the next page is requested (iterate_results does so).
+
+    With a checkpoint paging starts at its offset, and the checkpoint is
+    advanced past every page once the consumer asks for the next one,
+    then passed to on_checkpoint (e.g. CheckpointFile.save).
+    """
+    if checkpoint is not None:
+        offset = checkpoint.offset
+    if workers <= 1:
+        pages = _iterate_serial(fetch_page, limit, offset)
+    else:
+        pages = _iterate_parallel(fetch_page, limit, offset, workers, window or 2 * workers)
+    if checkpoint is None:
+        return pages
+    return _checkpointed(pages, limit, checkpoint, on_checkpoint)
+
+
+def iterate_results(
+    fetch_page: FetchPage,
+    limit: int = MAX_PAGINATION_LIMIT,
+    offset: int = DEFAULT_PAGINATION_OFFSET,
+    workers: int = 1,
+    window: int | None = None,
+    checkpoint: Checkpoint | None = None,
+    on_checkpoint: Callable[[Checkpoint], None] | None = None,
+) -> Iterator[Any]:
+    """Lazily yields the `results` rows of every page, see iterate_pages."""
+    pages = iterate_pages(
+        fetch_page,
+        limit=limit,
+        offset=offset,
+        workers=workers,
+        window=window,
+        checkpoint=checkpoint,
+        on_checkpoint=on_checkpoint,
+    )
+    for page in pages:
+        yield from get_results(page)
+
+
+async def _aiterate_serial(fetch_page: AsyncFetchPage, limit: int, offset: int) -> AsyncIterator[dict]:
+    while True:
+        page = await fetch_page(limit, offset)
+        yield page
+
+        count = get_count(page)
+        size = get_size(page)
+        offset += limit
+
+        if count is not None and offset >= count:
+            return
+        if count is None and size < limit:
+            return
+
+
+async def _aiterate_parallel(
+    fetch_page: AsyncFetchPage,
+    limit: int,
+    offset: int,
+    window: int,
+) -> AsyncIterator[dict]:
+    page = await fetch_page(limit, offset)
+    yield page
+
+    count = get_count(page)
+    if count is None:
+        if get_size(page) == limit:
+            async for page in _aiterate_serial(fetch_page, limit, offset + limit):
+                yield page
+        return
+
+    pending = deque()
+    try:
+        for next_offset in range(offset + limit, count, limit):
+            pending.append(asyncio.ensure_future(fetch_page(limit, next_offset)))
+            if len(pending) >= window:
+                yield await pending.popleft()
+        while pending:
+            yield await pending.popleft()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def _acheckpointed(
+    pages: AsyncIterator[dict],
+    limit: int,
+    checkpoint: Checkpoint,
+    on_checkpoint: Callable[[Checkpoint], None] | None,
+) -> AsyncIterator[dict]:
+    async for page in pages:
+        yield page
+        checkpoint.advance(page, limit)
+        if on_checkpoint is not None:
+            on_checkpoint(checkpoint)
+
+
+def aiterate_pages(
+    fetch_page: AsyncFetchPage,
+    limit: int = MAX_PAGINATION_LIMIT,
+    offset: int = DEFAULT_PAGINATION_OFFSET,
+    workers: int = 1,
+    window: int | None = None,
+    checkpoint: Checkpoint | None = None,
+    on_checkpoint: Callable[[Checkpoint], None] | None = None,
+) -> AsyncIterator[dict]:
+    """
+    Async counterpart of iterate_pages for a coroutine fetch_page.
+    With workers > 1 up to `window` pages are fetched by concurrent tasks.
+    """
+    if checkpoint is not None:
+        offset = checkpoint.offset
+    if workers <= 1:
+        pages = _aiterate_serial(fetch_page, limit, offset)
+    else:
+        pages = _aiterate_parallel(fetch_page, limit, offset, window or 2 * workers)
+    if checkpoint is None:
+        return pages
+    return _acheckpointed(pages, limit, checkpoint, on_checkpoint)
+
+
+async def aiterate_results(
+    fetch_page: AsyncFetchPage,
+    limit: int = MAX_PAGINATION_LIMIT,
+    offset: int = DEFAULT_PAGINATION_OFFSET,
+    workers: int = 1,
+    window: int | None = None,
+    checkpoint: Checkpoint | None = None,
+    on_checkpoint: Callable[[Checkpoint], None] | None = None,
+) -> AsyncIterator[Any]:
+    """Async counterpart of iterate_results."""
+    pages = aiterate_pages(
+        fetch_page,
+        limit=limit,
+        offset=offset,
+        workers=workers,
+        window=window,
+        checkpoint=checkpoint,
+        on_checkpoint=on_checkpoint,
+    )
+    async for page in pages:
+        for row in get_results(page):
+            yield row
@@ -0,0 +1,100 @@
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable
+
+from admitad.filelock import FileLock
+
+
+@dataclass
+class BucketState:
+    tokens: float
+    updated: float
+    blocked_until: float = 0.0
+
+
+def take_token(state: BucketState, now: float, rate: float, capacity: float) -> float:
+    """
+    Takes one token from the bucket and returns how many seconds the
+    caller has to wait before sending. The bucket may go negative, so
+    waiting callers queue up behind each other instead of racing.
+    """
+    state.tokens = min(capacity, state.tokens + (now - state.updated) * rate)
+    state.updated = now
+    state.tokens -= 1
+
+    wait = -state.tokens / rate if state.tokens < 0 else 0.0
+    return max(wait, state.blocked_until - now)
+
+
+class TokenBucket:
+    """
+    Paces requests of one process to `rate` requests per second with
+    bursts of up to `capacity` requests.
+
+    reserve() returns the delay before the next request may be sent,
+    acquire() sleeps for it. pause() blocks every request for a while,
+    e.g. for the Retry-After of a throttled response.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self.now = clock
+        self._state = BucketState(tokens=self.capacity, updated=self.now())
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        with self._lock:
+            return take_token(self._state, self.now(), self.rate, self.capacity)
+
+    def acquire(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._state.blocked_until = max(self._state.blocked_until, self.now() + seconds)
+
+
+class FileTokenBucket(TokenBucket):
+    """
+    A TokenBucket whose state lives in a file, shared by every process
+    using the same path (the quota of one client credential across a fleet
+    of workers on a host).
+    """
+
+    def __init__(self, path: str, rate: float, capacity: float | None = None, clock: Callable[[], float] = time.time):
+        self.path = path
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self.now = clock
+
+    def _load(self) -> BucketState:
+        try:
+            with open(self.path) as fp:
+                return BucketState(**json.load(fp))
+        except (OSError, ValueError, TypeError):
+            return BucketState(tokens=self.capacity, updated=self.now())
+
+    def _save(self, state: BucketState) -> None:
+        tmp_path = '%s.%s.tmp' % (self.path, os.getpid())
+        with open(tmp_path, 'w') as fp:
+            json.dump(asdict(state), fp)
+        os.replace(tmp_path, self.path)
+
+    def reserve(self) -> float:
+        with FileLock('%s.lock' % self.path):
+            state = self._load()
+            delay = take_token(state, self.now(), self.rate, self.capacity)
+            self._save(state)
+        return delay
+
+    def pause(self, seconds: float) -> None:
+        with FileLock('%s.lock' % self.path):
+            state = self._load()
+            state.blocked_until = max(state.blocked_until, self.now() + seconds)
+            self._save(state)
@@ -0,0 +1,65 @@
+import random
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+
+from admitad.exceptions import ConnectionException, HttpException
+
+IDEMPOTENT_METHODS: frozenset[str] = frozenset(('GET', 'PUT', 'DELETE'))
+RETRYABLE_STATUSES: frozenset[int] = frozenset((429, 500, 502, 503, 504))
+
+
+def get_retry_after(error: Exception) -> float | None:
+    """Seconds to wait according to the Retry-After header of an HttpException."""
+    headers = getattr(error, 'headers', None) or {}
+    value = next((value for key, value in headers.items() if key.lower() == 'retry-after'), None)
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Retries transient failures with capped exponential backoff.
+
+    A failed attempt is retried when the request method is in `methods`
+    and the error is a connection error or an HttpException with a status
+    in `statuses`. The n-th retry waits min(backoff_cap, backoff_base * 2 ** (n - 1))
+    seconds, randomized between zero and that value when jitter is on,
+    or longer when the response asks so with Retry-After.
+    """
+
+    max_attempts: int = 3
+    backoff_base: float = 0.5
+    backoff_cap: float = 30.0
+    jitter: bool = True
+    statuses: frozenset[int] = RETRYABLE_STATUSES
+    methods: frozenset[str] = IDEMPOTENT_METHODS
+
+    def is_retryable(self, method: str, error: Exception) -> bool:
+        if method not in self.methods:
+            return False
+        if isinstance(error, HttpException):
+            return error.status in self.statuses
+        return isinstance(error, ConnectionException)
+
+    def should_retry(self, method: str, error: Exception, attempt: int) -> bool:
+        """attempt is the number of attempts made so far."""
+        return attempt < self.max_attempts and self.is_retryable(method, error)
+
+    def get_delay(self, attempt: int, error: Exception | None = None) -> float:
+        delay = min(self.backoff_cap, self.backoff_base * 2 ** (attempt - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return max(delay, get_retry_after(error) or 0.0)
+
+
+NO_RETRY = RetryPolicy(max_attempts=1)
@@ -0,0 +1,260 @@
+import asyncio
+import heapq
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from itertools import islice
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Iterable, Iterator, Sequence
+
+from admitad.constants import DATE_FORMAT, DEFAULT_SHARD_BUFFER_SIZE
+
+Shard = tuple[date, date]
+FetchShard = Callable[[Shard], Iterable[Any]]
+AsyncFetchShard = Callable[[Shard], AsyncIterable[Any]]
+
+SHARD_PERIODS: dict[str, int] = {'day': 1, 'week': 7}
+
+
+def to_date(value: date | str) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(value, DATE_FORMAT).date()
+
+
+def split_date_range(
+    date_start: date | str,
+    date_end: date | str | None = None,
+    period: str | int = 'day',
+) -> list[Shard]:
+    """
+    Splits the inclusive range date_start..date_end (today by default)
+    into consecutive windows of a day, a week or `period` days.
+    """
+    days = SHARD_PERIODS[period] if isinstance(period, str) else period
+    if days < 1:
+        raise ValueError('Invalid shard period: %s' % period)
+    start = to_date(date_start)
+    end = to_date(date_end) if date_end is not None else date.today()
+    if end < start:
+        raise ValueError('date_end %s is before date_start %s' % (end, start))
+
+    shards = []
+    while start <= end:
+        shard_end = min(end, start + timedelta(days=days - 1))
+        shards.append((start, shard_end))
+        start = shard_end + timedelta(days=1)
+    return shards
+
+
+def get_sort_value(value: Any) -> tuple:
+    """Orders numbers sent as strings numerically and missing values above any other."""
+    if value is None:
+        return (2, 0)
+    if isinstance(value, str):
+        try:
+            return (0, float(value))
+        except ValueError:
+            return (1, value)
+    return (0, value)
+
+
+def get_sort_key(fields: Sequence[str]) -> tuple[Callable[[Any], tuple], bool]:
+    """
+    Returns a key function ordering rows (dicts or models) by fields,
+    each prefixed with '-' for descending order, and the reverse flag.
+    Every field has to be sorted in the same direction.
+    """
+    directions = {field.startswith('-') for field in fields}
+    if len(directions) > 1:
+        raise ValueError('Cannot merge shards sorted in mixed directions: %s' % list(fields))
+    reverse = directions == {True}
+    names = [field.lstrip('-') for field in fields]
+
+    def key(row):
+        if isinstance(row, dict):
+            return tuple(get_sort_value(row.get(name)) for name in names)
+        return tuple(get_sort_value(getattr(row, name, None)) for name in names)
+
+    return key, reverse
+
+
+def read_chunk(rows: Iterator[Any], size: int) -> list[Any]:
+    return list(islice(rows, size))
+
+
+def merge_shards(
+    executor: ThreadPoolExecutor,
+    fetch_shard: FetchShard,
+    shards: Sequence[Shard],
+    buffer_size: int,
+    key: Callable[[Any], Any],
+    reverse: bool,
+) -> Iterator[Any]:
+    """
+    Merges shards, each sorted by key, lazily. Every shard is read by the
+    executor buffer_size rows at a time, its next chunk being read while
+    the current one is merged, so at most two chunks per shard are held.
+    """
+    def open_shard(shard):
+        rows = iter(fetch_shard(shard))
+        return rows, read_chunk(rows, buffer_size)
+
+    def read_shard(first):
+        rows, chunk = first.result()
+        while chunk:
+            following = executor.submit(read_chunk, rows, buffer_size)
+            yield from chunk
+            chunk = following.result()
+
+    # the first chunk of every shard is requested before merging starts
+    readers = [read_shard(executor.submit(open_shard, shard)) for shard in shards]
+    return heapq.merge(*readers, key=key, reverse=reverse)
+
+
+def iterate_shards(
+    fetch_shard: FetchShard,
+    shards: Sequence[Shard],
+    workers: int = 1,
+    window: int | None = None,
+    key: Callable[[Any], Any] | None = None,
+    reverse: bool = False,
+    buffer_size: int = DEFAULT_SHARD_BUFFER_SIZE,
+) -> Iterator[Any]:
+    """
+    Yields the rows of every shard returned by fetch_shard(shard), reading
+    up to `workers` shards at a time by a pool of threads.
+
+    Without a key shards are yielded in order, keeping at most `window`
+    read shards in memory, so memory grows with window times the size of
+    a shard. With a key the shards, each sorted by it, are merged into one
+    sorted stream, holding up to two chunks of buffer_size rows per shard.
+    """
+    executor = ThreadPoolExecutor(max_workers=max(1, workers))
+    pending = deque()
+    try:
+        if key is not None:
+            yield from merge_shards(executor, fetch_shard, shards, buffer_size, key, reverse)
+            return
+
+        window = window or 2 * max(1, workers)
+        for shard in shards:
+            pending.append(executor.submit(lambda shard: list(fetch_shard(shard)), shard))
+            if len(pending) >= window:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+async def _fetch_shard_async(fetch_shard: AsyncFetchShard, shard: Shard, semaphore: asyncio.Semaphore) -> list:
+    async with semaphore:
+        return [row async for row in fetch_shard(shard)]
+
+
+async def _read_chunk_async(rows: AsyncIterator[Any], size: int, semaphore: asyncio.Semaphore) -> list[Any]:
+    chunk = []
+    async with semaphore:
+        while len(chunk) < size:
+            try:
+                chunk.append(await rows.__anext__())
+            except StopAsyncIteration:
+                break
+    return chunk
+
+
+class Descending:
+    """Inverts the order of a sort key, for merging in descending order with heapq."""
+
+    __slots__ = ('value',)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __eq__(self, other: 'Descending') -> bool:
+        return self.value == other.value
+
+    def __lt__(self, other: 'Descending') -> bool:
+        return other.value < self.value
+
+
+async def amerge_shards(
+    fetch_shard: AsyncFetchShard,
+    shards: Sequence[Shard],
+    buffer_size: int,
+    key: Callable[[Any], Any],
+    reverse: bool,
+    semaphore: asyncio.Semaphore,
+    pending: set,
+) -> AsyncIterator[Any]:
+    """Async counterpart of merge_shards, reading chunks by concurrent tasks."""
+    def get_key(row):
+        return Descending(key(row)) if reverse else key(row)
+
+    def read_chunk(index):
+        task = asyncio.ensure_future(_read_chunk_async(rows[index], buffer_size, semaphore))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+        chunks[index] = task
+
+    rows = [fetch_shard(shard).__aiter__() for shard in shards]
+    chunks = [None] * len(shards)
+    for index in range(len(shards)):
+        read_chunk(index)
+
+    # a heap of the current row of every shard, ties are taken in shard order
+    heap, buffers = [], [deque() for _ in shards]
+
+    async def push(index):
+        if not buffers[index]:
+            buffers[index].extend(await chunks[index])
+            if not buffers[index]:
+                return
+            read_chunk(index)
+        row = buffers[index].popleft()
+        heapq.heappush(heap, (get_key(row), index, row))
+
+    for index in range(len(shards)):
+        await push(index)
+    while heap:
+        _, index, row = heapq.heappop(heap)
+        yield row
+        await push(index)
+
+
+async def aiterate_shards(
+    fetch_shard: AsyncFetchShard,
+    shards: Sequence[Shard],
+    workers: int = 1,
+    window: int | None = None,
+    key: Callable[[Any], Any] | None = None,
+    reverse: bool = False,
+    buffer_size: int = DEFAULT_SHARD_BUFFER_SIZE,
+) -> AsyncIterator[Any]:
+    """Async counterpart of iterate_shards, reading shards by concurrent tasks."""
+    semaphore = asyncio.Semaphore(max(1, workers))
+    pending = set()
+    try:
+        if key is not None:
+            async for row in amerge_shards(fetch_shard, shards, buffer_size, key, reverse, semaphore, pending):
+                yield row
+            return
+
+        window = window or 2 * max(1, workers)
+        tasks = deque()
+        for shard in shards:
+            task = asyncio.ensure_future(_fetch_shard_async(fetch_shard, shard, semaphore))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+            tasks.append(task)
+            if len(tasks) >= window:
+                for row in await tasks.popleft():
+                    yield row
+        while tasks:
+            for row in await tasks.popleft():
+                yield row
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,72 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Mapping
+
+from admitad.cache import get_cache_key
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key: the first caller runs
+    the call, callers arriving while it is in flight wait for its result
+    (or exception) instead of running it again.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_key(method: str, url: str, data: Mapping | None, access_token: str | None) -> str:
+        """Identical requests share the method, url, normalized params and access token."""
+        return '%s %s' % (access_token, get_cache_key(method, url, data))
+
+    def do(self, key: str, call: Callable[[], Any]) -> tuple[Any, bool]:
+        """Returns the result of the call and whether it is shared with another caller."""
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = call()
+        except BaseException as err:
+            future.set_exception(err)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+class AsyncSingleFlight(SingleFlight):
+    """
+    SingleFlight for coroutines of one event loop. The call runs in a task
+    owned by the flight, so a cancelled caller (leader or not) stops
+    waiting for it without cancelling it for the others.
+    """
+
+    def __init__(self):
+        self._calls = {}
+
+    async def do(self, key: str, call: Callable[[], Awaitable[Any]]) -> tuple[Any, bool]:
+        task = self._calls.get(key)
+        if task is not None:
+            return await asyncio.shield(task), True
+
+        task = self._calls[key] = asyncio.ensure_future(call())
+        task.add_done_callback(lambda done: self._done(key, done))
+        return await asyncio.shield(task), False
+
+    def _done(self, key: str, task: asyncio.Future) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # nobody may be waiting, do not warn about an exception never retrieved
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,162 @@
+import codecs
+import json
+from typing import Any, Callable, Iterable, Iterator
+
+import requests
+
+from admitad.exceptions import ConnectionException, JsonException
+
+_START, _NAME, _COLON, _VALUE, _ROWS, _DONE = range(6)
+_MISSING = object()
+_WHITESPACE = ' \t\n\r'
+_NUMBER_START = '-0123456789'
+_NUMBER_CHARS = '0123456789+-.eE'
+
+
+class ResultsParser:
+    """
+    An incremental parser of a JSON object holding a `key` array.
+
+    feed() takes the next bytes of the body and returns the array rows
+    completed by them; the other members of the object are collected in
+    meta. Rows and members are decoded with json.JSONDecoder.raw_decode
+    once their text is complete.
+    """
+
+    def __init__(self, key: str = 'results', meta: dict | None = None):
+        self.key = key
+        self.meta = meta if meta is not None else {}
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._pos = 0
+        self._state = _START
+        self._name = None
+
+    def feed(self, chunk: bytes, final: bool = False) -> list:
+        self._buffer = self._buffer[self._pos:] + self._text.decode(chunk, final)
+        self._pos = 0
+        rows = []
+        while self._step(rows, final):
+            pass
+        return rows
+
+    def close(self) -> list:
+        rows = self.feed(b'', final=True)
+        if self._state != _DONE:
+            raise ValueError('Incomplete JSON object')
+        return rows
+
+    def _decode(self, final: bool) -> Any:
+        if not final and self._buffer[self._pos] in _NUMBER_START:
+            # a number running to the end of the buffer may go on in the next
+            # chunk, even when its text so far is valid (e.g. "-0." or "1e")
+            end = self._pos
+            while end < len(self._buffer) and self._buffer[end] in _NUMBER_CHARS:
+                end += 1
+            if end == len(self._buffer):
+                return _MISSING
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return _MISSING
+        self._pos = end
+        return value
+
+    def _expect(self, char: str, state: int) -> bool:
+        if self._buffer[self._pos] != char:
+            raise ValueError('Expected "%s" at "%s"' % (char, self._buffer[self._pos:self._pos + 20]))
+        self._pos += 1
+        self._state = state
+        return True
+
+    def _step(self, rows: list, final: bool) -> bool:
+        while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+            self._pos += 1
+        if self._pos == len(self._buffer):
+            return False
+
+        char = self._buffer[self._pos]
+        if self._state == _START:
+            return self._expect('{', _NAME)
+        if self._state == _NAME:
+            if char in ',}':
+                self._pos += 1
+                self._state = _DONE if char == '}' else _NAME
+                return True
+            name = self._decode(final)
+            if name is _MISSING:
+                return False
+            self._name = name
+            self._state = _COLON
+            return True
+        if self._state == _COLON:
+            return self._expect(':', _VALUE)
+        if self._state == _VALUE:
+            if self._name == self.key and char == '[':
+                return self._expect('[', _ROWS)
+            value = self._decode(final)
+            if value is _MISSING:
+                return False
+            self.meta[self._name] = value
+            self._state = _NAME
+            return True
+        if self._state == _ROWS:
+            if char in ',]':
+                self._pos += 1
+                self._state = _NAME if char == ']' else _ROWS
+                return True
+            row = self._decode(final)
+            if row is _MISSING:
+                return False
+            rows.append(row)
+            return True
+        raise ValueError('Unexpected data after the JSON object')
+
+
+class ResultsStream:
+    """
+    The rows of the `results` array of a response, decoded one at a time
+    while the body is read, so only one row is held in memory instead of
+    the whole page. Can be iterated once.
+
+    The other members of the response (e.g. `_meta`) are available through
+    get() as soon as they are parsed and certainly after the last row.
+    Rows are passed through factory when it is set.
+    """
+
+    def __init__(self, chunks: Iterable[bytes], key: str = 'results', close: Callable[[], None] | None = None):
+        self.key = key
+        self.meta = {}
+        self.size = 0
+        self.factory = None
+        self._chunks = chunks
+        self._close = close
+
+    def __iter__(self) -> Iterator[Any]:
+        parser = ResultsParser(self.key, self.meta)
+        try:
+            for chunk in self._chunks:
+                for row in parser.feed(chunk):
+                    self.size += 1
+                    yield self.factory(row) if self.factory is not None else row
+            for row in parser.close():
+                self.size += 1
+                yield self.factory(row) if self.factory is not None else row
+        except ValueError as err:
+            raise JsonException(err)
+        except requests.RequestException as err:
+            # the connection dropped or timed out while the body was read
+            raise ConnectionException(err)
+        finally:
+            self.close()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.meta.get(key, default)
+
+    def close(self) -> None:
+        if self._close is not None:
+            self._close()
+            self._close = None
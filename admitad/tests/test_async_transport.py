@@ -0,0 +1,217 @@
+# coding: utf-8
+from __future__ import unicode_literals
+
+import asyncio
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import responses
+from aioresponses import aioresponses
+from yarl import URL
+
+from admitad.api import get_async_oauth_client_client, get_async_oauth_client_token
+from admitad.async_transport import AsyncHttpTransport, prepare_pairs
+from admitad.cache import CachePolicy, RedisCache, ResponseCache, reference_data_policies
+from admitad.client import AsyncClient
+from admitad.constants import TOKEN_URL
+from admitad.exceptions import HttpException
+from admitad.items import Campaigns, Me, StatisticActions, WebsiteTypes
+from admitad.tests.base import BaseTestCase
+from admitad.tests.test_cache import FakeRedis
+from admitad.tokens import TokenManager
+
+
+class ThreadRecordingRedis(FakeRedis):
+    """Records the threads the store is called from."""
+
+    def __init__(self):
+        super().__init__()
+        self.threads = []
+
+    def get(self, key):
+        self.threads.append(threading.get_ident())
+        return super().get(key)
+
+    def set(self, key, value, ex=None, nx=False):
+        self.threads.append(threading.get_ident())
+        return super().set(key, value, ex=ex, nx=nx)
+
+
+class PreparePairsTestCase(BaseTestCase):
+
+    def test_prepare_pairs(self):
+        self.assertListEqual(prepare_pairs({'foo': [1, None, 2], 'bar': 'baz', 'none': None}), [
+            ('foo', '1'),
+            ('foo', '2'),
+            ('bar', 'baz'),
+        ])
+        self.assertListEqual(prepare_pairs(None), [])
+
+
+class AsyncClientTestCase(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.client = get_async_oauth_client_token(access_token='access_token')
+
+    async def asyncTearDown(self):
+        await self.client.close()
+
+    async def test_get_request(self):
+        with aioresponses() as resp:
+            resp.get(Me.URL, payload={'id': 1, 'username': 'username'})
+
+            result = await self.client.Me.get()
+
+        self.assertEqual(result['id'], 1)
+
+    async def test_concurrent_requests_keep_their_params(self):
+        with aioresponses() as resp:
+            resp.get(Campaigns.URL + '?limit=1&offset=0&website=10', payload={'website': 10})
+            resp.get(Campaigns.URL + '?limit=2&offset=0&website=20', payload={'website': 20})
+
+            first, second = await asyncio.gather(
+                self.client.Campaigns.get(website=10, limit=1),
+                self.client.Campaigns.get(website=20, limit=2),
+            )
+
+        self.assertEqual(first['website'], 10)
+        self.assertEqual(second['website'], 20)
+
+    async def test_iterate(self):
+        with aioresponses() as resp:
+            for offset in (0, 500, 1000):
+                resp.get(
+                    StatisticActions.URL + '?limit=500&offset=%s&website=10' % offset,
+                    payload={'results': [{'action_id': offset}], '_meta': {'count': 1200}},
+                )
+
+            result = [row async for row in self.client.StatisticActions.iterate(website=10, workers=3)]
+
+        self.assertListEqual([row['action_id'] for row in result], [0, 500, 1000])
+
+    async def test_table(self):
+        with aioresponses() as resp:
+            resp.get(
+                StatisticActions.URL + '?limit=500&offset=0&website=10',
+                payload={'results': [{'action_id': 1, 'payment': '1.5'}], '_meta': {'count': 1}},
+            )
+
+            result = await self.client.StatisticActions.table(website=10)
+
+        self.assertListEqual(list(result.column('action_id')), [1])
+        self.assertListEqual(list(result.column('payment')), [1.5])
+
+    async def test_http_error(self):
+        with aioresponses() as resp:
+            resp.get(Me.URL, status=404, payload={'error': 'not found'})
+
+            with self.assertRaises(HttpException) as context:
+                await self.client.Me.get()
+
+        self.assertEqual(context.exception.status, 404)
+        self.assertDictEqual(context.exception.message, {'error': 'not found'})
+
+    async def test_handler(self):
+        with aioresponses() as resp:
+            resp.get(StatisticActions.URL + '?limit=20&offset=0', payload={'results': []})
+
+            result = await self.client.StatisticActions.get(handler=lambda x: (x, x))
+
+        self.assertTupleEqual(result, ({'results': []}, {'results': []}))
+
+    async def test_not_modified(self):
+        campaigns = self.client.Campaigns.with_options(
+            cache=ResponseCache(policies={Campaigns.URL: CachePolicy(revalidate=True)}),
+        )
+        url = Campaigns.URL + '?limit=20&offset=0'
+
+        with aioresponses() as resp:
+            resp.get(url, payload={'results': [1]}, headers={'ETag': '"v1"'})
+            resp.get(url, status=304)
+
+            first = await campaigns.get()
+            second = await campaigns.get()
+
+            requests = resp.requests[('GET', URL(url))]
+
+        self.assertEqual(len(requests), 2)
+        self.assertEqual(requests[1].kwargs['headers']['If-None-Match'], '"v1"')
+        self.assertDictEqual(second, first)
+
+    async def test_redis_cache_is_not_called_on_the_loop(self):
+        client = ThreadRecordingRedis()
+        cache = ResponseCache(RedisCache(client), policies=reference_data_policies())
+        website_types = self.client.WebsiteTypes.with_options(cache=cache)
+
+        with aioresponses() as resp:
+            resp.get(WebsiteTypes.URL + '?limit=20&offset=0', payload={'results': ['website']})
+
+            first = await website_types.get()
+            second = await website_types.get()
+
+        self.assertDictEqual(second, first)
+        self.assertTrue(client.threads)
+        self.assertNotIn(threading.get_ident(), client.threads)
+
+    async def test_concurrent_misses_refreshing_token(self):
+        # a small executor, waiters for the cache lock must not exhaust it
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=2))
+        manager = TokenManager('client_id', 'secret', 'private_data', token={'access_token': 'old'})
+        transport = AsyncHttpTransport(token_manager=manager, cache=ResponseCache(policies=reference_data_policies()))
+        client = AsyncClient(transport)
+        url = WebsiteTypes.URL + '?limit=20&offset=0'
+
+        with aioresponses() as resp, responses.RequestsMock() as sync_resp:
+            sync_resp.add(sync_resp.POST, TOKEN_URL, json={'access_token': 'new'}, status=200)
+            resp.get(url, status=401, payload={'error': 'expired'})
+            resp.get(url, payload={'results': ['website']})
+
+            async with client:
+                results = await asyncio.wait_for(
+                    asyncio.gather(*[client.WebsiteTypes.get() for _ in range(20)]),
+                    timeout=5,
+                )
+
+            requests = resp.requests[('GET', URL(url))]
+
+        self.assertEqual(len(requests), 2)
+        self.assertTrue(all(result == {'results': ['website']} for result in results))
+
+
+class AsyncOauthTestCase(unittest.IsolatedAsyncioTestCase):
+
+    async def test_get_async_oauth_client_client(self):
+        with aioresponses() as resp:
+            resp.post(TOKEN_URL, payload={'access_token': 'new_token'})
+            resp.get(Me.URL, payload={'id': 1})
+
+            client = await get_async_oauth_client_client('client_id', 'secret', 'private_data')
+            async with client:
+                result = await client.Me.get()
+
+            requests = list(resp.requests.values())
+
+        self.assertEqual(result['id'], 1)
+        self.assertEqual(requests[1][0].kwargs['headers']['Authorization'], 'Bearer new_token')
+
+    async def test_retries_once_on_401(self):
+        manager = TokenManager('client_id', 'secret', 'private_data', token={'access_token': 'old'})
+        client = AsyncClient(AsyncHttpTransport(token_manager=manager))
+
+        with aioresponses() as resp, responses.RequestsMock() as sync_resp:
+            sync_resp.add(sync_resp.POST, TOKEN_URL, json={'access_token': 'new'}, status=200)
+            resp.get(Me.URL, status=401, payload={'error': 'expired'})
+            resp.get(Me.URL, payload={'id': 1})
+
+            async with client:
+                result = await client.Me.get()
+
+            requests = resp.requests[('GET', URL(Me.URL))]
+
+        self.assertEqual(result['id'], 1)
+        self.assertEqual(requests[1].kwargs['headers']['Authorization'], 'Bearer new')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,10 @@
 # coding: utf-8
 from __future__ import unicode_literals
 
+import json
 import unittest
+from urllib.parse import parse_qs
+
 import responses
 
 from admitad.items import BrokenLinks, ManageBrokenLinks
@@ -68,6 +71,63 @@ class ManageBrokenLinksTestCase(BaseTestCase):
 
         self.assertIn('status', result)
 
+    def test_resolve_all_broken_links(self):
+        posted = []
+
+        def resolve(request):
+            ids = [int(value) for value in parse_qs(request.body)['link_id']]
+            posted.append(ids)
+            if 3 in ids:
+                return 400, {}, json.dumps({'link_id': ['unknown link: 3']})
+            return 200, {}, json.dumps({'success': 'Accepted'})
+
+        with responses.RequestsMock() as resp:
+            resp.add(
+                resp.GET,
+                self.prepare_url(BrokenLinks.URL, params={
+                    'website': [7],
+                    'limit': 500,
+                    'offset': 0,
+                }),
+                match_querystring=True,
+                json={
+                    'results': [{'id': broken_link_id} for broken_link_id in range(1, 6)],
+                    '_meta': {'count': 5, 'limit': 500, 'offset': 0},
+                },
+                status=200
+            )
+            resp.add_callback(resp.POST, ManageBrokenLinks.RESOLVE_URL, callback=resolve)
+
+            summary = self.client.ManageBrokenLinks.resolve_all(website=[7], chunk_size=2, workers=2)
+
+        self.assertEqual(summary.total, 5)
+        self.assertEqual(summary.succeeded, 4)
+        self.assertEqual(summary.failed, 1)
+        self.assertEqual(summary.errors[3].status, 400)
+        self.assertListEqual(sorted(posted), [[1, 2], [3], [3, 4], [4], [5]])
+
+    def test_resolve_all_fails_chunk_once(self):
+        for status, body in ((403, {'error': 'insufficient_scope'}), (429, {'error': 'Too Many Requests'})):
+            with responses.RequestsMock() as resp:
+                resp.add(
+                    resp.GET,
+                    self.prepare_url(BrokenLinks.URL, params={'limit': 500, 'offset': 0}),
+                    match_querystring=True,
+                    json={
+                        'results': [{'id': broken_link_id} for broken_link_id in range(1, 101)],
+                        '_meta': {'count': 100, 'limit': 500, 'offset': 0},
+                    },
+                    status=200
+                )
+                resp.add(resp.POST, ManageBrokenLinks.RESOLVE_URL, json=body, status=status)
+
+                summary = self.client.ManageBrokenLinks.resolve_all()
+
+                self.assertEqual(len([call for call in resp.calls if call.request.method == 'POST']), 1)
+
+            self.assertEqual(summary.failed, 100)
+            self.assertTrue(all(error.status == status for error in summary.errors.values()))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,218 @@
+# coding: utf-8
+from __future__ import unicode_literals
+
+import asyncio
+import threading
+import time
+import unittest
+
+from admitad.bulk import (
+    acollect, arun_bulk, arun_each, asummarize, collect, pack_batches, run_bulk, run_each, summarize,
+)
+from admitad.exceptions import ConnectionException, HttpException
+from admitad.tests.base import BaseTestCase
+
+
+def group_by_campaign(item):
+    return item[0], item[1]
+
+
+class PackBatchesTestCase(BaseTestCase):
+
+    def test_pack_batches(self):
+        chunk = [(1, 'a'), (2, 'b'), (1, 'c'), (1, 'd'), (2, 'e')]
+
+        self.assertListEqual(pack_batches(chunk, group_by_campaign, 2), [
+            (1, [0, 2], ['a', 'c']),
+            (1, [3], ['d']),
+            (2, [1, 4], ['b', 'e']),
+        ])
+
+
+class RunBulkTestCase(BaseTestCase):
+
+    def test_results_in_input_order(self):
+        lock = threading.Lock()
+        calls = []
+
+        def call(key, values):
+            with lock:
+                calls.append((key, values))
+            return ['%s:%s' % (key, value) for value in values]
+
+        items = [(index % 3, index) for index in range(10)]
+        results = list(run_bulk(call, items, group=group_by_campaign, batch_size=2, buffer_size=6, workers=3))
+
+        self.assertListEqual([result.item for result in results], items)
+        self.assertListEqual([result.value for result in results], ['%s:%s' % item for item in items])
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual(len(calls), 6)
+        self.assertTrue(all(len(values) <= 2 for _, values in calls))
+
+    def test_rejected_batch_is_split(self):
+        calls = []
+
+        def call(key, values):
+            calls.append(values)
+            if 'bad' in values:
+                raise HttpException(400, 'Bad Request', '{"ulp": ["invalid url: bad"]}')
+            return values
+
+        items = [(1, 'a'), (1, 'bad'), (1, 'c'), (1, 'd')]
+        results = list(run_bulk(call, items, group=group_by_campaign, batch_size=4, buffer_size=10))
+
+        self.assertListEqual([result.value for result in results], ['a', None, 'c', 'd'])
+        self.assertIsInstance(results[1].error, HttpException)
+        self.assertListEqual(calls, [['a', 'bad', 'c', 'd'], ['a', 'bad'], ['a'], ['bad'], ['c', 'd']])
+
+    def test_failed_batch_is_not_split(self):
+        calls = []
+
+        def call(key, values):
+            calls.append(values)
+            raise ConnectionException('timeout')
+
+        results = list(run_bulk(call, [(1, 'a'), (1, 'b')], group=group_by_campaign, batch_size=4, buffer_size=10))
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(isinstance(result.error, ConnectionException) for result in results))
+
+    def assert_batch_fails_once(self, error):
+        calls = []
+
+        def call(key, values):
+            calls.append(values)
+            raise error
+
+        items = [(1, 'https://%s.com/' % index) for index in range(200)]
+        results = list(run_bulk(call, items, group=group_by_campaign, batch_size=200, buffer_size=None))
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(result.error is error for result in results))
+
+    def test_throttled_batch_is_not_split(self):
+        self.assert_batch_fails_once(HttpException(429, 'Too Many Requests', 'https://0.com/'))
+
+    def test_forbidden_batch_is_not_split(self):
+        self.assert_batch_fails_once(HttpException(403, 'Forbidden', '{"error": "insufficient_scope"}'))
+
+    def test_group_error_is_not_split(self):
+        self.assert_batch_fails_once(HttpException(400, 'Bad Request', '{"error": "campaign is not connected"}'))
+
+    def test_async_run_bulk(self):
+        async def call(key, values):
+            await asyncio.sleep(0.001 * (3 - key))
+            if 'bad' in values:
+                raise HttpException(400, 'Bad Request', '{"ulp": ["invalid url: bad"]}')
+            return [value.upper() for value in values]
+
+        async def collect():
+            items = [(1, 'a'), (2, 'b'), (1, 'bad'), (0, 'c')]
+            return [result async for result in arun_bulk(
+                call, items, group=group_by_campaign, batch_size=2, buffer_size=3, workers=2,
+            )]
+
+        results = asyncio.run(collect())
+
+        self.assertListEqual([result.value for result in results], ['A', 'B', None, 'C'])
+        self.assertFalse(results[2].ok)
+
+    def test_summarize(self):
+        def call(key, values):
+            if 'bad' in values:
+                raise HttpException(400, 'Bad Request', '{"ulp": ["invalid url: bad"]}')
+            return values
+
+        items = [(1, 'a'), (1, 'bad'), (2, 'c')]
+        summary = summarize(run_bulk(call, items, group=group_by_campaign, batch_size=2, buffer_size=None))
+
+        self.assertEqual((summary.total, summary.succeeded, summary.failed), (3, 2, 1))
+        self.assertListEqual(list(summary.errors), [(1, 'bad')])
+
+    def test_async_summarize_async_inputs(self):
+        async def call(key, values):
+            return values
+
+        async def items():
+            for index in range(5):
+                yield (index % 2, index)
+
+        summary = asyncio.run(asummarize(arun_bulk(
+            call, items(), group=group_by_campaign, batch_size=2, buffer_size=None, workers=2,
+        )))
+
+        self.assertEqual((summary.total, summary.succeeded, summary.failed), (5, 5, 0))
+
+
+class RunEachTestCase(BaseTestCase):
+
+    def test_run_each(self):
+        lock = threading.Lock()
+        state = {'active': 0, 'peak': 0, 'calls': []}
+
+        def call(item):
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+                state['calls'].append(item)
+            time.sleep(0.002)
+            with lock:
+                state['active'] -= 1
+            if item == 'bad':
+                raise HttpException(400, 'Bad Request', 'invalid link')
+            return item.upper()
+
+        items = ['a', 'b', 'a', 'bad', 'c', 'b', 'd']
+        results = {result.item: result for result in run_each(call, items, workers=2)}
+
+        self.assertEqual(sorted(state['calls']), ['a', 'b', 'bad', 'c', 'd'])
+        self.assertLessEqual(state['peak'], 2)
+        self.assertEqual(results['c'].value, 'C')
+        self.assertIsInstance(results['bad'].error, HttpException)
+
+    def test_run_each_yields_as_completed(self):
+        def call(item):
+            time.sleep(item)
+            return item
+
+        results = [result.value for result in run_each(call, [0.05, 0.0], workers=2)]
+
+        self.assertListEqual(results, [0.0, 0.05])
+
+    def test_async_run_each(self):
+        calls = []
+
+        async def call(item):
+            calls.append(item)
+            await asyncio.sleep(0.01 if item == 'a' else 0)
+            if item == 'bad':
+                raise HttpException(400, 'Bad Request', 'invalid link')
+            return item.upper()
+
+        async def collect():
+            return [result async for result in arun_each(call, ['a', 'b', 'a', 'bad'], workers=3)]
+
+        results = asyncio.run(collect())
+
+        self.assertListEqual(sorted(calls), ['a', 'b', 'bad'])
+        self.assertListEqual([result.item for result in results][-1:], ['a'])
+        self.assertFalse(next(result for result in results if result.item == 'bad').ok)
+
+    def test_collect(self):
+        items = [3, 1, 3, 2]
+        result = collect(run_each(lambda item: item * 10, items, workers=3), items)
+
+        self.assertListEqual(list(result), [3, 1, 2])
+        self.assertListEqual([value.value for value in result.values()], [30, 10, 20])
+
+        async def call(item):
+            await asyncio.sleep(0.001 * item)
+            return item * 10
+
+        result = asyncio.run(acollect(arun_each(call, items, workers=3), items))
+
+        self.assertListEqual(list(result), [3, 1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,334 @@
+# coding: utf-8
+from __future__ import unicode_literals
+
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import responses
+from responses import matchers
+
+from admitad.cache import CacheBackend, CacheEntry, CachePolicy, LRUCache, RedisCache, ResponseCache, get_cache_key, reference_data_policies
+from admitad.items import Campaigns, CouponsCategories, Landings, Me, WebsiteTypes
+from admitad.tests.base import BaseTestCase
+from admitad.transport import HttpTransport
+
+
+class FakeRedis:
+    """The subset of a redis client used by RedisCache, kept in memory."""
+
+    def __init__(self):
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            value, expires_at = self.values.get(key, (None, None))
+            if expires_at is not None and expires_at <= time.time():
+                del self.values[key]
+                return None
+            return value
+
+    def set(self, key, value, ex=None, nx=False):
+        with self.lock:
+            current, expires_at = self.values.get(key, (None, None))
+            if nx and current is not None and (expires_at is None or expires_at > time.time()):
+                return None
+            self.values[key] = (value.encode('utf-8'), time.time() + ex if ex is not None else None)
+            return True
+
+    def delete(self, key):
+        with self.lock:
+            self.values.pop(key, None)
+
+
+class LRUCacheTestCase(BaseTestCase):
+
+    def test_get_set(self):
+        cache = LRUCache()
+        cache.set('foo', 1)
+
+        self.assertEqual(cache.get('foo'), 1)
+        self.assertIsNone(cache.get('bar'))
+
+        cache.delete('foo')
+        self.assertIsNone(cache.get('foo'))
+
+    def test_ttl(self):
+        cache = LRUCache()
+        cache.set('foo', 1, ttl=0.01)
+        cache.set('bar', 2, ttl=60)
+        time.sleep(0.02)
+
+        self.assertIsNone(cache.get('foo'))
+        self.assertEqual(cache.get('bar'), 2)
+
+    def test_lru_eviction(self):
+        cache = LRUCache(maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+
+    def test_incomplete_backend(self):
+        class NoLockCache(CacheBackend):
+            def get(self, key):
+                return None
+
+            def set(self, key, value, ttl=None):
+                pass
+
+            def delete(self, key):
+                pass
+
+        with self.assertRaises(TypeError):
+            NoLockCache()
+
+    def test_lock(self):
+        cache = LRUCache()
+        lock = cache.lock('foo')
+
+        self.assertIs(cache.lock('foo'), lock)
+        self.assertIsNot(cache.lock('bar'), lock)
+
+
+class ResponseCacheTestCase(BaseTestCase):
+
+    def test_get_cache_key(self):
+        self.assertEqual(
+            get_cache_key('GET', 'http://example.com/', {'b': 1, 'a': [1, None, 2], 'c': None}),
+            get_cache_key('GET', 'http://example.com/', {'a': [1, 2], 'b': 1}),
+        )
+        self.assertNotEqual(
+            get_cache_key('GET', 'http://example.com/', {'a': [1, 2]}),
+            get_cache_key('GET', 'http://example.com/', {'a': [2, 1]}),
+        )
+
+    def test_policies(self):
+        cache = ResponseCache(policies=reference_data_policies(ttl=60))
+
+        self.assertEqual(cache.get_ttl(WebsiteTypes.URL), 60)
+        self.assertEqual(cache.get_ttl(CouponsCategories.SINGLE_URL % {'coupon_category_id': 1}), 60)
+        self.assertEqual(cache.get_ttl(Campaigns.URL), 0)
+        self.assertFalse(cache.is_cacheable('POST', WebsiteTypes.URL))
+
+    def test_longest_prefix_wins(self):
+        cache = ResponseCache(policies={'http://example.com/': 10, 'http://example.com/foo/': 0}, ttl=5)
+
+        self.assertEqual(cache.get_ttl('http://example.com/bar/'), 10)
+        self.assertEqual(cache.get_ttl('http://example.com/foo/1/'), 0)
+        self.assertEqual(cache.get_ttl('http://other.com/'), 5)
+
+    def test_cached_value_is_a_copy(self):
+        cache = ResponseCache(ttl=60)
+        cache.set('GET', 'http://example.com/', None, {'results': [1]})
+        cache.get('GET', 'http://example.com/')['results'].append(2)
+
+        self.assertDictEqual(cache.get('GET', 'http://example.com/'), {'results': [1]})
+
+
+class CacheTransportTestCase(BaseTestCase):
+
+    def test_reference_data_is_cached(self):
+        transport = HttpTransport('token', cache=ResponseCache(policies=reference_data_policies()))
+
+        with responses.RequestsMock() as resp:
+            resp.add(resp.GET, WebsiteTypes.URL, json={'results': ['website']}, status=200)
+            resp.add(resp.GET, Campaigns.URL, json={'results': []}, status=200)
+
+            first = WebsiteTypes(transport).get(limit=5)
+            second = WebsiteTypes(transport).get(limit=5)
+            Campaigns(transport).get()
+            Campaigns(transport).get()
+
+            self.assertEqual(len(resp.calls), 3)
+
+        self.assertDictEqual(first, second)
+
+    def test_params_are_part_of_the_key(self):
+        transport = HttpTransport('token', cache=ResponseCache(policies=reference_data_policies()))
+
+        with responses.RequestsMock() as resp:
+            resp.add(resp.GET, WebsiteTypes.URL, json={'results': []}, status=200)
+
+            WebsiteTypes(transport).get(limit=5)
+            WebsiteTypes(transport).get(limit=10)
+
+            self.assertEqual(len(resp.calls), 2)
+
+    def test_clients_do_not_share_responses(self):
+        cache = ResponseCache(policies={**reference_data_policies(), Me.URL: 60})
+
+        with responses.RequestsMock() as resp:
+            resp.add(resp.GET, Me.URL, json={'username': 'first'}, status=200)
+            resp.add(resp.GET, Me.URL, json={'username': 'second'}, status=200)
+            resp.add(resp.GET, WebsiteTypes.URL, json={'results': []}, status=200)
+
+            first = Me(HttpTransport('first', cache=cache)).get()
+            second = Me(HttpTransport('second', cache=cache)).get()
+            self.assertEqual(Me(HttpTransport('first', cache=cache)).get(), first)
+            for token in ('first', 'second'):
+                WebsiteTypes(HttpTransport(token, cache=cache)).get()
+
+            self.assertEqual(len(resp.calls), 3)
+
+        self.assertEqual(first['username'], 'first')
+        self.assertEqual(second['username'], 'second')
+
+    def test_cache_can_be_bypassed(self):
+        transport = HttpTransport('token', cache=ResponseCache(policies=reference_data_policies()))
+
+        with responses.RequestsMock() as resp:
+            resp.add(resp.GET, WebsiteTypes.URL, json={'results': []}, status=200)
+
+            WebsiteTypes(transport).get()
+            WebsiteTypes(transport).with_options(cache=None).get()
+
+            self.assertEqual(len(resp.calls), 2)
+
+
+class RedisCacheTestCase(BaseTestCase):
+
+    def test_get_set(self):
+        cache = RedisCache(FakeRedis())
+        entry = CacheEntry({'results': [1]}, expires_at=10.0, etag='"v1"')
+        cache.set('foo', entry, ttl=60)
+
+        self.assertEqual(cache.get('foo'), entry)
+        self.assertIsNone(cache.get('bar'))
+
+        cache.delete('foo')
+        self.assertIsNone(cache.get('foo'))
+
+    def test_lock_is_shared_between_nodes(self):
+        client = FakeRedis()
+        first = RedisCache(client).lock('foo')
+        second = RedisCache(client, poll_interval=0.01).lock('foo')
+        acquired = threading.Event()
+
+        first.acquire()
+        thread = threading.Thread(target=lambda: (second.acquire(), acquired.set()))
+        thread.start()
+
+        self.assertFalse(acquired.wait(0.05))
+        first.release()
+        self.assertTrue(acquired.wait(1))
+        second.release()
+        thread.join()
+
+    def test_fleet_fetches_once(self):
+        client = FakeRedis()
+        transports = [
+            HttpTransport('token', cache=ResponseCache(RedisCache(client, poll_interval=0.01), ttl=60))
+            for _ in range(3)
+        ]
+
+        def callback(request):
+            time.sleep(0.05)
+            return 200, {}, '{"results": []}'
+
+        with responses.RequestsMock() as resp:
+            resp.add_callback(resp.GET, Campaigns.URL, callback=callback)
+
+            with ThreadPoolExecutor(9) as executor:
+                results = list(executor.map(lambda index: Campaigns(transports[index % 3]).get(), range(9)))
+
+            self.assertEqual(len(resp.calls), 1)
+
+        self.assertListEqual(results, [{'results': []}] * 9)
+
+
+class RevalidationTestCase(BaseTestCase):
+
+    def test_conditional_headers(self):
+        entry = CacheEntry({}, expires_at=0, etag='"abc"', last_modified='Wed, 01 Jan 2020 00:00:00 GMT')
+
+        self.assertFalse(entry.is_fresh())
+        self.assertDictEqual(entry.get_conditional_headers(), {
+            'If-None-Match': '"abc"',
+            'If-Modified-Since': 'Wed, 01 Jan 2020 00:00:00 GMT',
+        })
+
+    def test_stale_entries_expire_in_the_backend(self):
+        client = FakeRedis()
+        policy = CachePolicy(ttl=60, revalidate=True, max_stale=600)
+        cache = ResponseCache(RedisCache(client), policies={Campaigns.URL: policy})
+        now = time.time()
+        cache.set('GET', Campaigns.URL, None, {'results': []}, {'ETag': '"v1"'}, scope='client')
+
+        (_, expires_at), = client.values.values()
+        self.assertAlmostEqual(expires_at, now + 660, delta=5)
+
+    def test_not_modified(self):
+        transport = HttpTransport('token', cache=ResponseCache(policies={Campaigns.URL: CachePolicy(revalidate=True)}))
+
+        with responses.RequestsMock() as resp:
+            resp.add(resp.GET, Campaigns.URL, json={'results': [{'id': 1}]}, status=200, headers={'ETag': '"v1"'})
+            resp.add(resp.GET, Campaigns.URL, status=304, match=[matchers.header_matcher({'If-None-Match': '"v1"'})])
+
+            first = Campaigns(transport).get()
+            second = Campaigns(transport).get()
+
+            self.assertEqual(len(resp.calls), 2)
+            self.assertNotIn('If-None-Match', resp.calls[0].request.headers)
+
+        self.assertDictEqual(first, {'results': [{'id': 1}]})
+        self.assertDictEqual(second, first)
+
+    def test_modified(self):
+        transport = HttpTransport('token', cache=ResponseCache(policies={Campaigns.URL: CachePolicy(revalidate=True)}))
+        last_modified = 'Wed, 01 Jan 2020 00:00:00 GMT'
+
+        with responses.RequestsMock() as resp:
+            resp.add(resp.GET, Campaigns.URL, json={'results': [1]}, status=200, headers={'Last-Modified': last_modified})
+            resp.add(resp.GET, Campaigns.URL, json={'results': [2]}, status=200,
+                     match=[matchers.header_matcher({'If-Modified-Since': last_modified})])
+
+            Campaigns(transport).get()
+            result = Campaigns(transport).get()
+
+        self.assertDictEqual(result, {'results': [2]})
+
+    def test_fresh_entry_is_not_revalidated(self):
+        policies = {Landings.URL % {'campaign_id': 1}: CachePolicy(ttl=60, revalidate=True)}
+        transport = HttpTransport('token', cache=ResponseCache(policies=policies))
+
+        with responses.RequestsMock() as resp:
+            resp.add(resp.GET, Landings.URL % {'campaign_id': 1}, json={'results': []}, status=200, headers={'ETag': '"v1"'})
+
+            Landings(transport).get(1)
+            Landings(transport).get(1)
+
+            self.assertEqual(len(resp.calls), 1)
+
+    def test_revalidation_is_opt_in_per_prefix(self):
+        cache = ResponseCache(policies={Campaigns.URL: CachePolicy(revalidate=True), WebsiteTypes.URL: 60})
+
+        self.assertTrue(cache.is_cacheable('GET', Campaigns.URL))
+        self.assertTrue(cache.is_cacheable('GET', WebsiteTypes.URL))
+        self.assertFalse(cache.is_cacheable('GET', Landings.URL % {'campaign_id': 1}))
+
+        cache.set('GET', WebsiteTypes.URL, None, {'results': []}, {'ETag': '"v1"'})
+        self.assertIsNone(cache.get_entry('GET', WebsiteTypes.URL).etag)
+
+    def test_response_without_validators_is_not_kept(self):
+        transport = HttpTransport('token', cache=ResponseCache(policies={Campaigns.URL: CachePolicy(revalidate=True)}))
+
+        with responses.RequestsMock() as resp:
+            resp.add(resp.GET, Campaigns.URL, json={'results': []}, status=200)
+
+            Campaigns(transport).get()
+            Campaigns(transport).get()
+
+            self.assertEqual(len(resp.calls), 2)
+            self.assertNotIn('If-None-Match', resp.calls[1].request.headers)
+
+
+if __name__ == '__main__':
+    unittest.main()
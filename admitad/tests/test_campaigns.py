@@ -1,9 +1,13 @@
 # coding: utf-8
 from __future__ import unicode_literals
 
+import os
+import shutil
+import tempfile
 import unittest
 import responses
 
+from admitad.deeplink_cache import DeeplinkCache
 from admitad.items import Campaigns, CampaignsForWebsite, \
     CampaignsManage
 from admitad.tests.base import BaseTestCase
@@ -73,6 +77,24 @@ class CampaignsTestCase(BaseTestCase):
             'language': 'en'
         }))
 
+    def test_iterate_campaigns_request(self):
+        with responses.RequestsMock() as resp:
+            for offset, results in ((0, [{'id': 1}, {'id': 2}]), (500, [{'id': 3}])):
+                resp.add(
+                    resp.GET,
+                    self.prepare_url(Campaigns.URL, params={
+                        'website': 10,
+                        'limit': 500,
+                        'offset': offset,
+                    }),
+                    match_querystring=True,
+                    json={'results': results, '_meta': {'count': 501}},
+                    status=200
+                )
+            result = list(self.client.Campaigns.iterate(website=10, limit=10))
+
+        self.assertListEqual([item['id'] for item in result], [1, 2, 3])
+
     def test_get_campaigns_request_with_id(self):
         with responses.RequestsMock() as resp:
             resp.add(
@@ -86,6 +108,25 @@ class CampaignsTestCase(BaseTestCase):
 
         self.assertIn('status', result)
 
+    def test_get_many_campaigns(self):
+        with responses.RequestsMock() as resp:
+            for campaign_id, status in ((10, 200), (11, 200), (12, 404)):
+                resp.add(
+                    resp.GET,
+                    self.prepare_url(Campaigns.SINGLE_URL, campaign_id=campaign_id),
+                    match_querystring=True,
+                    json={'id': campaign_id},
+                    status=status
+                )
+            result = self.client.Campaigns.getMany([11, 10, 12, 11], workers=3)
+
+            self.assertEqual(len(resp.calls), 3)
+
+        self.assertListEqual(list(result), [11, 10, 12])
+        self.assertDictEqual(result[10].value, {'id': 10})
+        self.assertTrue(result[11].ok)
+        self.assertEqual(result[12].error.status, 404)
+
 
 class CampaignsForWebsiteTestCase(BaseTestCase):
 
@@ -118,6 +159,24 @@ class CampaignsForWebsiteTestCase(BaseTestCase):
 
         self.assertIn('status', result)
 
+    def test_get_many_campaigns_for_website(self):
+        with responses.RequestsMock() as resp:
+            for campaign_id in (88, 89):
+                resp.add(
+                    resp.GET,
+                    self.prepare_url(CampaignsForWebsite.SINGLE_URL, website_id=10, campaign_id=campaign_id),
+                    match_querystring=True,
+                    json={'id': campaign_id},
+                    status=200
+                )
+            result = self.client.CampaignsForWebsite.getMany([(10, 88), (10, 89)])
+
+        self.assertDictEqual(result[(10, 89)].value, {'id': 89})
+
+    def test_get_many_without_single_url(self):
+        with self.assertRaises(AttributeError):
+            self.client.CampaignsManage.getMany([10])
+
 
 class CampaignsConnectWebsiteTestCase(BaseTestCase):
 
@@ -147,6 +206,28 @@ class CampaignsConnectWebsiteTestCase(BaseTestCase):
 
         self.assertIn('status', result)
 
+    def test_campaign_disconnect_invalidates_deeplinks(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        cache = DeeplinkCache(os.path.join(directory, 'deeplinks.sqlite'))
+        self.addCleanup(cache.close)
+        cache.set_many(22, 10, {'https://a.com/': 'https://ad.admitad.com/g/a/'})
+        cache.set_many(22, 11, {'https://a.com/': 'https://ad.admitad.com/g/b/'})
+
+        with responses.RequestsMock() as resp:
+            resp.add(
+                resp.POST,
+                self.prepare_url(CampaignsManage.DISCONNECT_URL, campaign_id=10, website_id=22),
+                match_querystring=True,
+                json={'status': 'ok'},
+                status=200
+            )
+            result = self.client.CampaignsManage.with_options(deeplink_cache=cache).disconnect(10, 22)
+
+        self.assertIn('status', result)
+        self.assertDictEqual(cache.get_many(22, 10, ['https://a.com/']), {})
+        self.assertEqual(len(cache), 1)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,116 @@
+# coding: utf-8
+from __future__ import unicode_literals
+
+import math
+import unittest
+from array import array
+from datetime import datetime, timedelta, timezone
+
+from admitad.columnar import DATETIME, FLOAT, INT, MISSING_DATETIME, OBJECT, Column, Table, numpy, pandas
+from admitad.tests.base import BaseTestCase
+
+
+class ColumnTestCase(BaseTestCase):
+
+    def test_int(self):
+        column = Column('clicks', INT)
+        column.append(1)
+        column.append(2)
+
+        self.assertEqual(column.values, array('q', [1, 2]))
+
+    def test_missing_int_becomes_float(self):
+        column = Column('clicks', INT)
+        column.append(1)
+        column.append(None)
+
+        self.assertEqual(column.kind, FLOAT)
+        self.assertEqual(column.values[0], 1.0)
+        self.assertTrue(math.isnan(column.values[1]))
+
+    def test_float_parses_strings(self):
+        column = Column('payment_sum', FLOAT)
+        column.append('10.50')
+        column.append(3)
+
+        self.assertEqual(column.values, array('d', [10.5, 3.0]))
+
+    def test_unexpected_value_becomes_object(self):
+        column = Column('payment_sum', FLOAT)
+        column.append(1.5)
+        column.append('n/a')
+
+        self.assertEqual(column.kind, OBJECT)
+        self.assertListEqual(column.values, [1.5, 'n/a'])
+
+    def test_datetime(self):
+        column = Column('date', DATETIME)
+        column.append('2020-01-02')
+        column.append(None)
+        column.append('02.01.2020 00:00:10')
+
+        self.assertEqual(column.values, array('q', [1577923200, MISSING_DATETIME, 1577923210]))
+        self.assertListEqual(column.to_list(), [datetime(2020, 1, 2), None, datetime(2020, 1, 2, 0, 0, 10)])
+
+    def test_datetime_with_offset(self):
+        column = Column('date', DATETIME)
+        column.append('2020-01-01T12:00:00+03:00')
+        column.append('2020-01-01T09:00:00+00:00')
+        column.append(datetime(2020, 1, 1, 10, 0, tzinfo=timezone(timedelta(hours=1))))
+
+        self.assertListEqual(column.to_list(), [datetime(2020, 1, 1, 9)] * 3)
+
+
+class TableTestCase(BaseTestCase):
+
+    ROWS = [
+        {'date': '2020-01-01', 'clicks': 10, 'payment_sum_approved': 0, 'currency': 'USD'},
+        {'date': '2020-01-02', 'clicks': 20, 'payment_sum_approved': 1.5, 'currency': 'USD', 'new': 'value'},
+    ]
+
+    def test_from_rows(self):
+        table = Table.from_rows(self.ROWS)
+
+        self.assertEqual(len(table), 2)
+        self.assertDictEqual({name: column.kind for name, column in table.columns.items()}, {
+            'date': DATETIME,
+            'clicks': INT,
+            'payment_sum_approved': FLOAT,
+            'currency': OBJECT,
+            'new': OBJECT,
+        })
+        self.assertDictEqual(table.to_dict(), {
+            'date': [datetime(2020, 1, 1), datetime(2020, 1, 2)],
+            'clicks': [10, 20],
+            'payment_sum_approved': [0.0, 1.5],
+            'currency': ['USD', 'USD'],
+            'new': [None, 'value'],
+        })
+
+    def test_missing_keys(self):
+        table = Table.from_rows([{'a': 'x', 'b': 'y'}, {'a': 'z'}])
+
+        self.assertListEqual(table.column('b'), ['y', None])
+
+    def test_schema(self):
+        table = Table.from_rows(self.ROWS, schema={'clicks': FLOAT, 'date': OBJECT})
+
+        self.assertEqual(table.columns['clicks'].kind, FLOAT)
+        self.assertListEqual(table.column('date'), ['2020-01-01', '2020-01-02'])
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_to_numpy(self):
+        arrays = Table.from_rows(self.ROWS).to_numpy()
+
+        self.assertEqual(arrays['clicks'].dtype, numpy.int64)
+        self.assertEqual(str(arrays['date'][0]), '2020-01-01T00:00:00')
+
+    @unittest.skipIf(pandas is None, 'pandas is not installed')
+    def test_to_pandas(self):
+        frame = Table.from_rows(self.ROWS).to_pandas()
+
+        self.assertListEqual(list(frame['clicks']), [10, 20])
+
+
+if __name__ == '__main__':
+    unittest.main()
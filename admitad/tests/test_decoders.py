@@ -0,0 +1,73 @@
+# coding: utf-8
+from __future__ import unicode_literals
+
+import json
+import unittest
+
+import responses
+
+from admitad.decoders import DEFAULT_DECODER, get_decoder, orjson, stdlib_decoder
+from admitad.exceptions import HttpException, JsonException
+from admitad.items import Me
+from admitad.tests.base import BaseTestCase
+from admitad.transport import HttpTransport, api_request
+
+
+class DecodersTestCase(BaseTestCase):
+
+    def test_get_decoder(self):
+        self.assertIs(get_decoder('json'), stdlib_decoder)
+        self.assertIs(get_decoder(), DEFAULT_DECODER)
+        self.assertRaises(ValueError, get_decoder, 'pickle')
+
+    @unittest.skipIf(orjson is None, 'orjson is not installed')
+    def test_orjson_is_preferred(self):
+        self.assertIs(get_decoder(), orjson.loads)
+
+    def test_decoders_parse_bytes(self):
+        content = json.dumps({'name': 'Админ', 'results': [1, 2.5, None]}).encode('utf-8')
+
+        for name in ('json', 'orjson', 'ujson'):
+            try:
+                decoder = get_decoder(name)
+            except ImportError:
+                continue
+            self.assertDictEqual(decoder(content), {'name': 'Админ', 'results': [1, 2.5, None]})
+
+
+class DecoderTransportTestCase(BaseTestCase):
+
+    def test_custom_decoder(self):
+        contents = []
+
+        def decoder(content):
+            contents.append(content)
+            return json.loads(content)
+
+        with responses.RequestsMock() as resp:
+            resp.add(resp.GET, Me.URL, json={'id': 1}, status=200)
+
+            result = Me(HttpTransport('token', decoder=decoder)).get()
+
+        self.assertDictEqual(result, {'id': 1})
+        self.assertListEqual(contents, [b'{"id": 1}'])
+
+    def test_invalid_json(self):
+        with responses.RequestsMock() as resp:
+            resp.add(resp.GET, 'http://example.com/', body='<html>', status=200)
+
+            with self.assertRaises(JsonException):
+                api_request('http://example.com/')
+
+    def test_error_body(self):
+        with responses.RequestsMock() as resp:
+            resp.add(resp.GET, 'http://example.com/', json={'error': 'bad'}, status=400)
+
+            with self.assertRaises(HttpException) as context:
+                api_request('http://example.com/', decoder=stdlib_decoder)
+
+        self.assertDictEqual(context.exception.message, {'error': 'bad'})
+
+
+if __name__ == '__main__':
+    unittest.main()
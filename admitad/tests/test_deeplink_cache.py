@@ -0,0 +1,69 @@
+# coding: utf-8
+from __future__ import unicode_literals
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from admitad.deeplink_cache import DeeplinkCache
+from admitad.tests.base import BaseTestCase
+
+
+class DeeplinkCacheTestCase(BaseTestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'deeplinks.sqlite')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_get_many(self):
+        cache = DeeplinkCache(self.path)
+        cache.set_many(22, 10, {'https://a.com/': 'https://ad.admitad.com/g/a/'}, subid='feed')
+        cache.set_many(22, 10, {'https://b.com/': 'https://ad.admitad.com/g/b/'})
+
+        self.assertDictEqual(cache.get_many(22, 10, ['https://a.com/', 'https://b.com/'], subid='feed'), {
+            'https://a.com/': 'https://ad.admitad.com/g/a/',
+        })
+        self.assertDictEqual(cache.get_many(22, 10, ['https://a.com/', 'https://b.com/']), {
+            'https://b.com/': 'https://ad.admitad.com/g/b/',
+        })
+        self.assertDictEqual(cache.get_many(22, 11, ['https://a.com/'], subid='feed'), {})
+        cache.close()
+
+    def test_persistent(self):
+        cache = DeeplinkCache(self.path)
+        cache.set_many(22, 10, {'https://a.com/': 'https://ad.admitad.com/g/a/'})
+        cache.close()
+
+        cache = DeeplinkCache(self.path)
+        self.assertEqual(len(cache), 1)
+        self.assertIn('https://a.com/', cache.get_many(22, 10, ['https://a.com/']))
+        cache.close()
+
+    def test_ttl(self):
+        cache = DeeplinkCache(self.path, ttl=0.01)
+        cache.set_many(22, 10, {'https://a.com/': 'https://ad.admitad.com/g/a/'})
+        time.sleep(0.02)
+
+        self.assertDictEqual(cache.get_many(22, 10, ['https://a.com/']), {})
+        cache.purge()
+        self.assertEqual(len(cache), 0)
+        cache.close()
+
+    def test_invalidate(self):
+        cache = DeeplinkCache(self.path)
+        cache.set_many(22, 10, {'https://a.com/': 'https://ad.admitad.com/g/a/'}, subid='feed')
+        cache.set_many(22, 11, {'https://a.com/': 'https://ad.admitad.com/g/c/'})
+        cache.invalidate(22, 10)
+
+        self.assertDictEqual(cache.get_many(22, 10, ['https://a.com/'], subid='feed'), {})
+        self.assertEqual(len(cache), 1)
+        cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
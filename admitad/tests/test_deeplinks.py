@@ -1,9 +1,13 @@
 # coding: utf-8
 from __future__ import unicode_literals
 
+import os
+import shutil
+import tempfile
 import unittest
 import responses
 
+from admitad.deeplink_cache import DeeplinkCache
 from admitad.tests.base import BaseTestCase
 from admitad.items import DeeplinksManage
 
@@ -27,6 +31,87 @@ class DeeplinksManageTestCase(BaseTestCase):
 
         self.assertIn('status', result)
 
+    def test_deeplinks_create_cached(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        cache = DeeplinkCache(os.path.join(directory, 'deeplinks.sqlite'))
+        self.addCleanup(cache.close)
+        cache.set_many(9, 10, {'https://a.com/': 'https://ad.admitad.com/g/a/'}, subid='feed')
+        deeplinks = self.client.DeeplinksManage.with_options(deeplink_cache=cache)
+
+        with responses.RequestsMock() as resp:
+            resp.add(
+                resp.GET,
+                self.prepare_url(DeeplinksManage.CREATE_URL, website_id=9, campaign_id=10, params={
+                    'subid': 'feed',
+                    'ulp': ['https://b.com/'],
+                }),
+                match_querystring=True,
+                json=['https://ad.admitad.com/g/b/'],
+                status=200
+            )
+
+            result = deeplinks.create(9, 10, subid='feed', ulp=['https://a.com/', 'https://b.com/'])
+
+        self.assertListEqual(result, ['https://ad.admitad.com/g/a/', 'https://ad.admitad.com/g/b/'])
+
+        with responses.RequestsMock():
+            result = deeplinks.create(9, 10, subid='feed', ulp=['https://b.com/', 'https://a.com/'])
+
+        self.assertListEqual(result, ['https://ad.admitad.com/g/b/', 'https://ad.admitad.com/g/a/'])
+
+    def test_deeplinks_create_many(self):
+        with responses.RequestsMock() as resp:
+            resp.add(
+                resp.GET,
+                self.prepare_url(DeeplinksManage.CREATE_URL, website_id=9, campaign_id=10, params={
+                    'ulp': ['https://a.com/', 'https://b.com/'],
+                }),
+                match_querystring=True,
+                json=['https://ad.admitad.com/g/a/', 'https://ad.admitad.com/g/b/'],
+                status=200
+            )
+            resp.add(
+                resp.GET,
+                self.prepare_url(DeeplinksManage.CREATE_URL, website_id=9, campaign_id=11, params={
+                    'ulp': ['https://c.com/'],
+                }),
+                match_querystring=True,
+                json={'error': 'campaign is not connected'},
+                status=400
+            )
+
+            results = list(self.client.DeeplinksManage.create_many([
+                (9, 10, 'https://a.com/'),
+                (9, 11, 'https://c.com/'),
+                (9, 10, 'https://b.com/'),
+            ], workers=2))
+
+        self.assertListEqual(
+            [result.item[2] for result in results],
+            ['https://a.com/', 'https://c.com/', 'https://b.com/'],
+        )
+        self.assertEqual(results[0].value, 'https://ad.admitad.com/g/a/')
+        self.assertEqual(results[2].value, 'https://ad.admitad.com/g/b/')
+        self.assertEqual(results[1].error.status, 400)
+
+    def test_deeplinks_create_many_throttled(self):
+        urls = ['https://%s.com/' % index for index in range(200)]
+        with responses.RequestsMock() as resp:
+            resp.add(
+                resp.GET,
+                self.prepare_url(DeeplinksManage.CREATE_URL, website_id=9, campaign_id=10, params={'ulp': urls}),
+                match_querystring=True,
+                json={'error': 'Too Many Requests'},
+                status=429
+            )
+
+            results = list(self.client.DeeplinksManage.create_many((9, 10, url) for url in urls))
+
+            self.assertEqual(len(resp.calls), 1)
+
+        self.assertTrue(all(result.error.status == 429 for result in results))
+
 
 if __name__ == '__main__':
     unittest.main()
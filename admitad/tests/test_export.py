@@ -0,0 +1,168 @@
+# coding: utf-8
+from __future__ import unicode_literals
+
+import csv
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import responses
+from aioresponses import aioresponses
+
+from admitad.api import get_async_oauth_client_token
+from admitad.async_transport import AsyncHttpTransport
+from admitad.exceptions import HttpException
+from admitad.export import aexport, export, get_format, pyarrow
+from admitad.items import StatisticActions
+from admitad.tests.base import BaseTestCase
+from admitad.transport import HttpTransport
+
+
+class ExportTestCase(BaseTestCase):
+
+    ROWS = [
+        {'action_id': 1, 'status': 'approved', 'positions': [{'id': 1}]},
+        {'action_id': 2, 'status': 'приняно', 'positions': []},
+    ]
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.item = StatisticActions(HttpTransport('token'))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def get_path(self, name):
+        return os.path.join(self.directory, name)
+
+    def add_pages(self, resp, fail=False):
+        for index, offset in enumerate((0, 500)):
+            resp.add(
+                resp.GET,
+                self.prepare_url(StatisticActions.URL, params={'limit': 500, 'offset': offset, 'website': 10}),
+                match_querystring=True,
+                json={'results': [self.ROWS[index]], '_meta': {'count': 501}},
+                status=500 if fail and offset else 200,
+            )
+
+    def test_get_format(self):
+        self.assertEqual(get_format('actions.csv'), 'csv')
+        self.assertEqual(get_format('actions.csv.gz'), 'csv')
+        self.assertEqual(get_format('actions.json'), 'jsonl')
+        self.assertEqual(get_format('/tmp/actions.parquet'), 'parquet')
+        self.assertRaises(ValueError, get_format, 'actions.xml')
+
+    def test_jsonl(self):
+        path = self.get_path('actions.jsonl')
+
+        with responses.RequestsMock() as resp:
+            self.add_pages(resp)
+            rows = export(self.item, path, website=10)
+
+        self.assertEqual(rows, 2)
+        with open(path, encoding='utf-8') as fp:
+            self.assertListEqual([json.loads(line) for line in fp], self.ROWS)
+
+    def test_csv_gzip(self):
+        path = self.get_path('actions.csv.gz')
+
+        with responses.RequestsMock() as resp:
+            self.add_pages(resp)
+            export(self.item, path, website=10, stream=True)
+
+        with gzip.open(path, 'rt', encoding='utf-8', newline='') as fp:
+            self.assertListEqual(list(csv.reader(fp)), [
+                ['action_id', 'status', 'positions'],
+                ['1', 'approved', '[{"id": 1}]'],
+                ['2', 'приняно', '[]'],
+            ])
+
+    def test_csv_unknown_keys(self):
+        path = self.get_path('actions.csv')
+        self.ROWS = [{'action_id': 1}, {'action_id': 2, 'status': 'approved'}]
+
+        with responses.RequestsMock() as resp:
+            self.add_pages(resp)
+            with self.assertRaises(ValueError):
+                export(self.item, path, website=10)
+
+        with responses.RequestsMock() as resp:
+            self.add_pages(resp)
+            export(self.item, path, website=10, fieldnames=['action_id', 'status'])
+
+        with open(path, encoding='utf-8', newline='') as fp:
+            self.assertListEqual(list(csv.reader(fp)), [['action_id', 'status'], ['1', ''], ['2', 'approved']])
+
+    def test_async_item(self):
+        item = StatisticActions(AsyncHttpTransport('token'))
+
+        with self.assertRaises(TypeError):
+            export(item, self.get_path('actions.jsonl'), website=10)
+
+    def test_resume(self):
+        path = self.get_path('actions.jsonl.gz')
+        checkpoint = self.get_path('actions.checkpoint')
+
+        with responses.RequestsMock() as resp:
+            self.add_pages(resp, fail=True)
+            with self.assertRaises(HttpException):
+                export(self.item, path, website=10, checkpoint=checkpoint)
+
+        with open(checkpoint) as fp:
+            self.assertEqual(json.load(fp)['offset'], 500)
+
+        with responses.RequestsMock(assert_all_requests_are_fired=False) as resp:
+            self.add_pages(resp)
+            rows = export(self.item, path, website=10, checkpoint=checkpoint)
+
+            self.assertEqual(len(resp.calls), 1)
+
+        self.assertEqual(rows, 2)
+        self.assertFalse(os.path.exists(checkpoint))
+        with gzip.open(path, 'rt', encoding='utf-8') as fp:
+            self.assertListEqual([json.loads(line) for line in fp], self.ROWS)
+
+    def test_parquet_cannot_be_resumed(self):
+        with self.assertRaises(ValueError):
+            export(self.item, self.get_path('actions.parquet'), checkpoint=self.get_path('checkpoint'))
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_parquet(self):
+        path = self.get_path('actions.parquet')
+
+        with responses.RequestsMock() as resp:
+            self.add_pages(resp)
+            export(self.item, path, website=10, batch_size=1)
+
+        import pyarrow.parquet
+        self.assertListEqual(pyarrow.parquet.read_table(path).column('action_id').to_pylist(), [1, 2])
+
+
+class AsyncExportTestCase(unittest.IsolatedAsyncioTestCase):
+
+    async def test_aexport(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'actions.jsonl')
+        client = get_async_oauth_client_token(access_token='access_token')
+
+        with aioresponses() as resp:
+            for offset in (0, 500):
+                resp.get(
+                    StatisticActions.URL + '?limit=500&offset=%s&website=10' % offset,
+                    payload={'results': [{'action_id': offset}], '_meta': {'count': 501}},
+                )
+
+            async with client:
+                rows = await aexport(client.StatisticActions, path, website=10, workers=2)
+
+        self.assertEqual(rows, 2)
+        with open(path, encoding='utf-8') as fp:
+            self.assertListEqual([json.loads(line) for line in fp], [{'action_id': 0}, {'action_id': 500}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,6 +4,7 @@ from __future__ import unicode_literals
 import unittest
 import responses
 
+from admitad.cache import ResponseCache
 from admitad.items import LinksValidator
 from admitad.tests.base import BaseTestCase
 
@@ -30,6 +31,41 @@ class LinksValidationTestCase(BaseTestCase):
         self.assertIn('message', result)
         self.assertIn('success', result)
 
+    def test_validate_many(self):
+        with responses.RequestsMock() as resp:
+            for link, status in (('https://a.com/', 200), ('https://b.com/', 200), ('invalid', 400)):
+                resp.add(
+                    resp.GET,
+                    self.prepare_url(LinksValidator.URL, params={'link': link}),
+                    match_querystring=True,
+                    json={'message': 'Link tested.', 'success': 'Accepted'},
+                    status=status
+                )
+            links = ['https://a.com/', 'invalid', 'https://b.com/', 'https://a.com/']
+            results = {result.item: result for result in self.client.LinksValidator.validate_many(links, workers=2)}
+
+            self.assertEqual(len(resp.calls), 3)
+
+        self.assertEqual(results['https://a.com/'].value['success'], 'Accepted')
+        self.assertEqual(results['invalid'].error.status, 400)
+
+    def test_validate_many_cached(self):
+        validator = self.client.LinksValidator.with_options(cache=ResponseCache(policies={LinksValidator.URL: 60}))
+        with responses.RequestsMock() as resp:
+            resp.add(
+                resp.GET,
+                self.prepare_url(LinksValidator.URL, params={'link': 'https://a.com/'}),
+                match_querystring=True,
+                json={'message': 'Link tested.', 'success': 'Accepted'},
+                status=200
+            )
+            list(validator.validate_many(['https://a.com/']))
+            results = list(validator.validate_many(['https://a.com/']))
+
+            self.assertEqual(len(resp.calls), 1)
+
+        self.assertEqual(results[0].value['success'], 'Accepted')
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,133 @@
+# coding: utf-8
+from __future__ import unicode_literals
+
+import unittest
+from datetime import date, datetime
+from decimal import Decimal
+
+import responses
+
+from admitad.items import Campaigns, Me, StatisticActions
+from admitad.models import Action, Campaign, Field, Model, load_models, parse_date, parse_datetime, parse_decimal
+from admitad.streaming import ResultsStream
+from admitad.tests.base import BaseTestCase
+from admitad.transport import HttpTransport
+
+
+class ParsersTestCase(BaseTestCase):
+
+    def test_parse_datetime(self):
+        self.assertEqual(parse_datetime('2020-01-02 03:04:05'), datetime(2020, 1, 2, 3, 4, 5))
+        self.assertEqual(parse_datetime('2020-01-02T03:04:05'), datetime(2020, 1, 2, 3, 4, 5))
+        self.assertEqual(parse_datetime('02.01.2020 03:04:05'), datetime(2020, 1, 2, 3, 4, 5))
+        self.assertEqual(parse_datetime('02.01.2020'), datetime(2020, 1, 2))
+        self.assertEqual(parse_datetime('soon'), 'soon')
+        self.assertEqual(parse_date('2020-01-02'), date(2020, 1, 2))
+
+    def test_parse_decimal(self):
+        self.assertEqual(parse_decimal('10.50'), Decimal('10.50'))
+        self.assertEqual(parse_decimal(0.1), Decimal('0.1'))
+        self.assertEqual(parse_decimal('n/a'), 'n/a')
+        self.assertIs(parse_decimal(True), True)
+
+
+class ModelTestCase(BaseTestCase):
+
+    def test_fields(self):
+        action = Action.from_dict({
+            'action_id': 1,
+            'payment': '10.50',
+            'action_date': '2020-01-02 03:04:05',
+            'cart': None,
+            'unknown': 'value',
+        })
+
+        self.assertEqual(action.action_id, 1)
+        self.assertEqual(action.payment, Decimal('10.50'))
+        self.assertEqual(action.action_date, datetime(2020, 1, 2, 3, 4, 5))
+        self.assertIsNone(action.cart)
+        self.assertIsNone(action.order_id)
+        self.assertEqual(action.unknown, 'value')
+        self.assertRaises(AttributeError, getattr, action, 'missing')
+
+    def test_slots(self):
+        action = Action.from_dict({'action_id': 1})
+
+        self.assertFalse(hasattr(action, '__dict__'))
+        self.assertRaises(AttributeError, setattr, action, 'missing', 1)
+
+    def test_to_dict(self):
+        data = {'id': 1, 'name': 'campaign', 'rating': '9.5', 'extra_key': [1, 2]}
+
+        campaign = Campaign.from_dict(data)
+
+        self.assertDictEqual(campaign.to_dict(), data)
+        self.assertEqual(campaign, Campaign.from_dict(data))
+        self.assertNotEqual(campaign, Campaign.from_dict({'id': 2}))
+
+    def test_inheritance(self):
+        class ExtendedAction(Action):
+            extended = Field()
+
+        action = ExtendedAction.from_dict({'action_id': 1, 'extended': True})
+
+        self.assertIn('action_id', ExtendedAction.FIELDS)
+        self.assertEqual(action.action_id, 1)
+        self.assertTrue(action.extended)
+        self.assertIsNone(action.extra)
+
+    def test_load_models(self):
+        page = {'results': [{'id': 1}, {'id': 2}], '_meta': {'count': 2}}
+
+        result = load_models(Campaign, page)
+
+        self.assertListEqual([campaign.id for campaign in result['results']], [1, 2])
+        self.assertDictEqual(result['_meta'], {'count': 2})
+        self.assertIsInstance(page['results'][0], dict)
+        self.assertEqual(load_models(Campaign, {'id': 3}).id, 3)
+
+        stream = load_models(Campaign, ResultsStream([b'{"results": [{"id": 4}]}']))
+        self.assertListEqual([campaign.id for campaign in stream], [4])
+
+
+class ModelTransportTestCase(BaseTestCase):
+
+    def test_raw_dicts_by_default(self):
+        with responses.RequestsMock() as resp:
+            resp.add(resp.GET, StatisticActions.URL, json={'results': [{'action_id': 1}]}, status=200)
+
+            result = StatisticActions(HttpTransport('token')).get()
+
+        self.assertDictEqual(result['results'][0], {'action_id': 1})
+
+    def test_item_model(self):
+        with responses.RequestsMock() as resp:
+            resp.add(resp.GET, StatisticActions.URL, json={'results': [{'action_id': 1, 'payment': 2}]}, status=200)
+            resp.add(resp.GET, Campaigns.SINGLE_URL % {'campaign_id': 5}, json={'id': 5}, status=200)
+
+            actions = StatisticActions(HttpTransport('token')).with_options(model=True).get()
+            campaign = Campaigns(HttpTransport('token')).with_options(model=True).getOne(5)
+
+        self.assertIsInstance(actions['results'][0], Action)
+        self.assertEqual(actions['results'][0].payment, Decimal(2))
+        self.assertIsInstance(campaign, Campaign)
+
+    def test_item_without_model(self):
+        with self.assertRaises(AttributeError):
+            Me(HttpTransport('token')).with_options(model=True)
+
+    def test_custom_model(self):
+        class Profile(Model):
+            id = Field()
+
+        with responses.RequestsMock() as resp:
+            resp.add(resp.GET, Me.URL, json={'id': 1, 'username': 'user'}, status=200)
+
+            result = Me(HttpTransport('token')).with_options(model=Profile).get()
+
+        self.assertEqual(result.id, 1)
+        self.assertEqual(result.username, 'user')
+
+
+if __name__ == '__main__':
+    unittest.main()
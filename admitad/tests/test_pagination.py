@@ -0,0 +1,170 @@
+# coding: utf-8
+from __future__ import unicode_literals
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from admitad.pagination import Checkpoint, CheckpointFile, iterate_pages, iterate_results
+from admitad.tests.base import BaseTestCase
+
+
+def make_fetch_page(total, with_count=True, calls=None):
+    def fetch_page(limit, offset):
+        if calls is not None:
+            calls.append((limit, offset))
+        page = {'results': list(range(offset, min(offset + limit, total)))}
+        if with_count:
+            page['_meta'] = {'count': total, 'limit': limit, 'offset': offset}
+        return page
+    return fetch_page
+
+
+class PaginationTestCase(BaseTestCase):
+
+    def test_iterate_results_stops_on_count(self):
+        calls = []
+        result = list(iterate_results(make_fetch_page(12, calls=calls), limit=5))
+
+        self.assertListEqual(result, list(range(12)))
+        self.assertListEqual(calls, [(5, 0), (5, 5), (5, 10)])
+
+    def test_iterate_results_exact_count(self):
+        calls = []
+        result = list(iterate_results(make_fetch_page(10, calls=calls), limit=5))
+
+        self.assertListEqual(result, list(range(10)))
+        self.assertEqual(len(calls), 2)
+
+    def test_iterate_results_without_count(self):
+        calls = []
+        result = list(iterate_results(make_fetch_page(10, with_count=False, calls=calls), limit=5))
+
+        self.assertListEqual(result, list(range(10)))
+        self.assertEqual(len(calls), 3)
+
+    def test_iterate_results_offset(self):
+        result = list(iterate_results(make_fetch_page(12), limit=5, offset=7))
+
+        self.assertListEqual(result, list(range(7, 12)))
+
+    def test_iterate_pages_is_lazy(self):
+        calls = []
+        pages = iterate_pages(make_fetch_page(100, calls=calls), limit=10)
+
+        self.assertListEqual(next(pages)['results'], list(range(10)))
+        self.assertEqual(len(calls), 1)
+
+    def test_iterate_empty(self):
+        self.assertListEqual(list(iterate_results(make_fetch_page(0))), [])
+
+
+class ParallelPaginationTestCase(BaseTestCase):
+
+    def test_parallel_results_are_ordered(self):
+        def fetch_page(limit, offset):
+            time.sleep(0.001 * ((offset // limit) % 3))
+            return make_fetch_page(103)(limit, offset)
+
+        result = list(iterate_results(fetch_page, limit=10, workers=4))
+
+        self.assertListEqual(result, list(range(103)))
+
+    def test_parallel_window_is_bounded(self):
+        lock = threading.Lock()
+        state = {'active': 0, 'peak': 0}
+
+        def fetch_page(limit, offset):
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+            time.sleep(0.002)
+            with lock:
+                state['active'] -= 1
+            return make_fetch_page(200)(limit, offset)
+
+        pages = list(iterate_pages(fetch_page, limit=10, workers=8, window=3))
+
+        self.assertEqual(len(pages), 20)
+        self.assertLessEqual(state['peak'], 3)
+
+    def test_parallel_without_count(self):
+        calls = []
+        result = list(iterate_results(make_fetch_page(25, with_count=False, calls=calls), limit=10, workers=4))
+
+        self.assertListEqual(result, list(range(25)))
+        self.assertEqual(len(calls), 3)
+
+    def test_parallel_stops_when_closed(self):
+        calls = []
+        pages = iterate_pages(make_fetch_page(1000, calls=calls), limit=10, workers=2, window=2)
+
+        next(pages)
+        next(pages)
+        pages.close()
+
+        self.assertLessEqual(len(calls), 4)
+
+
+class CheckpointTestCase(BaseTestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'job.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_checkpoint_advances_after_each_page(self):
+        saved = []
+        checkpoint = Checkpoint('Campaigns', {})
+        pages = iterate_pages(
+            make_fetch_page(12), limit=5, checkpoint=checkpoint,
+            on_checkpoint=lambda value: saved.append((value.offset, value.rows)),
+        )
+
+        next(pages)
+        self.assertEqual(checkpoint.offset, 0)
+        list(pages)
+
+        self.assertListEqual(saved, [(5, 5), (10, 10), (15, 12)])
+        self.assertEqual(checkpoint.count, 12)
+
+    def test_resume_from_checkpoint(self):
+        calls = []
+        checkpoint = Checkpoint('Campaigns', {}, offset=10, rows=10)
+        result = list(iterate_results(make_fetch_page(12, calls=calls), limit=5, offset=0, checkpoint=checkpoint))
+
+        self.assertListEqual(result, [10, 11])
+        self.assertListEqual(calls, [(5, 10)])
+        self.assertEqual(checkpoint.rows, 12)
+
+    def test_checkpoint_file(self):
+        checkpoint_file = CheckpointFile(self.path)
+        checkpoint = checkpoint_file.load('Campaigns', {'website': 1})
+        self.assertEqual(checkpoint.offset, 0)
+
+        list(iterate_pages(make_fetch_page(12), limit=5, checkpoint=checkpoint, on_checkpoint=checkpoint_file.save))
+        loaded = checkpoint_file.load('Campaigns', {'website': 1})
+
+        self.assertEqual(loaded, checkpoint)
+        self.assertEqual(loaded.offset, 15)
+
+        checkpoint_file.delete()
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_checkpoint_file_of_another_job(self):
+        checkpoint_file = CheckpointFile(self.path)
+        checkpoint_file.save(Checkpoint('Campaigns', {'website': 1}, offset=500))
+
+        with self.assertRaises(ValueError):
+            checkpoint_file.load('Campaigns', {'website': 2})
+        with self.assertRaises(ValueError):
+            checkpoint_file.load('Coupons', {'website': 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+# coding: utf-8
+from __future__ import unicode_literals
+
+import os
+import tempfile
+import unittest
+from email.utils import formatdate
+
+import responses
+
+from admitad.exceptions import HttpException
+from admitad.items import Me
+from admitad.ratelimit import BucketState, FileTokenBucket, TokenBucket, take_token
+from admitad.retry import RetryPolicy, get_retry_after
+from admitad.tests.base import BaseTestCase
+from admitad.transport import HttpTransport
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.value = 1000.0
+
+    def __call__(self):
+        return self.value
+
+
+class RecordingLimiter:
+
+    def __init__(self):
+        self.acquired = 0
+        self.paused = []
+
+    def acquire(self):
+        self.acquired += 1
+
+    def reserve(self):
+        self.acquired += 1
+        return 0.0
+
+    def pause(self, seconds):
+        self.paused.append(seconds)
+
+
+class TokenBucketTestCase(BaseTestCase):
+
+    def test_take_token(self):
+        state = BucketState(tokens=2, updated=0)
+
+        self.assertEqual(take_token(state, 0, rate=2, capacity=2), 0)
+        self.assertEqual(take_token(state, 0, rate=2, capacity=2), 0)
+        self.assertEqual(take_token(state, 0, rate=2, capacity=2), 0.5)
+        self.assertEqual(take_token(state, 0, rate=2, capacity=2), 1.0)
+        self.assertEqual(take_token(state, 10, rate=2, capacity=2), 0)
+
+    def test_reserve_paces_after_burst(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10, capacity=2, clock=clock)
+
+        self.assertListEqual([round(bucket.reserve(), 6) for _ in range(4)], [0, 0, 0.1, 0.2])
+
+        clock.value += 1
+        self.assertEqual(bucket.reserve(), 0)
+
+    def test_pause(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10, clock=clock)
+        bucket.pause(5)
+
+        self.assertEqual(bucket.reserve(), 5)
+
+        clock.value += 5
+        self.assertEqual(bucket.reserve(), 0)
+
+    def test_file_bucket_is_shared(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'bucket')
+            first = FileTokenBucket(path, rate=1, capacity=1)
+            second = FileTokenBucket(path, rate=1, capacity=1)
+
+            self.assertEqual(first.reserve(), 0)
+            self.assertGreater(second.reserve(), 0.9)
+
+            first.pause(30)
+            self.assertGreater(second.reserve(), 29)
+
+
+class RetryAfterTestCase(BaseTestCase):
+
+    def test_get_retry_after(self):
+        self.assertEqual(get_retry_after(HttpException(429, '', '', {'Retry-After': '7'})), 7)
+        self.assertEqual(get_retry_after(HttpException(429, '', '', {'retry-after': '1.5'})), 1.5)
+        self.assertIsNone(get_retry_after(HttpException(429, '', '')))
+        self.assertIsNone(get_retry_after(HttpException(429, '', '', {'Retry-After': 'soon'})))
+
+        delay = get_retry_after(HttpException(429, '', '', {'Retry-After': formatdate(usegmt=True)}))
+        self.assertLessEqual(delay, 1)
+
+    def test_retry_delay_honours_retry_after(self):
+        policy = RetryPolicy(backoff_base=0, jitter=False)
+
+        self.assertEqual(policy.get_delay(1, HttpException(429, '', '', {'Retry-After': '0.01'})), 0.01)
+
+
+class RateLimitTransportTestCase(BaseTestCase):
+
+    def test_limiter_paces_every_request(self):
+        limiter = RecordingLimiter()
+        transport = HttpTransport('token', rate_limiter=limiter)
+
+        with responses.RequestsMock() as resp:
+            resp.add(resp.GET, Me.URL, json={'id': 1}, status=200)
+
+            transport.get().request(url=Me.URL)
+            transport.get().request(url=Me.URL)
+
+        self.assertEqual(limiter.acquired, 2)
+
+    def test_throttled_request_pauses_and_retries(self):
+        limiter = RecordingLimiter()
+        transport = HttpTransport('token', rate_limiter=limiter, retry=RetryPolicy(backoff_base=0))
+
+        with responses.RequestsMock() as resp:
+            resp.add(resp.GET, Me.URL, json={}, status=429, headers={'Retry-After': '0'})
+            resp.add(resp.GET, Me.URL, json={}, status=429, headers={'Retry-After': '0.01'})
+            resp.add(resp.GET, Me.URL, json={'id': 1}, status=200)
+
+            result = transport.get().request(url=Me.URL)
+
+        self.assertEqual(result['id'], 1)
+        self.assertEqual(limiter.acquired, 3)
+        self.assertListEqual(limiter.paused, [0.01])
+
+
+if __name__ == '__main__':
+    unittest.main()
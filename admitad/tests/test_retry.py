@@ -0,0 +1,116 @@
+# coding: utf-8
+from __future__ import unicode_literals
+
+import unittest
+
+import requests
+import responses
+
+from admitad.exceptions import ConnectionException, HttpException
+from admitad.items import Me, StatisticActions
+from admitad.retry import NO_RETRY, RetryPolicy
+from admitad.tests.base import BaseTestCase
+from admitad.transport import HttpTransport
+
+FAST = RetryPolicy(max_attempts=3, backoff_base=0, jitter=False)
+
+
+class RetryPolicyTestCase(BaseTestCase):
+
+    def test_get_delay(self):
+        policy = RetryPolicy(backoff_base=1, backoff_cap=5, jitter=False)
+
+        self.assertListEqual([policy.get_delay(attempt) for attempt in range(1, 6)], [1, 2, 4, 5, 5])
+
+    def test_get_delay_with_jitter(self):
+        policy = RetryPolicy(backoff_base=1, backoff_cap=5)
+
+        for attempt in range(1, 6):
+            self.assertLessEqual(0, policy.get_delay(attempt))
+            self.assertLessEqual(policy.get_delay(attempt), min(5, 2 ** (attempt - 1)))
+
+    def test_is_retryable(self):
+        policy = RetryPolicy()
+
+        self.assertTrue(policy.is_retryable('GET', HttpException(503, '', '')))
+        self.assertTrue(policy.is_retryable('GET', ConnectionException('reset')))
+        self.assertFalse(policy.is_retryable('GET', HttpException(400, '', '')))
+        self.assertFalse(policy.is_retryable('POST', HttpException(503, '', '')))
+        self.assertTrue(RetryPolicy(methods=frozenset(['POST'])).is_retryable('POST', HttpException(503, '', '')))
+
+    def test_should_retry(self):
+        error = HttpException(502, '', '')
+
+        self.assertTrue(FAST.should_retry('GET', error, 2))
+        self.assertFalse(FAST.should_retry('GET', error, 3))
+        self.assertFalse(NO_RETRY.should_retry('GET', error, 1))
+
+
+class RetryTransportTestCase(BaseTestCase):
+
+    def test_retries_transient_errors(self):
+        with responses.RequestsMock() as resp:
+            resp.add(resp.GET, Me.URL, json={}, status=503)
+            resp.add(resp.GET, Me.URL, body=requests.ConnectionError('reset'))
+            resp.add(resp.GET, Me.URL, json={'id': 1}, status=200)
+
+            result = HttpTransport('token', retry=FAST).get().request(url=Me.URL)
+
+        self.assertEqual(result['id'], 1)
+
+    def test_gives_up_after_max_attempts(self):
+        with responses.RequestsMock() as resp:
+            resp.add(resp.GET, Me.URL, json={}, status=504)
+
+            with self.assertRaises(HttpException):
+                HttpTransport('token', retry=FAST).get().request(url=Me.URL)
+
+            self.assertEqual(len(resp.calls), 3)
+
+    def test_post_is_not_retried(self):
+        with responses.RequestsMock() as resp:
+            resp.add(resp.POST, Me.URL, json={}, status=503)
+
+            with self.assertRaises(HttpException):
+                HttpTransport('token', retry=FAST).post().request(url=Me.URL)
+
+            self.assertEqual(len(resp.calls), 1)
+
+    def test_no_retry_by_default(self):
+        with responses.RequestsMock() as resp:
+            resp.add(resp.GET, Me.URL, json={}, status=503)
+
+            with self.assertRaises(HttpException):
+                HttpTransport('token').get().request(url=Me.URL)
+
+            self.assertEqual(len(resp.calls), 1)
+
+    def test_per_call_override(self):
+        with responses.RequestsMock() as resp:
+            resp.add(resp.GET, Me.URL, json={}, status=503)
+            resp.add(resp.GET, Me.URL, json={'id': 1}, status=200)
+
+            result = HttpTransport('token').get().request(url=Me.URL, retry=FAST)
+
+        self.assertEqual(result['id'], 1)
+
+    def test_item_with_options(self):
+        with responses.RequestsMock() as resp:
+            resp.add(resp.GET, StatisticActions.URL, json={}, status=502)
+            resp.add(resp.GET, StatisticActions.URL, json={'results': []}, status=200)
+
+            item = self.client.StatisticActions.with_options(retry=FAST)
+            result = item.get()
+
+        self.assertIs(item.transport.retry, FAST)
+        self.assertIs(self.client._transport.retry, NO_RETRY)
+        self.assertIs(item.transport.pool, self.client._transport.pool)
+        self.assertIn('results', result)
+
+    def test_unknown_option(self):
+        with self.assertRaises(AttributeError):
+            HttpTransport('token').with_options(foo=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+# coding: utf-8
+from __future__ import unicode_literals
+
+import asyncio
+import time
+import unittest
+from datetime import date
+
+from admitad.sharding import aiterate_shards, get_sort_key, iterate_shards, split_date_range
+from admitad.tests.base import BaseTestCase
+
+
+class SplitDateRangeTestCase(BaseTestCase):
+
+    def test_split_by_day(self):
+        shards = split_date_range('30.12.2019', '02.01.2020')
+
+        self.assertListEqual(shards, [
+            (date(2019, 12, 30), date(2019, 12, 30)),
+            (date(2019, 12, 31), date(2019, 12, 31)),
+            (date(2020, 1, 1), date(2020, 1, 1)),
+            (date(2020, 1, 2), date(2020, 1, 2)),
+        ])
+
+    def test_split_by_week(self):
+        shards = split_date_range(date(2020, 1, 1), date(2020, 1, 10), 'week')
+
+        self.assertListEqual(shards, [
+            (date(2020, 1, 1), date(2020, 1, 7)),
+            (date(2020, 1, 8), date(2020, 1, 10)),
+        ])
+
+    def test_invalid_range(self):
+        with self.assertRaises(ValueError):
+            split_date_range('02.01.2020', '01.01.2020')
+        with self.assertRaises(ValueError):
+            split_date_range('01.01.2020', '02.01.2020', 0)
+
+
+class IterateShardsTestCase(BaseTestCase):
+
+    def test_shards_are_ordered(self):
+        def fetch_shard(shard):
+            time.sleep(0.001 * (shard % 3))
+            return [shard * 10, shard * 10 + 1]
+
+        result = list(iterate_shards(fetch_shard, list(range(10)), workers=4, window=3))
+
+        self.assertListEqual(result, [value for shard in range(10) for value in (shard * 10, shard * 10 + 1)])
+
+    def test_sorted_merge(self):
+        rows = {
+            1: [{'payment': '9.5'}, {'payment': '2'}],
+            2: [{'payment': None}, {'payment': '10'}, {'payment': '3'}],
+        }
+        key, reverse = get_sort_key(['-payment'])
+
+        result = list(iterate_shards(rows.get, [1, 2], workers=2, key=key, reverse=reverse))
+
+        self.assertListEqual([row['payment'] for row in result], [None, '10', '9.5', '3', '2'])
+
+    def test_sorted_merge_is_lazy(self):
+        read = []
+
+        def fetch_shard(shard):
+            for value in range(shard, 3000, 3):
+                read.append(value)
+                yield {'id': value}
+
+        key, reverse = get_sort_key(['id'])
+        rows = iterate_shards(fetch_shard, [0, 1, 2], workers=1, key=key, reverse=reverse, buffer_size=10)
+        first = [next(rows)['id'] for _ in range(30)]
+        rows.close()
+
+        self.assertListEqual(first, list(range(30)))
+        self.assertLessEqual(len(read), 3 * 3 * 10)
+
+    def test_mixed_directions(self):
+        with self.assertRaises(ValueError):
+            get_sort_key(['payment', '-action_date'])
+
+    def test_async_shards(self):
+        async def fetch_shard(shard):
+            await asyncio.sleep(0.001 * (3 - shard))
+            for value in (shard, shard + 3):
+                yield {'id': value}
+
+        async def collect(**kwargs):
+            return [row['id'] async for row in aiterate_shards(fetch_shard, [0, 1, 2], workers=2, **kwargs)]
+
+        self.assertListEqual(asyncio.run(collect()), [0, 3, 1, 4, 2, 5])
+
+        key, reverse = get_sort_key(['id'])
+        self.assertListEqual(asyncio.run(collect(key=key, reverse=reverse)), [0, 1, 2, 3, 4, 5])
+        self.assertListEqual(asyncio.run(collect(key=key, reverse=reverse, buffer_size=1)), [0, 1, 2, 3, 4, 5])
+
+    def test_async_descending_merge(self):
+        rows = {
+            1: [{'payment': '9.5'}, {'payment': '2'}],
+            2: [{'payment': None}, {'payment': '10'}, {'payment': '3'}],
+        }
+
+        async def fetch_shard(shard):
+            for row in rows[shard]:
+                yield row
+
+        async def collect():
+            key, reverse = get_sort_key(['-payment'])
+            return [row['payment'] async for row in aiterate_shards(fetch_shard, [1, 2], key=key, reverse=reverse)]
+
+        self.assertListEqual(asyncio.run(collect()), [None, '10', '9.5', '3', '2'])
+
+    def test_async_sorted_merge_is_lazy(self):
+        read = []
+
+        async def fetch_shard(shard):
+            for value in range(shard, 3000, 3):
+                read.append(value)
+                yield {'id': value}
+
+        async def take(count):
+            key, reverse = get_sort_key(['id'])
+            rows = aiterate_shards(fetch_shard, [0, 1, 2], workers=1, key=key, reverse=reverse, buffer_size=10)
+            first = [(await rows.__anext__())['id'] for _ in range(count)]
+            await rows.aclose()
+            return first
+
+        self.assertListEqual(asyncio.run(take(30)), list(range(30)))
+        self.assertLessEqual(len(read), 3 * 3 * 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+# coding: utf-8
+from __future__ import unicode_literals
+
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import responses
+
+from admitad.items import Balance, Me
+from admitad.singleflight import AsyncSingleFlight, SingleFlight
+from admitad.tests.base import BaseTestCase
+from admitad.transport import HttpTransport
+
+
+class SingleFlightTestCase(BaseTestCase):
+
+    def test_get_key(self):
+        self.assertEqual(
+            SingleFlight.get_key('GET', 'http://example.com/', {'b': 1, 'a': 2}, 'token'),
+            SingleFlight.get_key('GET', 'http://example.com/', {'a': 2, 'b': 1}, 'token'),
+        )
+        self.assertNotEqual(
+            SingleFlight.get_key('GET', 'http://example.com/', None, 'token'),
+            SingleFlight.get_key('GET', 'http://example.com/', None, 'other'),
+        )
+
+    def test_concurrent_calls_are_coalesced(self):
+        single_flight = SingleFlight()
+        calls = []
+        started = threading.Event()
+
+        def call():
+            calls.append(1)
+            started.set()
+            time.sleep(0.05)
+            return 'result'
+
+        with ThreadPoolExecutor(4) as executor:
+            leader = executor.submit(single_flight.do, 'key', call)
+            started.wait()
+            followers = [executor.submit(single_flight.do, 'key', call) for _ in range(3)]
+
+            self.assertTupleEqual(leader.result(), ('result', False))
+            self.assertListEqual([future.result() for future in followers], [('result', True)] * 3)
+
+        self.assertEqual(len(calls), 1)
+        self.assertTupleEqual(single_flight.do('key', call), ('result', False))
+
+    def test_exception_is_shared(self):
+        single_flight = SingleFlight()
+        started = threading.Event()
+
+        def call():
+            started.set()
+            time.sleep(0.05)
+            raise ValueError('error')
+
+        with ThreadPoolExecutor(2) as executor:
+            leader = executor.submit(single_flight.do, 'key', call)
+            started.wait()
+            follower = executor.submit(single_flight.do, 'key', call)
+
+            self.assertRaises(ValueError, leader.result)
+            self.assertRaises(ValueError, follower.result)
+
+
+class SingleFlightTransportTestCase(BaseTestCase):
+
+    def test_identical_gets_are_coalesced(self):
+        transport = HttpTransport('token', single_flight=SingleFlight())
+
+        def callback(request):
+            time.sleep(0.05)
+            return 200, {}, '{"balance": 1}'
+
+        with responses.RequestsMock() as resp:
+            resp.add_callback(resp.GET, Balance.EXTENDED_URL, callback=callback)
+
+            with ThreadPoolExecutor(8) as executor:
+                results = list(executor.map(lambda _: Balance(transport).get(extended=True), range(8)))
+
+            self.assertEqual(len(resp.calls), 1)
+
+        self.assertListEqual(results, [{'balance': 1}] * 8)
+        results[0]['balance'] = 2
+        self.assertEqual(results[1]['balance'], 1)
+
+    def test_tokens_are_not_shared(self):
+        single_flight = SingleFlight()
+        transports = [HttpTransport(token, single_flight=single_flight) for token in ('first', 'second')]
+
+        def callback(request):
+            time.sleep(0.05)
+            return 200, {}, '{"id": 1}'
+
+        with responses.RequestsMock() as resp:
+            resp.add_callback(resp.GET, Me.URL, callback=callback)
+
+            with ThreadPoolExecutor(2) as executor:
+                list(executor.map(lambda transport: Me(transport).get(), transports))
+
+            self.assertEqual(len(resp.calls), 2)
+
+
+class AsyncSingleFlightTestCase(unittest.IsolatedAsyncioTestCase):
+
+    async def test_concurrent_calls_are_coalesced(self):
+        single_flight = AsyncSingleFlight()
+        calls = []
+
+        async def call():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return 'result'
+
+        results = await asyncio.gather(*[single_flight.do('key', call) for _ in range(4)])
+
+        self.assertEqual(len(calls), 1)
+        self.assertListEqual(results, [('result', False)] + [('result', True)] * 3)
+
+    async def test_exception_is_shared(self):
+        single_flight = AsyncSingleFlight()
+
+        async def call():
+            await asyncio.sleep(0.01)
+            raise ValueError('error')
+
+        results = await asyncio.gather(*[single_flight.do('key', call) for _ in range(2)], return_exceptions=True)
+
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+
+    async def test_cancelled_leader_does_not_cancel_followers(self):
+        single_flight = AsyncSingleFlight()
+
+        async def call():
+            await asyncio.sleep(0.02)
+            return 'result'
+
+        leader = asyncio.ensure_future(single_flight.do('key', call))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(single_flight.do('key', call))
+        await asyncio.sleep(0)
+
+        with self.assertRaises(asyncio.TimeoutError):
+            await asyncio.wait_for(leader, timeout=0.005)
+
+        self.assertTupleEqual(await follower, ('result', True))
+        self.assertFalse(follower.cancelled())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -202,6 +202,102 @@ class StatisticActionsTestCase(BaseTestCase):
 
         self.assertIn('status', result)
 
+    def test_iterate_statistic_actions_parallel(self):
+        with responses.RequestsMock() as resp:
+            for offset in range(0, 2000, 500):
+                resp.add(
+                    resp.GET,
+                    self.prepare_url(StatisticActions.URL, params={
+                        'website': 10,
+                        'limit': 500,
+                        'offset': offset,
+                    }),
+                    match_querystring=True,
+                    json={
+                        'results': [{'action_id': offset}],
+                        '_meta': {'count': 1600, 'limit': 500, 'offset': offset},
+                    },
+                    status=200
+                )
+            result = list(self.client.StatisticActions.iterate(website=10, workers=3))
+
+        self.assertListEqual([item['action_id'] for item in result], [0, 500, 1000, 1500])
+
+    def test_iterate_sharded_statistic_actions(self):
+        with responses.RequestsMock() as resp:
+            for day, dates in ((1, ['10:00:00', '20:00:00']), (2, ['08:00:00']), (3, ['12:00:00'])):
+                resp.add(
+                    resp.GET,
+                    self.prepare_url(StatisticActions.URL, params={
+                        'date_start': '0%s.01.2020' % day,
+                        'date_end': '0%s.01.2020' % day,
+                        'website': 10,
+                        'order_by': ['-payment'],
+                        'limit': 500,
+                        'offset': 0,
+                    }),
+                    match_querystring=True,
+                    json={
+                        'results': [
+                            {'action_id': '%s-%s' % (day, index), 'payment': 10 * day - index}
+                            for index, _ in enumerate(dates)
+                        ],
+                        '_meta': {'count': len(dates), 'limit': 500, 'offset': 0},
+                    },
+                    status=200
+                )
+            result = list(self.client.StatisticActions.iterate_sharded(
+                '01.01.2020', '03.01.2020', website=10, order_by=['-payment'], workers=2,
+            ))
+            self.assertListEqual([item['action_id'] for item in result], ['1-0', '1-1', '2-0', '3-0'])
+
+            result = list(self.client.StatisticActions.iterate_sharded(
+                '01.01.2020', '03.01.2020', website=10, order_by=['-payment'], workers=2, sort=True,
+            ))
+            self.assertListEqual([item['payment'] for item in result], [30, 20, 10, 9])
+
+    def test_table_statistic_actions(self):
+        with responses.RequestsMock() as resp:
+            for offset in (0, 500):
+                resp.add(
+                    resp.GET,
+                    self.prepare_url(StatisticActions.URL, params={
+                        'website': 10,
+                        'limit': 500,
+                        'offset': offset,
+                    }),
+                    match_querystring=True,
+                    json={
+                        'results': [{'action_id': offset, 'payment': '1.5', 'action_date': '2020-01-02 00:00:00'}],
+                        '_meta': {'count': 501, 'limit': 500, 'offset': offset},
+                    },
+                    status=200
+                )
+            result = self.client.StatisticActions.table(website=10)
+
+        self.assertEqual(len(result), 2)
+        self.assertListEqual(list(result.column('action_id')), [0, 500])
+        self.assertListEqual(list(result.column('payment')), [1.5, 1.5])
+        self.assertListEqual(list(result.column('action_date')), [1577923200, 1577923200])
+
+    def test_table_of_models(self):
+        with responses.RequestsMock() as resp:
+            resp.add(
+                resp.GET,
+                self.prepare_url(StatisticActions.URL, params={'limit': 500, 'offset': 0}),
+                match_querystring=True,
+                json={
+                    'results': [{'action_id': 1, 'payment': '1.5', 'action_date': '2020-01-02 00:00:00'}],
+                    '_meta': {'count': 1, 'limit': 500, 'offset': 0},
+                },
+                status=200
+            )
+            result = self.client.StatisticActions.with_options(model=True).table()
+
+        self.assertListEqual(list(result.column('action_id')), [1])
+        self.assertListEqual(list(result.column('payment')), [1.5])
+        self.assertListEqual(list(result.column('action_date')), [1577923200])
+
 
 class StatisticSubIdsTestCase(BaseTestCase):
 
@@ -0,0 +1,157 @@
+# coding: utf-8
+from __future__ import unicode_literals
+
+import json
+import unittest
+from random import Random
+
+import requests
+import responses
+
+from admitad.async_transport import AsyncHttpTransport
+from admitad.exceptions import ConnectionException, JsonException
+from admitad.items import StatisticActions
+from admitad.streaming import ResultsParser, ResultsStream
+from admitad.tests.base import BaseTestCase
+from admitad.transport import HttpTransport
+
+
+def split(content, size):
+    return [content[index:index + size] for index in range(0, len(content), size)]
+
+
+class ResultsParserTestCase(BaseTestCase):
+
+    PAGE = {
+        '_meta': {'count': 3, 'limit': 500, 'offset': 0},
+        'results': [
+            {'action_id': 1, 'status': 'приняно', 'payment': 10.5, 'tags': [None, True, False]},
+            {'action_id': 2, 'nested': {'list': [{'a': '"]}'}]}},
+            12345,
+        ],
+        'total': 678,
+    }
+
+    def test_any_chunk_size(self):
+        content = json.dumps(self.PAGE, ensure_ascii=False, indent=2).encode('utf-8')
+
+        for size in (1, 2, 3, 5, 16, len(content)):
+            stream = ResultsStream(split(content, size))
+
+            self.assertListEqual(list(stream), self.PAGE['results'])
+            self.assertDictEqual(stream.get('_meta'), self.PAGE['_meta'])
+            self.assertEqual(stream.get('total'), 678)
+            self.assertEqual(stream.size, 3)
+
+    def test_rows_are_yielded_as_they_arrive(self):
+        parser = ResultsParser()
+
+        self.assertListEqual(parser.feed(b'{"results": [{"id": 1}, {"id"'), [{'id': 1}])
+        self.assertListEqual(parser.feed(b': 2}, 3'), [{'id': 2}])
+        self.assertListEqual(parser.feed(b'4], "count": 1'), [34])
+        self.assertListEqual(parser.feed(b'0}'), [])
+        self.assertListEqual(parser.close(), [])
+        self.assertDictEqual(parser.meta, {'count': 10})
+
+    def test_number_cut_at_a_boundary(self):
+        for head, tail in ((b'-0.', b'25}'), (b'1e', b'3}'), (b'1.5E', b'-2}'), (b'-', b'7}')):
+            parser = ResultsParser()
+            parser.feed(b'{"results": [], "tail": ' + head)
+            parser.feed(tail)
+            parser.close()
+
+            self.assertEqual(parser.meta['tail'], json.loads(head + tail[:-1]))
+
+    def test_random_chunk_boundaries(self):
+        numbers = [0, -0.25, 1e-07, -12, 3.5e+20, 1.5, -0.0, 42, 1234567890123]
+        page = {'results': numbers + [{'n': number} for number in numbers], 'total': -0.5, 'count': 10}
+        content = json.dumps(page).encode('utf-8')
+        content = content.replace(b'1.5', b'1.5E0').replace(b'42', b'4.2e1')
+        expected = json.loads(content)
+        random = Random(15)
+
+        for _ in range(300):
+            cuts = sorted(random.sample(range(1, len(content)), random.randint(1, 20)))
+            chunks = [content[start:end] for start, end in zip([0] + cuts, cuts + [len(content)])]
+            stream = ResultsStream(chunks)
+
+            self.assertListEqual(list(stream), expected['results'])
+            self.assertEqual(stream.get('total'), -0.5)
+            self.assertEqual(stream.get('count'), 10)
+
+    def test_object_without_results(self):
+        stream = ResultsStream([b'{"id": 1, "name": "foo"}'])
+
+        self.assertListEqual(list(stream), [])
+        self.assertDictEqual(stream.meta, {'id': 1, 'name': 'foo'})
+
+    def test_invalid_json(self):
+        for content in (b'[1, 2]', b'{"results": [1, }', b'{"results": [1, 2]', b'{} {}'):
+            with self.assertRaises(JsonException):
+                list(ResultsStream([content]))
+
+    def test_connection_error(self):
+        def chunks():
+            yield b'{"results": [1, 2'
+            raise requests.exceptions.ChunkedEncodingError('connection broken')
+
+        closed = []
+        rows = []
+        with self.assertRaises(ConnectionException):
+            for row in ResultsStream(chunks(), close=lambda: closed.append(True)):
+                rows.append(row)
+
+        self.assertListEqual(rows, [1])
+        self.assertListEqual(closed, [True])
+
+    def test_close(self):
+        closed = []
+        stream = ResultsStream([b'{"results": [1, 2, 3]}'], close=lambda: closed.append(True))
+
+        rows = iter(stream)
+
+        self.assertEqual(next(rows), 1)
+        self.assertListEqual(closed, [])
+        stream.close()
+        stream.close()
+        self.assertListEqual(closed, [True])
+
+
+class StreamingTransportTestCase(BaseTestCase):
+
+    def test_stream(self):
+        transport = HttpTransport('token', stream=True)
+
+        with responses.RequestsMock() as resp:
+            resp.add(resp.GET, StatisticActions.URL, json={'results': [{'id': 1}], '_meta': {'count': 1}}, status=200)
+
+            result = StatisticActions(transport).get()
+
+            self.assertIsInstance(result, ResultsStream)
+            self.assertListEqual(list(result), [{'id': 1}])
+            self.assertDictEqual(result.get('_meta'), {'count': 1})
+
+    def test_iterate(self):
+        with responses.RequestsMock() as resp:
+            for offset in (0, 500, 1000):
+                resp.add(
+                    resp.GET,
+                    self.prepare_url(StatisticActions.URL, params={'limit': 500, 'offset': offset}),
+                    match_querystring=True,
+                    json={'results': [{'id': offset}], '_meta': {'count': 1001}},
+                    status=200,
+                )
+
+            result = list(StatisticActions(HttpTransport('token')).iterate(stream=True))
+
+        self.assertListEqual(result, [{'id': 0}, {'id': 500}, {'id': 1000}])
+
+    def test_async_transport_does_not_stream(self):
+        transport = AsyncHttpTransport('token')
+
+        with self.assertRaises(AttributeError):
+            transport.with_options(stream=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
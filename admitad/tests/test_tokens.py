@@ -0,0 +1,250 @@
+# coding: utf-8
+from __future__ import unicode_literals
+
+import os
+import tempfile
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs
+
+import responses
+
+from admitad.api import get_oauth_client_client
+from admitad.constants import TOKEN_URL
+from admitad.exceptions import HttpException
+from admitad.items import Me
+from admitad.tests.base import BaseTestCase
+from admitad.tokens import FileTokenCache, TokenManager
+from admitad.transport import HttpTransport
+
+
+def token(access_token, expires_in=604800, refresh_token='refresh'):
+    return {
+        'access_token': access_token,
+        'expires_in': str(expires_in),
+        'refresh_token': refresh_token,
+        'token_type': 'bearer',
+    }
+
+
+class TokenManagerTestCase(BaseTestCase):
+
+    def test_fetches_token_with_client_credentials(self):
+        manager = TokenManager('client_id', 'secret', 'private_data')
+
+        with responses.RequestsMock() as resp:
+            resp.add(resp.POST, TOKEN_URL, json=token('first'), status=200)
+
+            self.assertEqual(manager.get_access_token(), 'first')
+            self.assertEqual(manager.get_access_token(), 'first')
+
+            body = parse_qs(resp.calls[0].request.body)
+
+        self.assertListEqual(body['grant_type'], ['client_credentials'])
+        self.assertIsNotNone(manager.expires_at)
+
+    def test_refreshes_ahead_of_expiry(self):
+        manager = TokenManager('client_id', 'secret', 'private_data')
+        manager.set_token(token('old'), expires_at=time.time() + 60)
+
+        with responses.RequestsMock() as resp:
+            resp.add(resp.POST, TOKEN_URL, json=token('new'), status=200)
+
+            self.assertEqual(manager.get_access_token(), 'new')
+
+            body = parse_qs(resp.calls[0].request.body)
+
+        self.assertListEqual(body['grant_type'], ['refresh_token'])
+        self.assertListEqual(body['refresh_token'], ['refresh'])
+
+    def test_short_lived_token_is_reused(self):
+        manager = TokenManager('client_id', 'secret', 'private_data', refresh_margin=300)
+
+        with responses.RequestsMock() as resp:
+            resp.add(resp.POST, TOKEN_URL, json=token('first', expires_in=120), status=200)
+
+            self.assertEqual(manager.get_access_token(), 'first')
+            self.assertEqual(manager.get_access_token(), 'first')
+
+            self.assertEqual(len(resp.calls), 1)
+
+        self.assertEqual(manager.get_refresh_margin(), 60)
+
+    def test_falls_back_to_client_credentials(self):
+        manager = TokenManager('client_id', 'secret', 'private_data', token=token('old', expires_in=0))
+
+        with responses.RequestsMock() as resp:
+            resp.add(resp.POST, TOKEN_URL, json={'error': 'invalid_grant'}, status=400)
+            resp.add(resp.POST, TOKEN_URL, json=token('new'), status=200)
+
+            self.assertEqual(manager.get_access_token(), 'new')
+
+            body = parse_qs(resp.calls[1].request.body)
+
+        self.assertListEqual(body['grant_type'], ['client_credentials'])
+
+    def test_stale_token_is_refreshed_once(self):
+        manager = TokenManager('client_id', 'secret', 'private_data', token=token('old'))
+
+        with responses.RequestsMock() as resp:
+            resp.add(resp.POST, TOKEN_URL, json=token('new'), status=200)
+
+            self.assertEqual(manager.refresh(stale_token='old'), 'new')
+            self.assertEqual(manager.refresh(stale_token='old'), 'new')
+
+            self.assertEqual(len(resp.calls), 1)
+
+
+class FileTokenCacheTestCase(BaseTestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = FileTokenCache(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_key(self):
+        self.assertEqual(
+            FileTokenCache.get_key('client_id', 'statistics private_data'),
+            FileTokenCache.get_key('client_id', 'private_data  statistics'),
+        )
+        self.assertNotEqual(
+            FileTokenCache.get_key('client_id', 'statistics'),
+            FileTokenCache.get_key('other_id', 'statistics'),
+        )
+
+    @unittest.skipUnless(hasattr(os, 'getuid'), 'needs posix permissions')
+    def test_directory_is_per_user(self):
+        self.assertTrue(FileTokenCache.get_default_directory().endswith('admitad-tokens-%s' % os.getuid()))
+
+    @unittest.skipUnless(hasattr(os, 'getuid'), 'needs posix permissions')
+    def test_open_directory_is_refused(self):
+        os.chmod(self.directory.name, 0o777)
+
+        with self.assertRaises(PermissionError):
+            FileTokenCache(self.directory.name)
+
+    @unittest.skipUnless(hasattr(os, 'symlink'), 'needs symlinks')
+    def test_symlinked_directory_is_refused(self):
+        link = os.path.join(self.directory.name, 'link')
+        os.symlink(self.directory.name, link)
+
+        with self.assertRaises(PermissionError):
+            FileTokenCache(link)
+
+    def test_save_load_delete(self):
+        key = FileTokenCache.get_key('client_id', 'statistics')
+
+        self.assertIsNone(self.cache.load(key))
+
+        self.cache.save(key, token('first'), 100.0)
+        self.assertTupleEqual(self.cache.load(key), (token('first'), 100.0))
+
+        self.cache.delete(key)
+        self.assertIsNone(self.cache.load(key))
+
+    def test_cached_token_is_reused(self):
+        with responses.RequestsMock() as resp:
+            resp.add(resp.POST, TOKEN_URL, json=token('first'), status=200)
+
+            first = TokenManager('client_id', 'secret', 'private_data', cache=self.cache)
+            second = TokenManager('client_id', 'secret', 'private_data', cache=self.cache)
+
+            self.assertEqual(first.get_access_token(), 'first')
+            self.assertEqual(second.get_access_token(), 'first')
+            self.assertEqual(len(resp.calls), 1)
+
+        self.assertAlmostEqual(first.expires_at, second.expires_at)
+
+    def test_expiring_cached_token_is_refreshed(self):
+        key = FileTokenCache.get_key('client_id', 'private_data')
+        self.cache.save(key, token('old'), time.time() + 10)
+
+        with responses.RequestsMock() as resp:
+            resp.add(resp.POST, TOKEN_URL, json=token('new'), status=200)
+
+            manager = TokenManager('client_id', 'secret', 'private_data', cache=self.cache)
+
+            self.assertEqual(manager.get_access_token(), 'new')
+
+        self.assertEqual(self.cache.load(key)[0]['access_token'], 'new')
+
+    def test_rejected_token_is_not_reused(self):
+        key = FileTokenCache.get_key('client_id', 'private_data')
+        self.cache.save(key, token('old'), time.time() + 3600)
+
+        with responses.RequestsMock() as resp:
+            resp.add(resp.POST, TOKEN_URL, json=token('new'), status=200)
+
+            manager = TokenManager('client_id', 'secret', 'private_data', cache=self.cache)
+
+            self.assertEqual(manager.get_access_token(), 'old')
+            self.assertEqual(manager.refresh(stale_token='old'), 'new')
+
+    def test_concurrent_managers_fetch_once(self):
+        with responses.RequestsMock() as resp:
+            resp.add(resp.POST, TOKEN_URL, json=token('first'), status=200)
+
+            managers = [TokenManager('client_id', 'secret', 'private_data', cache=self.cache) for _ in range(8)]
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                result = list(executor.map(lambda manager: manager.get_access_token(), managers))
+
+            self.assertEqual(len(resp.calls), 1)
+
+        self.assertListEqual(result, ['first'] * 8)
+
+
+class TokenTransportTestCase(BaseTestCase):
+
+    def test_retries_once_on_401(self):
+        manager = TokenManager('client_id', 'secret', 'private_data', token=token('old'))
+        transport = HttpTransport(token_manager=manager)
+
+        with responses.RequestsMock() as resp:
+            resp.add(resp.GET, Me.URL, json={'error': 'expired'}, status=401)
+            resp.add(resp.POST, TOKEN_URL, json=token('new'), status=200)
+            resp.add(resp.GET, Me.URL, json={'id': 1}, status=200)
+
+            result = transport.get().request(url=Me.URL)
+
+            self.assertEqual(resp.calls[0].request.headers['Authorization'], 'Bearer old')
+            self.assertEqual(resp.calls[2].request.headers['Authorization'], 'Bearer new')
+
+        self.assertEqual(result['id'], 1)
+
+    def test_second_401_is_raised(self):
+        manager = TokenManager('client_id', 'secret', 'private_data', token=token('old'))
+        transport = HttpTransport(token_manager=manager)
+
+        with responses.RequestsMock() as resp:
+            resp.add(resp.GET, Me.URL, json={'error': 'expired'}, status=401)
+            resp.add(resp.POST, TOKEN_URL, json=token('new'), status=200)
+            resp.add(resp.GET, Me.URL, json={'error': 'expired'}, status=401)
+
+            with self.assertRaises(HttpException):
+                transport.get().request(url=Me.URL)
+
+    def test_401_without_token_manager_is_raised(self):
+        with responses.RequestsMock() as resp:
+            resp.add(resp.GET, Me.URL, json={'error': 'expired'}, status=401)
+
+            with self.assertRaises(HttpException):
+                HttpTransport('old').get().request(url=Me.URL)
+
+    def test_get_oauth_client_client(self):
+        with responses.RequestsMock() as resp:
+            resp.add(resp.POST, TOKEN_URL, json=token('first'), status=200)
+            resp.add(resp.GET, Me.URL, json={'id': 1}, status=200)
+
+            client = get_oauth_client_client('client_id', 'secret', 'private_data')
+            result = client.Me.get()
+
+            self.assertEqual(resp.calls[1].request.headers['Authorization'], 'Bearer first')
+
+        self.assertEqual(result['id'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,16 +1,19 @@
 # coding: utf-8
 from __future__ import unicode_literals
 
+import io
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 import responses
 
 from admitad.transport import oauth_client_authorization, get_credentials, build_headers, \
-    prepare_request_data, api_request, oauth_refresh_access_token, HttpTransport
+    prepare_request_data, api_request, oauth_refresh_access_token, HttpTransport, ConnectionPool, Request
 from admitad.constants import DEFAULT_REQUEST_TIMEOUT, DEFAULT_PAGINATION_LIMIT, DEFAULT_PAGINATION_OFFSET, \
     BASE_URL, TOKEN_URL
 from admitad.exceptions import HttpException
+from admitad.items import Campaigns
 from admitad.tests.base import BaseTestCase
 
 
@@ -296,5 +299,123 @@ class TransportTestCase(BaseTestCase):
         self.assertIn('status', result)
 
 
+class RequestTestCase(BaseTestCase):
+
+    def test_builder_returns_new_requests(self):
+        transport = HttpTransport('access_token')
+        request = transport.get()
+        paginated = request.set_pagination(limit=10)
+        filtered = paginated.update_data({'foo': 1})
+
+        self.assertIsInstance(request, Request)
+        self.assertIsNone(request.data)
+        self.assertDictEqual(dict(paginated.data), {'limit': 10, 'offset': 0})
+        self.assertDictEqual(dict(filtered.data), {'limit': 10, 'offset': 0, 'foo': 1})
+        self.assertEqual(transport.post().method, 'POST')
+        self.assertIsNone(transport.post().data)
+
+    def test_request_data_is_read_only(self):
+        request = HttpTransport('access_token').get().set_data({'foo': 1})
+
+        with self.assertRaises(TypeError):
+            request.data['foo'] = 2
+
+    def test_set_files(self):
+        transport = HttpTransport('access_token')
+        attachment = io.BytesIO(b'content')
+
+        self.assertEqual(transport.post().set_files({'attachment': attachment}).files, (('attachment', attachment),))
+        self.assertEqual(transport.post().set_files([('attachment', attachment)]).files, (('attachment', attachment),))
+        self.assertIsNone(transport.post().set_files(None).files)
+
+    def test_upload_files(self):
+        with responses.RequestsMock() as resp:
+            resp.add(resp.POST, Campaigns.URL, json={'status': 'ok'}, status=200)
+            HttpTransport('access_token').post() \
+                .set_files({'attachment': ('report.txt', io.BytesIO(b'content'))}) \
+                .request(url=Campaigns.URL)
+
+            self.assertIn(b'filename="report.txt"', resp.calls[0].request.body)
+
+    def test_unsupported_method(self):
+        with self.assertRaises(AttributeError):
+            HttpTransport('access_token').set_method('PATCH')
+
+    def test_shared_client_from_threads(self):
+        with responses.RequestsMock() as resp:
+            for website in range(1, 21):
+                resp.add(
+                    resp.GET,
+                    self.prepare_url(Campaigns.URL, params={
+                        'website': website,
+                        'limit': website,
+                        'offset': 0,
+                    }),
+                    match_querystring=True,
+                    json={'website': website},
+                    status=200
+                )
+
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                result = list(executor.map(
+                    lambda website: self.client.Campaigns.get(website=website, limit=website),
+                    range(1, 21),
+                ))
+
+        self.assertListEqual([item['website'] for item in result], list(range(1, 21)))
+
+
+class ConnectionPoolTestCase(BaseTestCase):
+
+    def test_session_is_reused(self):
+        pool = ConnectionPool()
+
+        with pool.connection() as first:
+            pass
+        with pool.connection() as second:
+            pass
+
+        self.assertIs(first, second)
+
+    def test_idle_session_is_dropped(self):
+        pool = ConnectionPool(keep_alive_timeout=0)
+
+        with pool.connection() as first:
+            pass
+        pool._last_used -= 1
+        with pool.connection() as second:
+            pass
+
+        self.assertIsNot(first, second)
+
+    def test_pool_sizes(self):
+        pool = ConnectionPool(pool_connections=2, pool_maxsize=32)
+
+        with pool.connection() as session:
+            adapter = session.get_adapter(BASE_URL)
+
+        self.assertEqual(adapter._pool_connections, 2)
+        self.assertEqual(adapter._pool_maxsize, 32)
+
+    def test_transport_shares_pool(self):
+        pool = ConnectionPool()
+        transport = HttpTransport('access_token', pool=pool)
+
+        with responses.RequestsMock() as resp:
+            resp.add(resp.POST, TOKEN_URL, json={'access_token': 'access_token'}, status=200)
+            resp.add(resp.GET, BASE_URL, json={'status': 'ok'}, status=200)
+
+            oauth_client_authorization({
+                'client_id': 'client_id',
+                'client_secret': 'secret',
+                'scopes': 'private_data',
+            }, pool=transport.pool)
+            result = transport.get().request(url=BASE_URL)
+
+        self.assertIs(transport.pool, pool)
+        self.assertIsNotNone(pool._session)
+        self.assertIn('status', result)
+
+
 if __name__ == '__main__':
     unittest.main()
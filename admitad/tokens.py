@@ -0,0 +1,206 @@
+import hashlib
+import json
+import os
+import stat
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from admitad.constants import DEFAULT_TOKEN_REFRESH_MARGIN
+from admitad.exceptions import HttpException
+from admitad.filelock import FileLock
+from admitad.transport import ConnectionPool, oauth_client_authorization, oauth_refresh_access_token
+
+
+class FileTokenCache:
+    """
+    Stores access tokens in a directory shared by worker processes.
+
+    Tokens are keyed by client_id and scopes. Refreshes happen under a
+    per-key file lock, so only one process requests a new token while
+    the others wait and pick it up from the cache.
+
+    The directory (a per-user one in the temp directory by default) must
+    be owned by the current user and closed to others, otherwise another
+    local user could plant tokens or lock files in it.
+    """
+
+    def __init__(self, directory: str | None = None):
+        self.directory = directory or self.get_default_directory()
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        self.check_directory(self.directory)
+
+    @staticmethod
+    def get_default_directory() -> str:
+        user = os.getuid() if hasattr(os, 'getuid') else os.getlogin()
+        return os.path.join(tempfile.gettempdir(), 'admitad-tokens-%s' % user)
+
+    @staticmethod
+    def check_directory(directory: str) -> None:
+        info = os.lstat(directory)
+        if not stat.S_ISDIR(info.st_mode):
+            raise PermissionError('Token cache %s is not a directory' % directory)
+        if not hasattr(os, 'getuid'):
+            return
+        if info.st_uid != os.getuid():
+            raise PermissionError('Token cache %s is owned by another user' % directory)
+        if info.st_mode & 0o077:
+            raise PermissionError('Token cache %s is accessible to other users, chmod it to 0700' % directory)
+
+    @staticmethod
+    def get_key(client_id: str, scopes: str) -> str:
+        value = '%s\n%s' % (client_id, ' '.join(sorted(scopes.split())))
+        return hashlib.sha256(value.encode('utf-8')).hexdigest()
+
+    def get_path(self, key: str) -> str:
+        return os.path.join(self.directory, '%s.json' % key)
+
+    @contextmanager
+    def lock(self, key: str) -> Iterator[None]:
+        with FileLock(os.path.join(self.directory, '%s.lock' % key)):
+            yield
+
+    def load(self, key: str) -> tuple[dict, float | None] | None:
+        try:
+            with open(self.get_path(key)) as fp:
+                entry = json.load(fp)
+        except (OSError, ValueError):
+            return None
+        return entry['token'], entry.get('expires_at')
+
+    def save(self, key: str, token: dict, expires_at: float | None) -> None:
+        path = self.get_path(key)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory)
+        try:
+            with os.fdopen(fd, 'w') as fp:
+                json.dump({'token': token, 'expires_at': expires_at}, fp)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def delete(self, key: str) -> None:
+        try:
+            os.unlink(self.get_path(key))
+        except FileNotFoundError:
+            pass
+
+
+class TokenManager:
+    """
+    Keeps an OAuth access token of a client application fresh.
+
+    The token is refreshed `refresh_margin` seconds (at most half of its
+    lifetime) before `expires_in` runs out, with the refresh token when there is one and with the
+    client credentials grant otherwise. Refreshes are serialized, so
+    concurrent callers trigger a single token request.
+    """
+
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        scopes: str,
+        token: dict | None = None,
+        refresh_margin: float = DEFAULT_TOKEN_REFRESH_MARGIN,
+        pool: ConnectionPool | None = None,
+        cache: FileTokenCache | None = None,
+    ):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.scopes = scopes
+        self.refresh_margin = refresh_margin
+        self.pool = pool
+        self.cache = cache
+        self.cache_key = cache.get_key(client_id, scopes) if cache is not None else None
+        self._lock = threading.Lock()
+        self._token = None
+        self._expires_at = None
+        if token is not None:
+            self.set_token(token)
+
+    @property
+    def token(self) -> dict | None:
+        return self._token
+
+    @property
+    def expires_at(self) -> float | None:
+        return self._expires_at
+
+    def set_token(self, token: dict, expires_at: float | None = None) -> None:
+        if expires_at is None and token.get('expires_in') is not None:
+            expires_at = time.time() + int(token['expires_in'])
+        self._expires_at = expires_at
+        self._token = token
+
+    def needs_refresh(self) -> bool:
+        if self._token is None:
+            return True
+        if self._expires_at is None:
+            return False
+        return time.time() >= self._expires_at - self.get_refresh_margin()
+
+    def get_refresh_margin(self) -> float:
+        """The margin, capped so a short-lived token is not due for refresh as soon as it is fetched."""
+        if self._token.get('expires_in') is None:
+            return self.refresh_margin
+        return min(self.refresh_margin, int(self._token['expires_in']) / 2)
+
+    def get_access_token(self) -> str:
+        if self.needs_refresh():
+            return self.refresh()
+        return self._token['access_token']
+
+    def refresh(self, stale_token: str | None = None) -> str:
+        """
+        Fetches a new token unless another caller already did.
+
+        Without stale_token the token is only refreshed when it is about
+        to expire; with it (the token a request was rejected with) it is
+        refreshed unless it has already been replaced.
+        """
+        with self._lock:
+            current = self._token['access_token'] if self._token is not None else None
+            if stale_token is None and not self.needs_refresh():
+                return current
+            if stale_token is not None and current is not None and current != stale_token:
+                return current
+
+            if self.cache is None:
+                self.set_token(self.fetch_token())
+            else:
+                self.refresh_cached(stale_token or current)
+            return self._token['access_token']
+
+    def refresh_cached(self, stale_token: str | None) -> None:
+        with self.cache.lock(self.cache_key):
+            cached = self.cache.load(self.cache_key)
+            if cached is not None:
+                token, expires_at = cached
+                if token.get('access_token') != stale_token:
+                    self.set_token(token, expires_at=expires_at)
+                    if not self.needs_refresh():
+                        return
+
+            self.set_token(self.fetch_token())
+            self.cache.save(self.cache_key, self._token, self._expires_at)
+
+    def fetch_token(self) -> dict:
+        refresh_token = (self._token or {}).get('refresh_token')
+        if refresh_token:
+            try:
+                return oauth_refresh_access_token({
+                    'client_id': self.client_id,
+                    'client_secret': self.client_secret,
+                    'refresh_token': refresh_token,
+                }, pool=self.pool)
+            except HttpException:
+                pass
+
+        return oauth_client_authorization({
+            'client_id': self.client_id,
+            'client_secret': self.client_secret,
+            'scopes': self.scopes,
+        }, pool=self.pool)
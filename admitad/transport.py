@@ -1,26 +1,52 @@
-import json
+import hashlib
 import logging
+import threading
+import time
 from base64 import b64encode
-from typing import ClassVar, Literal
+from contextlib import contextmanager
+from copy import copy, deepcopy
+from dataclasses import dataclass, replace
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Callable, ClassVar, Iterable, Iterator, Literal, Mapping
 
 import requests
+from requests.adapters import HTTPAdapter
 
+from admitad.bulk import BulkResult, BulkSummary, collect, run_bulk, run_each, summarize
+from admitad.columnar import Table
 from admitad.constants import (
+    DEFAULT_KEEP_ALIVE_TIMEOUT,
     DEFAULT_PAGINATION_LIMIT,
     DEFAULT_PAGINATION_OFFSET,
+    DEFAULT_POOL_CONNECTIONS,
+    DEFAULT_POOL_MAXSIZE,
     DEFAULT_REQUEST_TIMEOUT,
+    DEFAULT_STREAM_CHUNK_SIZE,
     MAX_PAGINATION_LIMIT,
     TOKEN_URL,
 )
+from admitad.decoders import DEFAULT_DECODER, Decoder
 from admitad.exceptions import HttpException, ConnectionException, JsonException
+from admitad.models import Model, load_models
+from admitad.pagination import iterate_pages, iterate_results
+from admitad.retry import NO_RETRY, RetryPolicy, get_retry_after
+from admitad.sharding import iterate_shards
+from admitad.streaming import ResultsStream
+
+if TYPE_CHECKING:
+    from admitad.cache import ResponseCache
+    from admitad.deeplink_cache import DeeplinkCache
+    from admitad.ratelimit import TokenBucket
+    from admitad.singleflight import SingleFlight
+    from admitad.tokens import TokenManager
 
 LOG = logging.getLogger(__file__)
 LOG.addHandler(logging.StreamHandler())
 
 
-def to_json(content: str | bytes | bytearray) -> dict:
+def to_json(content: str | bytes | bytearray, decoder: Decoder = DEFAULT_DECODER) -> dict:
     try:
-        return json.loads(content)
+        return decoder(content)
     except (TypeError, ValueError):
         return content
 
@@ -50,6 +76,78 @@ def build_headers(access_token: str, user_agent: str | None = None) -> dict:
     return headers
 
 
+def build_session(
+    pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+) -> requests.Session:
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+    )
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+class ConnectionPool:
+    """
+    A keep-alive connection pool shared by every request of a transport.
+
+    pool_connections is the number of per-host pools to cache,
+    pool_maxsize is the maximum number of connections kept per host.
+    Connections idle for longer than keep_alive_timeout seconds are dropped
+    before the next request instead of being reused (None disables it).
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        keep_alive_timeout: float | None = DEFAULT_KEEP_ALIVE_TIMEOUT,
+    ):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.keep_alive_timeout = keep_alive_timeout
+        self._lock = threading.Lock()
+        self._session = None
+        self._active = 0
+        self._last_used = 0.0
+
+    def _is_idle(self, now: float) -> bool:
+        return (
+            self.keep_alive_timeout is not None
+            and self._active == 0
+            and now - self._last_used > self.keep_alive_timeout
+        )
+
+    @contextmanager
+    def connection(self) -> Iterator[requests.Session]:
+        with self._lock:
+            if self._session is not None and self._is_idle(time.monotonic()):
+                self._session.close()
+                self._session = None
+            if self._session is None:
+                self._session = build_session(
+                    pool_connections=self.pool_connections,
+                    pool_maxsize=self.pool_maxsize,
+                )
+            self._active += 1
+            session = self._session
+        try:
+            yield session
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._last_used = time.monotonic()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
 def prepare_data(data: dict | None = None) -> dict | None:
     if data:
         new_data = {}
@@ -86,7 +184,23 @@ def prepare_request_data(
     return kwargs
 
 
-def api_request(
+@dataclass(frozen=True)
+class Response:
+    """
+    The status, headers and decoded body of an API response.
+    data is None for a 304 Not Modified response.
+    """
+
+    status: int
+    headers: Mapping[str, str]
+    data: Any = None
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status == 304
+
+
+def api_response(
     url: str,
     data: dict | None = None,
     headers: dict | None = None,
@@ -95,7 +209,15 @@ def api_request(
     timeout: int | None = None,
     ssl_verify: bool = True,
     debug: bool = False,
-) -> dict:
+    pool: ConnectionPool | None = None,
+    decoder: Decoder = DEFAULT_DECODER,
+    stream: bool = False,
+) -> Response:
+    """
+    With stream the body of a successful response is not read here,
+    its data is a ResultsStream decoding the `results` rows while they
+    are downloaded.
+    """
     kwargs = prepare_request_data(
         data=data,
         headers=headers,
@@ -105,23 +227,64 @@ def api_request(
     )
     status_code = 500
     content = ''
+    response_headers = {}
     try:
-        response = requests.request(method, url, files=files, **kwargs)
+        if pool is None:
+            response = requests.request(method, url, files=files, stream=stream, **kwargs)
+        else:
+            with pool.connection() as session:
+                response = session.request(method, url, files=files, stream=stream, **kwargs)
         debug_log('Request url: %s' % response.url, debug)
         # if method == 'POST':
         #     debug_log('Request body: %s' % response.request.body, debug)
         status_code = response.status_code
-        content = response.content
+        response_headers = response.headers
+        if not stream or status_code >= 400:
+            content = response.content
         response.raise_for_status()
     except requests.HTTPError as err:
-        raise HttpException(status_code, to_json(content), err)
+        raise HttpException(status_code, to_json(content, decoder), err, dict(response_headers))
     except requests.RequestException as err:
         raise ConnectionException(err)
+    if status_code == 304:
+        return Response(status_code, response_headers)
+    if stream:
+        chunks = response.iter_content(chunk_size=DEFAULT_STREAM_CHUNK_SIZE)
+        return Response(status_code, response_headers, ResultsStream(chunks, close=response.close))
+    try:
+        # parse the raw bytes, skipping the charset detection of response.json()
+        return Response(status_code, response_headers, decoder(content))
     except (ValueError, TypeError) as err:
         raise JsonException(err)
-    return response.json()
 
-def oauth_refresh_access_token(data: dict) -> dict:
+
+def api_request(
+    url: str,
+    data: dict | None = None,
+    headers: dict | None = None,
+    method: Literal['GET', 'POST', 'DELETE', 'PUT'] = 'GET',
+    files: dict | None = None,
+    timeout: int | None = None,
+    ssl_verify: bool = True,
+    debug: bool = False,
+    pool: ConnectionPool | None = None,
+    decoder: Decoder = DEFAULT_DECODER,
+) -> dict:
+    return api_response(
+        url,
+        data=data,
+        headers=headers,
+        method=method,
+        files=files,
+        timeout=timeout,
+        ssl_verify=ssl_verify,
+        debug=debug,
+        pool=pool,
+        decoder=decoder,
+    ).data
+
+
+def oauth_refresh_access_token(data: dict, pool: ConnectionPool | None = None) -> dict:
     """
     refresh an access token. Returns dictionary with new access_token.
     data['access-token']
@@ -131,6 +294,7 @@ def oauth_refresh_access_token(data: dict) -> dict:
         'client_secret': '',
         'client_id': ''
     }
+    Pass the pool of a transport to reuse its keep-alive connections.
     """
     refresh_token = data['refresh_token']
     client_id = data['client_id']
@@ -147,10 +311,11 @@ def oauth_refresh_access_token(data: dict) -> dict:
         method='POST',
         data=params,
         headers=headers,
+        pool=pool,
     )
 
 
-def oauth_client_authorization(data: dict) -> dict:
+def oauth_client_authorization(data: dict, pool: ConnectionPool | None = None) -> dict:
     """
     OAuth2 client authorization.
     Used to get an access_token with the oauth client credentials
@@ -160,6 +325,7 @@ def oauth_client_authorization(data: dict) -> dict:
         'client_id': ''
         'scopes': '',
     }
+    Pass the pool of a transport to reuse its keep-alive connections.
     """
     client_id = data['client_id']
     client_secret = data['client_secret']
@@ -178,72 +344,77 @@ def oauth_client_authorization(data: dict) -> dict:
         method='POST',
         data=params,
         headers=headers,
+        pool=pool,
     )
 
 
-class HttpTransport:
-    SUPPORTED_METHODS: ClassVar[tuple[Literal['GET', 'POST', 'DELETE', 'PUT']]] = ('GET', 'POST', 'DELETE', 'PUT')
+@dataclass(frozen=True)
+class Request:
+    """
+    An immutable API request bound to the transport that sends it.
 
-    def __init__(
-        self,
-        access_token: str,
-        user_agent: str | None = None,
-        debug: bool = False,
-    ):
-        self._headers = build_headers(access_token, user_agent=user_agent)
-        self._method = 'GET'
-        self._files = None
-        self._data = None
-        self._url = None
-        self._debug = debug
+    Every builder method returns a new Request, so one transport can
+    build and send requests from many threads at once.
+    """
 
-    def set_method(self, method: Literal['GET', 'POST', 'DELETE', 'PUT']) -> 'HttpTransport':
-        if method in self.SUPPORTED_METHODS:
-            self._method = method
-        else:
+    transport: 'HttpTransport'
+    method: Literal['GET', 'POST', 'DELETE', 'PUT'] = 'GET'
+    url: str | None = None
+    data: Mapping | None = None
+    files: tuple | None = None
+    debug: bool | None = None
+    retry: RetryPolicy | None = None
+    headers: Mapping | None = None
+
+    def set_method(self, method: Literal['GET', 'POST', 'DELETE', 'PUT']) -> 'Request':
+        if method not in HttpTransport.SUPPORTED_METHODS:
             raise AttributeError('This http method "%s" is not supported' % method)
-        # here we should clean data
-        return self.clean_data()
+        return replace(self, method=method, data=None)
 
-    def get(self) -> 'HttpTransport':
+    def get(self) -> 'Request':
         return self.set_method('GET')
 
-    def post(self) -> 'HttpTransport':
+    def post(self) -> 'Request':
         return self.set_method('POST')
 
-    def put(self) -> 'HttpTransport':
+    def put(self) -> 'Request':
         return self.set_method('PUT')
 
-    def delete(self) -> 'HttpTransport':
+    def delete(self) -> 'Request':
         return self.set_method('DELETE')
 
-    def set_debug(self, debug: bool) -> 'HttpTransport':
-        self._debug = debug
-        return self
+    def set_debug(self, debug: bool) -> 'Request':
+        return replace(self, debug=debug)
 
-    def set_url(self, url: str, **kwargs: dict) -> 'HttpTransport':
-        self._url = url % kwargs
-        return self
+    def set_url(self, url: str, **kwargs: dict) -> 'Request':
+        return replace(self, url=url % kwargs)
 
-    def set_data(self, data: dict) -> 'HttpTransport':
-        self._data = data
-        return self
+    def set_retry(self, retry: RetryPolicy | None) -> 'Request':
+        return replace(self, retry=retry)
 
-    def clean_data(self) -> 'HttpTransport':
-        self._data = None
-        return self
+    def update_headers(self, values: dict) -> 'Request':
+        headers = dict(self.headers or {})
+        headers.update(values)
+        return replace(self, headers=MappingProxyType(headers))
 
-    def update_data(self, values: dict | None) -> 'HttpTransport':
-        if self._data is None:
-            self._data = {}
-        self._data.update(values)
-        return self
+    def set_data(self, data: dict | None) -> 'Request':
+        return replace(self, data=MappingProxyType(dict(data)) if data is not None else None)
 
-    def set_files(self, files) -> 'HttpTransport':
-        self._files = files
-        return self
+    def clean_data(self) -> 'Request':
+        return replace(self, data=None)
+
+    def update_data(self, values: dict | None) -> 'Request':
+        data = dict(self.data or {})
+        data.update(values)
+        return self.set_data(data)
+
+    def set_files(self, files) -> 'Request':
+        """files is a mapping or a list of (name, file) pairs, kept as a tuple of pairs."""
+        if files is None:
+            return replace(self, files=None)
+        return replace(self, files=tuple(files.items()) if isinstance(files, Mapping) else tuple(files))
 
-    def set_pagination(self, **kwargs) -> 'HttpTransport':
+    def set_pagination(self, **kwargs) -> 'Request':
         limit = kwargs.get('limit', DEFAULT_PAGINATION_LIMIT)
         offset = kwargs.get('offset', DEFAULT_PAGINATION_OFFSET)
 
@@ -254,7 +425,7 @@ class HttpTransport:
 
         return self.update_data(data)
 
-    def set_ordering(self, ordering) -> 'HttpTransport':
+    def set_ordering(self, ordering) -> 'Request':
         order_by = ordering.get('order_by', [])
         available = ordering.get('available', [])
 
@@ -268,7 +439,7 @@ class HttpTransport:
 
         return self.update_data(data)
 
-    def set_filtering(self, filtering) -> 'HttpTransport':
+    def set_filtering(self, filtering) -> 'Request':
         filter_by = filtering.get('filter_by', {})
         available = filtering.get('available', {})
 
@@ -276,29 +447,329 @@ class HttpTransport:
 
         return self.update_data(data)
 
-    def request(self, **kwargs: dict) -> dict:
+    def request(self, **kwargs: dict) -> Any:
+        request = self
         if 'url' in kwargs:
-            self.set_url(kwargs.pop('url'), **kwargs)
+            request = request.set_url(kwargs.pop('url'), **kwargs)
         if 'debug' in kwargs:
-            self.set_debug(kwargs.pop('debug'))
-        if not self._url:
+            request = request.set_debug(kwargs.pop('debug'))
+        if 'retry' in kwargs:
+            request = request.set_retry(kwargs.pop('retry'))
+        if not request.url:
             raise AttributeError(
                 'Absent url parameter. Use set_url method or pass '
                 'url parameter in this method.'
             )
 
-        response = HttpTransport.api_request(
-            url=self._url,
-            method=self._method,
-            headers=self._headers,
-            data=self._data,
-            debug=self._debug,
-            files=self._files,
-        )
-        handler = kwargs.get('handler', self._handle_response)
+        handler = kwargs.get('handler', self.transport._handle_response)
+
+        return self.transport.send(request, handler)
+
+    def __call__(self, **kwargs: dict) -> Any:
+        return self.request(**kwargs)
+
+
+class HttpTransport:
+    """
+    Sends API requests. The transport only holds configuration (headers,
+    connection pool), request state lives in the Request objects returned
+    by get()/post()/put()/delete() and the other builder methods.
 
+    With a token_manager the access token is refreshed ahead of expiry and
+    a request rejected with 401 is retried once with a new token.
+
+    Transient failures are retried according to the `retry` policy, which
+    a request can override (Request.set_retry or request(retry=...)).
+
+    A rate_limiter (see admitad.ratelimit) paces every request sent and is
+    paused for the Retry-After of throttled responses.
+
+    With a cache (see admitad.cache) GET responses are served locally
+    according to its per-endpoint policies, and revalidated with
+    If-None-Match/If-Modified-Since once they are stale.
+
+    With a single_flight (see admitad.singleflight) concurrent identical
+    GET requests are coalesced into one.
+
+    Response bodies are parsed with decoder (see admitad.decoders), the
+    fastest JSON library installed by default. With stream, requests
+    return a ResultsStream (see admitad.streaming) yielding the `results`
+    rows while they are downloaded; streamed responses bypass the cache
+    and are never shared. With a model (see admitad.models) result rows
+    are returned as its instances instead of dicts.
+
+    With a deeplink_cache (see admitad.deeplink_cache) deeplinks already
+    generated are served locally by DeeplinksManage.create.
+    """
+
+    SUPPORTED_METHODS: ClassVar[tuple[Literal['GET', 'POST', 'DELETE', 'PUT']]] = ('GET', 'POST', 'DELETE', 'PUT')
+    OPTIONS: ClassVar[tuple[str, ...]] = (
+        'retry', 'rate_limiter', 'cache', 'single_flight', 'decoder', 'stream', 'model', 'deeplink_cache',
+    )
+
+    def __init__(
+        self,
+        access_token: str | None = None,
+        user_agent: str | None = None,
+        debug: bool = False,
+        pool: ConnectionPool | None = None,
+        token_manager: 'TokenManager | None' = None,
+        retry: RetryPolicy | None = None,
+        rate_limiter: 'TokenBucket | None' = None,
+        cache: 'ResponseCache | None' = None,
+        single_flight: 'SingleFlight | None' = None,
+        decoder: Decoder | None = None,
+        stream: bool = False,
+        model: type[Model] | None = None,
+        deeplink_cache: 'DeeplinkCache | None' = None,
+    ):
+        self._user_agent = user_agent
+        self._access_token = access_token
+        self._headers = build_headers(access_token, user_agent=user_agent)
+        self.pool = pool if pool is not None else ConnectionPool()
+        self.token_manager = token_manager
+        self.retry = retry if retry is not None else NO_RETRY
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.single_flight = single_flight
+        self.decoder = decoder if decoder is not None else DEFAULT_DECODER
+        self.stream = stream
+        self.model = model
+        self.deeplink_cache = deeplink_cache
+        self._debug = debug
+
+    def set_access_token(self, access_token: str) -> 'HttpTransport':
+        self._access_token = access_token
+        self._headers = build_headers(access_token, user_agent=self._user_agent)
+        return self
+
+    def get_access_token(self) -> str | None:
+        if self.token_manager is not None:
+            return self.token_manager.get_access_token()
+        return self._access_token
+
+    def get_cache_scope(self) -> str:
+        """Identifies whose responses are cached: the client application or the access token."""
+        if self.token_manager is not None:
+            identity = 'client %s' % self.token_manager.client_id
+        else:
+            identity = 'token %s' % self._access_token
+        return hashlib.sha256(identity.encode('utf-8')).hexdigest()
+
+    def get_headers(self, access_token: str | None) -> dict:
+        if access_token == self._access_token:
+            return self._headers
+        return build_headers(access_token, user_agent=self._user_agent)
+
+    def should_refresh_token(self, error: HttpException) -> bool:
+        return error.status == 401 and self.token_manager is not None
+
+    def handle_retry_after(self, error: Exception) -> None:
+        retry_after = get_retry_after(error)
+        if retry_after and self.rate_limiter is not None:
+            self.rate_limiter.pause(retry_after)
+
+    def set_debug(self, debug: bool) -> 'HttpTransport':
+        self._debug = debug
+        return self
+
+    def with_options(self, **options: Any) -> 'HttpTransport':
+        """Returns a copy of the transport sharing its pool with some OPTIONS replaced."""
+        transport = copy(self)
+        for name, value in options.items():
+            if name not in self.OPTIONS:
+                raise AttributeError('Unknown transport option "%s"' % name)
+            setattr(transport, name, value)
+        return transport
+
+    def build(self) -> Request:
+        return Request(self)
+
+    def set_method(self, method: Literal['GET', 'POST', 'DELETE', 'PUT']) -> Request:
+        return self.build().set_method(method)
+
+    def get(self) -> Request:
+        return self.set_method('GET')
+
+    def post(self) -> Request:
+        return self.set_method('POST')
+
+    def put(self) -> Request:
+        return self.set_method('PUT')
+
+    def delete(self) -> Request:
+        return self.set_method('DELETE')
+
+    def set_url(self, url: str, **kwargs: dict) -> Request:
+        return self.build().set_url(url, **kwargs)
+
+    def set_data(self, data: dict) -> Request:
+        return self.build().set_data(data)
+
+    def clean_data(self) -> Request:
+        return self.build()
+
+    def update_data(self, values: dict | None) -> Request:
+        return self.build().update_data(values)
+
+    def set_files(self, files) -> Request:
+        return self.build().set_files(files)
+
+    def set_pagination(self, **kwargs) -> Request:
+        return self.build().set_pagination(**kwargs)
+
+    def set_ordering(self, ordering) -> Request:
+        return self.build().set_ordering(ordering)
+
+    def set_filtering(self, filtering) -> Request:
+        return self.build().set_filtering(filtering)
+
+    def request(self, **kwargs: dict) -> Any:
+        return self.build().request(**kwargs)
+
+    def get_handler(self, handler: Callable[[dict], Any]) -> Callable[[Any], Any]:
+        if self.model is None:
+            return handler
+        return lambda response: handler(load_models(self.model, response))
+
+    def send(self, request: Request, handler: Callable[[dict], Any]) -> Any:
+        handler = self.get_handler(handler)
+        if self.stream or self.cache is None or not self.cache.is_cacheable(request.method, request.url):
+            return handler(self._send_coalesced(request).data)
+
+        scope = self.get_cache_scope()
+        response = self.cache.get(request.method, request.url, request.data, scope)
+        if response is None:
+            with self.cache.lock(request.method, request.url, request.data, scope):
+                response = self._send_cached(request, scope)
         return handler(response)
 
+    def _send_cached(self, request: Request, scope: str) -> Any:
+        """
+        Sends a request missing from the cache, unless another caller
+        stored it while this one was waiting for the cache lock.
+        """
+        entry = self.cache.get_entry(request.method, request.url, request.data, scope)
+        if entry is not None and entry.is_fresh():
+            return entry.get_response()
+        if entry is not None:
+            request = request.update_headers(entry.get_conditional_headers())
+
+        response = self._send_coalesced(request)
+        return self.cache.store(request.method, request.url, request.data, response, entry, scope)
+
+    def _send_coalesced(self, request: Request) -> Response:
+        if self.single_flight is None or self.stream or request.method != 'GET':
+            return self._send_with_retry(request)
+
+        key = self.single_flight.get_key(request.method, request.url, request.data, self.get_access_token())
+        response, shared = self.single_flight.do(key, lambda: self._send_with_retry(request))
+        return replace(response, data=deepcopy(response.data)) if shared else response
+
+    def _send_with_retry(self, request: Request) -> Response:
+        retry = request.retry or self.retry
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = self._send_authorized(request)
+                break
+            except (HttpException, ConnectionException) as err:
+                self.handle_retry_after(err)
+                if not retry.should_retry(request.method, err, attempt):
+                    raise
+                time.sleep(retry.get_delay(attempt, err))
+
+        return response
+
+    def _send_authorized(self, request: Request) -> Response:
+        access_token = self.get_access_token()
+        try:
+            return self._send_request(request, access_token)
+        except HttpException as err:
+            if not self.should_refresh_token(err):
+                raise
+            access_token = self.token_manager.refresh(stale_token=access_token)
+            return self._send_request(request, access_token)
+
+    def get_request_headers(self, request: Request, access_token: str | None) -> dict:
+        headers = self.get_headers(access_token)
+        if request.headers:
+            headers = {**headers, **request.headers}
+        return headers
+
+    def _send_request(self, request: Request, access_token: str | None) -> Response:
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        return HttpTransport.api_response(
+            url=request.url,
+            method=request.method,
+            headers=self.get_request_headers(request, access_token),
+            data=request.data,
+            debug=self._debug if request.debug is None else request.debug,
+            files=request.files,
+            pool=self.pool,
+            decoder=self.decoder,
+            stream=self.stream,
+        )
+
+    @staticmethod
+    def iterate_results(fetch_page: Callable[[int, int], dict], **kwargs: dict) -> Iterator:
+        return iterate_results(fetch_page, **kwargs)
+
+    @staticmethod
+    def iterate_pages(fetch_page: Callable[[int, int], dict], **kwargs: dict) -> Iterator:
+        return iterate_pages(fetch_page, **kwargs)
+
+    @staticmethod
+    def resolve(value: Any) -> Any:
+        """Returns a value computed without a request the way request() returns responses."""
+        return value
+
+    @staticmethod
+    def run_bulk(call: Callable[[Any, list], list], items: Iterable, **kwargs: Any) -> Iterator:
+        return run_bulk(call, items, **kwargs)
+
+    @staticmethod
+    def collect(results: Iterable, items: Iterable) -> dict[Any, BulkResult]:
+        return collect(results, items)
+
+    @staticmethod
+    def summarize(results: Iterable) -> BulkSummary:
+        return summarize(results)
+
+    @staticmethod
+    def run_each(call: Callable[[Any], Any], items: Iterable, **kwargs: Any) -> Iterator:
+        return run_each(call, items, **kwargs)
+
+    @staticmethod
+    def to_table(rows: Iterable, schema: Mapping[str, str] | None = None) -> Table:
+        return Table.from_rows(rows, schema=schema)
+
+    @staticmethod
+    def iterate_shards(fetch_shard: Callable[[tuple], Iterable], shards: list, **kwargs: dict) -> Iterator:
+        return iterate_shards(fetch_shard, shards, **kwargs)
+
+    @staticmethod
+    def api_response(
+        url: str,
+        method: Literal['GET', 'POST', 'DELETE', 'PUT'],
+        headers: dict | None = None,
+        data: dict | None = None,
+        debug: bool = False,
+        files: dict | None = None,
+        **kwargs: dict,
+    ) -> Response:
+        return api_response(
+            url=url,
+            method=method,
+            headers=headers,
+            data=data,
+            debug=debug,
+            files=files,
+            **kwargs,
+        )
+
     @staticmethod
     def api_request(
         url: str,
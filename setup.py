@@ -12,7 +12,13 @@ setup(
     download_url='https://github.com/admitad/admitad-python-api/tarball/1.3.0',
     keywords=['admitad'],
     install_requires=['requests==2.32.5'],
-    tests_require=['nose2', 'responses'],
+    extras_require={
+        'async': ['aiohttp'],
+        'orjson': ['orjson'],
+        'pandas': ['pandas'],
+        'parquet': ['pyarrow'],
+    },
+    tests_require=['nose2', 'responses', 'aiohttp', 'aioresponses'],
     test_suite='nose2.collector.collector',
     classifiers=[
         'Development Status :: 4 - Beta',